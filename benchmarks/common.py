@@ -0,0 +1,41 @@
+"""Helpers shared by the benchmark and load-test harnesses."""
+
+from types import SimpleNamespace
+
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+from custom_components.fhem_rgbwwcontroller.light import RgbwwLight
+from custom_components.fhem_rgbwwcontroller.sensor import SyncOffsetSensor
+
+
+def _entry(name: str) -> SimpleNamespace:
+    return SimpleNamespace(title=name, unique_id=name)
+
+
+def make_controller() -> RgbwwController:
+    """Return a controller that has completed its initial state."""
+    controller = RgbwwController(None, "bench.invalid")
+    controller.state_completed = True
+    return controller
+
+
+def make_light(controller: RgbwwController, name: str = "bench") -> RgbwwLight:
+    """Return a light entity that is not attached to Home Assistant.
+
+    State writes and device registry updates are no-ops, so only the
+    integration's own work is measured.
+    """
+    light = RgbwwLight(None, controller, _entry(name))
+    light.async_write_ha_state = lambda: None
+    light._update_ha_device = lambda: None  # noqa: SLF001
+    return light
+
+
+def make_sync_sensor(
+    controller: RgbwwController, name: str = "bench"
+) -> SyncOffsetSensor:
+    """Return a sync offset sensor that is not attached to Home Assistant."""
+    sensor = SyncOffsetSensor(None, controller, _entry(name))
+    sensor.async_write_ha_state = lambda: None
+    return sensor
@@ -0,0 +1,418 @@
+"""Local fake of the controller firmware network interface.
+
+Serves the HTTP API (``/info``, ``/config``, ``/color`` and the channel
+commands) and the JSON stream on the TCP port so the real network code of
+``RgbwwController`` can be exercised and benchmarked on loopback without
+hardware. Faults (latency, drops, slow reads, disconnects) can be injected.
+
+Color commands are played by the firmware emulator in ``animation_engine``.
+By default the engine follows the event loop clock; with ``autorun=False``
+time only moves when ``advance`` is called, which makes the emitted stream
+deterministic for tests.
+
+Run standalone with::
+
+    python -m benchmarks.fake_controller
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+import contextlib
+import copy
+from dataclasses import dataclass
+import json
+import logging
+import random
+from typing import Any
+
+from custom_components.fhem_rgbwwcontroller.core.animation_engine import (
+    HSV_CHANNELS,
+    AnimationEngine,
+)
+
+_logger = logging.getLogger(__name__)
+
+_CHANNEL_COMMANDS = ("pause", "continue", "stop", "skip")
+
+_DEFAULT_INFO: dict[str, Any] = {
+    "firmware": "9.0-fake",
+    "heap_free": 21123,
+    "connection": {"mac": "a020a6000000", "ip": "127.0.0.1"},
+    "git_version": "9.00-fake.git",
+    "webapp_version": "1.0-Shojo",
+}
+
+_DEFAULT_CONFIG: dict[str, Any] = {
+    "general": {"device_name": "Fake Controller"},
+    "network": {"mqtt": {"enabled": False, "server": "mqtthost"}},
+    "color": {"colortemp": {"cw": 6000, "ww": 2700}},
+    "sync": {"cmd_slave_enabled": False},
+}
+
+_HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Error"}
+
+
+@dataclass
+class FaultConfig:
+    """Faults injected by the fake controller."""
+
+    http_latency: float = 0.0  # s added before every HTTP response
+    http_drop_rate: float = 0.0  # probability to close without a response
+    http_error_rate: float = 0.0  # probability to answer with status 500
+    stream_latency: float = 0.0  # s added before every stream message
+    stream_drop_rate: float = 0.0  # probability to silently drop a message
+    stream_chunk_size: int = 0  # split stream writes into chunks of this size
+    stream_chunk_delay: float = 0.0  # s between chunks (slow reads)
+
+
+class FakeRgbwwController:
+    """Asyncio fake controller serving the HTTP API and the JSON stream."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        http_port: int = 0,
+        tcp_port: int = 0,
+        *,
+        faults: FaultConfig | None = None,
+        keep_alive_interval: float = 30.0,
+        event_interval: float = 0.1,
+        autorun: bool = True,
+        mac: str | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.host = host
+        self.faults = faults or FaultConfig()
+        self.keep_alive_interval = keep_alive_interval
+        self.info: dict[str, Any] = copy.deepcopy(_DEFAULT_INFO)
+        self.config: dict[str, Any] = copy.deepcopy(_DEFAULT_CONFIG)
+        if mac is not None:
+            self.info["connection"]["mac"] = mac
+        self.engine = AnimationEngine(
+            {"ct": 2700}, on_transition_finished=self._on_transition_finished
+        )
+        self.event_interval = event_interval
+        self.autorun = autorun
+
+        self.requests: Counter[str] = Counter()  # "POST /color" -> count
+        self.received_commands: list[dict[str, Any]] = []
+
+        self._requested_ports = (http_port, tcp_port)
+        self._http_server: asyncio.Server | None = None
+        self._stream_server: asyncio.Server | None = None
+        self._stream_writers: set[asyncio.StreamWriter] = set()
+        self._keep_alive_task: asyncio.Task[None] | None = None
+        self._engine_task: asyncio.Task[None] | None = None
+        self._clock_origin = 0.0
+        self._finished: list[tuple[float, str, bool]] = []
+        self._last_color: dict[str, Any] | None = None
+        self._write_lock = asyncio.Lock()  # keeps chunked messages contiguous
+        self._random = random.Random(seed)
+
+    @property
+    def http_port(self) -> int:
+        assert self._http_server is not None
+        return self._http_server.sockets[0].getsockname()[1]
+
+    @property
+    def tcp_port(self) -> int:
+        assert self._stream_server is not None
+        return self._stream_server.sockets[0].getsockname()[1]
+
+    @property
+    def stream_clients(self) -> int:
+        return len(self._stream_writers)
+
+    async def start(self) -> None:
+        http_port, tcp_port = self._requested_ports
+        self._http_server = await asyncio.start_server(
+            self._handle_http, self.host, http_port
+        )
+        self._stream_server = await asyncio.start_server(
+            self._handle_stream, self.host, tcp_port
+        )
+        self._keep_alive_task = asyncio.create_task(
+            self._run_keep_alive(), name="fake_rgbww_keep_alive"
+        )
+        self._clock_origin = asyncio.get_running_loop().time()
+        if self.autorun:
+            self._engine_task = asyncio.create_task(
+                self._run_engine(), name="fake_rgbww_engine"
+            )
+
+    async def stop(self) -> None:
+        for task in (self._keep_alive_task, self._engine_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._keep_alive_task = self._engine_task = None
+
+        await self.disconnect_clients()
+        for server in (self._http_server, self._stream_server):
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+
+    async def __aenter__(self) -> "FakeRgbwwController":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def disconnect_clients(self) -> None:
+        """Drop all stream connections (fault injection)."""
+        writers = list(self._stream_writers)
+        self._stream_writers.clear()
+        for writer in writers:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    # --- stream ---
+
+    async def _handle_stream(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._stream_writers.add(writer)
+        try:
+            await self._send(writer, "info", self.info)
+            await self._send(writer, "config", self.config)
+            await self._send(writer, "color_event", self.color_params())
+            await self._send(writer, "state_completed", {})
+            # The client never sends anything, wait until it goes away.
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._stream_writers.discard(writer)
+            writer.close()
+
+    async def _run_keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keep_alive_interval)
+            await self.emit("keep_alive", {})
+
+    async def emit(self, method: str, params: dict[str, Any]) -> None:
+        """Send a message to all connected stream clients."""
+        for writer in list(self._stream_writers):
+            try:
+                await self._send(writer, method, params)
+            except ConnectionError:
+                self._stream_writers.discard(writer)
+
+    async def _send(
+        self, writer: asyncio.StreamWriter, method: str, params: dict[str, Any]
+    ) -> None:
+        faults = self.faults
+        if faults.stream_drop_rate and self._random.random() < faults.stream_drop_rate:
+            return
+
+        data = json.dumps(
+            {"jsonrpc": "2.0", "method": method, "params": params}
+        ).encode()
+        async with self._write_lock:
+            if faults.stream_latency:
+                await asyncio.sleep(faults.stream_latency)
+            if faults.stream_chunk_size > 0:
+                for i in range(0, len(data), faults.stream_chunk_size):
+                    writer.write(data[i : i + faults.stream_chunk_size])
+                    await writer.drain()
+                    if faults.stream_chunk_delay:
+                        await asyncio.sleep(faults.stream_chunk_delay)
+            else:
+                writer.write(data)
+                await writer.drain()
+
+    # --- HTTP ---
+
+    async def _handle_http(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while request_line := await reader.readline():
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests[f"{method} {path}"] += 1
+                faults = self.faults
+                if faults.http_latency:
+                    await asyncio.sleep(faults.http_latency)
+                if faults.http_drop_rate and self._random.random() < faults.http_drop_rate:
+                    break
+                if faults.http_error_rate and self._random.random() < faults.http_error_rate:
+                    status, response = 500, {"error": "injected fault"}
+                else:
+                    status, response = await self._dispatch(method, path, body)
+
+                payload = json.dumps(response).encode()
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, '')}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        "Connection: keep-alive\r\n\r\n"
+                    ).encode()
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[int, dict[str, Any]]:
+        endpoint = path.strip("/").split("?", 1)[0]
+        if method == "GET":
+            match endpoint:
+                case "info":
+                    return 200, self.info
+                case "config":
+                    return 200, self.config
+                case "color":
+                    return 200, self.color_params()
+            return 404, {"error": "not found"}
+
+        if method != "POST":
+            return 400, {"error": "unsupported method"}
+
+        try:
+            data = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return 400, {"error": "invalid json"}
+
+        if endpoint == "color":
+            cmds = data["cmds"] if "cmds" in data else [data]
+            self.received_commands.extend(cmds)
+            await self.apply_color_commands(cmds)
+        elif endpoint == "config":
+            _merge(self.config, data)
+            await self.emit("config", self.config)
+        elif endpoint in _CHANNEL_COMMANDS:
+            await self.apply_channel_command(endpoint, data.get("channels", []))
+        else:
+            return 404, {"error": "not found"}
+        return 200, {"success": True}
+
+    # --- color handling ---
+
+    def color_params(self) -> dict[str, Any]:
+        values = self.engine.values()
+        return {
+            "hsv": {k: round(values[k]) for k in HSV_CHANNELS},
+            "raw": {
+                "r": round(values["r"]),
+                "g": round(values["g"]),
+                "b": round(values["b"]),
+                "cw": round(values["cw"]),
+                "ww": round(values["ww"]),
+            },
+            "mode": self.engine.mode,
+        }
+
+    async def advance(self, ms: float) -> None:
+        """Move virtual time forward and emit the resulting stream messages."""
+        self.engine.advance(ms)
+        await self._publish()
+
+    async def _run_engine(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.event_interval)
+            self._sync_clock(loop)
+            await self._publish()
+
+    def _sync_clock(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        if not self.autorun:
+            return
+        loop = loop or asyncio.get_running_loop()
+        now = (loop.time() - self._clock_origin) * 1000.0
+        if now > self.engine.now:
+            self.engine.advance_to(now)
+
+    def _on_transition_finished(self, t: float, name: str, requeued: bool) -> None:
+        self._finished.append((t, name, requeued))
+
+    async def _publish(self, force_color: bool = False) -> None:
+        color = self.color_params()
+        if force_color or color != self._last_color:
+            self._last_color = color
+            await self.emit("color_event", color)
+
+        finished, self._finished = self._finished, []
+        for _, name, requeued in sorted(finished):
+            await self.emit("transition_finished", {"name": name, "requeued": requeued})
+
+    async def apply_color_commands(self, cmds: list[dict[str, Any]]) -> None:
+        """Hand the commands of one request to the animation engine."""
+        self._sync_clock()
+        self.engine.push(cmds)
+        await self._publish(force_color=True)
+
+    async def apply_channel_command(self, command: str, channels: list[str]) -> None:
+        self._sync_clock()
+        self.engine.channel_command(command, channels)
+        await self._publish()
+
+
+def _merge(target: dict[str, Any], update: dict[str, Any]) -> None:
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8080)
+    parser.add_argument("--tcp-port", type=int, default=9090)
+    parser.add_argument("--http-latency", type=float, default=0.0)
+    parser.add_argument("--http-drop-rate", type=float, default=0.0)
+    parser.add_argument("--stream-latency", type=float, default=0.0)
+    parser.add_argument("--stream-drop-rate", type=float, default=0.0)
+    parser.add_argument("--stream-chunk-size", type=int, default=0)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.0)
+    parser.add_argument("--keep-alive-interval", type=float, default=30.0)
+    parser.add_argument("--event-interval", type=float, default=0.1)
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        http_latency=args.http_latency,
+        http_drop_rate=args.http_drop_rate,
+        stream_latency=args.stream_latency,
+        stream_drop_rate=args.stream_drop_rate,
+        stream_chunk_size=args.stream_chunk_size,
+        stream_chunk_delay=args.stream_chunk_delay,
+    )
+    async with FakeRgbwwController(
+        args.host,
+        args.http_port,
+        args.tcp_port,
+        faults=faults,
+        keep_alive_interval=args.keep_alive_interval,
+        event_interval=args.event_interval,
+    ) as fake:
+        _logger.info(
+            "Fake controller listening on %s (http %s, stream %s)",
+            fake.host,
+            fake.http_port,
+            fake.tcp_port,
+        )
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main())
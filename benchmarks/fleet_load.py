@@ -0,0 +1,298 @@
+"""Load test: many fake controllers streaming into one integration process.
+
+Usage::
+
+    python -m benchmarks.fleet_load --controllers 10 50 200 --duration 30 \\
+        --color-rate 5 --clock-rate 0.2 --output fleet.json
+
+The fake controllers run in a child process, so CPU and memory figures of
+this process only contain the integration side: one ``RgbwwController``
+with a light and a sync offset sensor per fake. For every fleet size the
+harness reports
+
+* event-loop lag (how late a periodic 50 ms timer fires),
+* CPU time per dispatched stream event,
+* traced Python memory per connected controller,
+* latency from ``send_color_command`` until the echoed ``color_event`` has
+  reached the light, and the HTTP round trip alone.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+import aiohttp
+
+from custom_components.fhem_rgbwwcontroller.core.color_commands import (
+    ColorCommandHsv,
+)
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+from .common import make_light, make_sync_sensor
+from .fake_controller import FakeRgbwwController
+
+_LAG_INTERVAL = 0.05
+
+
+# --- fake fleet (child process) ---
+
+
+async def _traffic(
+    fake: FakeRgbwwController, color_rate: float, clock_rate: float
+) -> None:
+    rnd = random.Random()
+    next_color = next_clock = time.monotonic() + rnd.random()
+    while True:
+        now = time.monotonic()
+        if color_rate and now >= next_color:
+            params = fake.color_params()
+            params["hsv"]["v"] = rnd.randint(1, 100)
+            await fake.emit("color_event", params)
+            next_color += 1 / color_rate
+        if clock_rate and now >= next_clock:
+            await fake.emit(
+                "clock_slave_status",
+                {"offset": rnd.randint(-10, 10), "current_interval": 20000},
+            )
+            next_clock += 1 / clock_rate
+        wake = min(
+            next_color if color_rate else float("inf"),
+            next_clock if clock_rate else float("inf"),
+        )
+        await asyncio.sleep(max(wake - time.monotonic(), 0))
+
+
+async def _fake_fleet(
+    count: int,
+    color_rate: float,
+    clock_rate: float,
+    ports: "multiprocessing.Queue[list[tuple[int, int]]]",
+    stop: Any,
+) -> None:
+    fakes = [FakeRgbwwController(mac=f"fa{i:010x}") for i in range(count)]
+    for fake in fakes:
+        await fake.start()
+    ports.put([(fake.http_port, fake.tcp_port) for fake in fakes])
+
+    tasks = [
+        asyncio.create_task(_traffic(fake, color_rate, clock_rate)) for fake in fakes
+    ]
+    await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+    for task in tasks:
+        task.cancel()
+    for fake in fakes:
+        await fake.stop()
+
+
+def _serve_fakes(*args: Any) -> None:
+    asyncio.run(_fake_fleet(*args))
+
+
+# --- integration side ---
+
+
+class _EventCounter:
+    """Receiver counting dispatched events and resolving echo probes."""
+
+    def __init__(self, controller: RgbwwController) -> None:
+        self.controller = controller
+        self.events = 0
+        self.expected_hue: int | None = None
+        self.echo: asyncio.Future[float] | None = None
+
+    def on_update_color(self) -> None:
+        self.events += 1
+        if (
+            self.echo is not None
+            and not self.echo.done()
+            and self.controller.color.hue == self.expected_hue
+        ):
+            self.echo.set_result(time.perf_counter())
+
+    def on_clock_slave_status_update(self) -> None:
+        self.events += 1
+
+    def on_connection_update(self) -> None: ...
+    def on_transition_finished(self, name: str, requeued: bool) -> None: ...
+    def on_config_update(self) -> None: ...
+    def on_state_completed(self) -> None: ...
+
+
+def _percentiles(values: list[float]) -> dict[str, float | None]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    values = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(values[min(int(q * len(values)), len(values) - 1)], 3)
+
+    return {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1)}
+
+
+async def _monitor_lag(samples: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + _LAG_INTERVAL
+        await asyncio.sleep(_LAG_INTERVAL)
+        samples.append((loop.time() - expected) * 1000)
+
+
+async def _probe(
+    counters: list[_EventCounter],
+    interval: float,
+    echo_ms: list[float],
+    http_ms: list[float],
+) -> None:
+    hues = itertools.cycle(range(1, 360, 7))
+    while True:
+        await asyncio.sleep(interval)
+        counter = random.choice(counters)
+        hue = next(hues)
+        if counter.controller.color.hue == hue:
+            continue
+        counter.expected_hue = hue
+        counter.echo = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await counter.controller.send_color_command(
+            ColorCommandHsv(h=str(hue), speed_or_fade_duration=0)
+        )
+        http_ms.append((time.perf_counter() - start) * 1000)
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(5):
+                echo_ms.append((await counter.echo - start) * 1000)
+
+
+async def _run_fleet(args: argparse.Namespace, count: int) -> dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    ports: multiprocessing.Queue[list[tuple[int, int]]] = ctx.Queue()
+    stop = ctx.Event()
+    proc = ctx.Process(
+        target=_serve_fakes,
+        args=(count, args.color_rate, args.clock_rate, ports, stop),
+        daemon=True,
+    )
+    proc.start()
+    loop = asyncio.get_running_loop()
+    fake_ports = await loop.run_in_executor(None, ports.get)
+
+    tracemalloc.start()
+    mem_before = tracemalloc.get_traced_memory()[0]
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0, limit_per_host=4)
+    )
+    controllers: list[RgbwwController] = []
+    counters: list[_EventCounter] = []
+    entities: list[Any] = []
+    for i, (http_port, tcp_port) in enumerate(fake_ports):
+        controller = RgbwwController(
+            None, "127.0.0.1", http_port=http_port, tcp_port=tcp_port, session=session
+        )
+        counter = _EventCounter(controller)
+        light = make_light(controller, f"fleet{i}")
+        sensor = make_sync_sensor(controller, f"fleet{i}")
+        for receiver in (counter, light, sensor):
+            controller.register_callback(receiver)
+        controllers.append(controller)
+        counters.append(counter)
+        entities += (light, sensor)
+        await controller.connect()
+
+    connect_start = time.perf_counter()
+    while not all(c.state_completed for c in controllers):
+        if time.perf_counter() - connect_start > 60:
+            raise RuntimeError("controllers did not complete their initial state")
+        await asyncio.sleep(0.1)
+    connect_time = time.perf_counter() - connect_start
+    mem_per_controller = (tracemalloc.get_traced_memory()[0] - mem_before) / count
+    tracemalloc.stop()
+
+    lag: list[float] = []
+    echo_ms: list[float] = []
+    http_ms: list[float] = []
+    tasks = [
+        asyncio.create_task(_monitor_lag(lag)),
+        asyncio.create_task(_probe(counters, args.probe_interval, echo_ms, http_ms)),
+    ]
+    events_before = sum(c.events for c in counters)
+    cpu_before = time.process_time()
+    await asyncio.sleep(args.duration)
+    cpu = time.process_time() - cpu_before
+    events = sum(c.events for c in counters) - events_before
+
+    for task in tasks:
+        task.cancel()
+    for controller in controllers:
+        await controller.disconnect()
+    await session.close()
+    stop.set()
+    await loop.run_in_executor(None, proc.join, 10)
+
+    return {
+        "controllers": count,
+        "duration_s": args.duration,
+        "connect_time_s": round(connect_time, 3),
+        "events": events,
+        "events_per_s": round(events / args.duration, 1),
+        "cpu_utilization": round(cpu / args.duration, 3),
+        "cpu_us_per_event": round(cpu / events * 1e6, 2) if events else None,
+        "memory_bytes_per_controller": round(mem_per_controller),
+        "loop_lag_ms": _percentiles(lag),
+        "echo_latency_ms": _percentiles(echo_ms),
+        "http_rtt_ms": _percentiles(http_ms),
+        "probes": len(http_ms),
+        "probes_lost": len(http_ms) - len(echo_ms),
+    }
+
+
+async def _main(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results = []
+    for count in args.controllers:
+        result = await _run_fleet(args, count)
+        print(
+            f"{count:>5} controllers: {result['events_per_s']:>9} ev/s, "
+            f"{result['cpu_us_per_event']} us/ev, "
+            f"lag p99 {result['loop_lag_ms']['p99']} ms, "
+            f"echo p95 {result['echo_latency_ms']['p95']} ms",
+            file=sys.stderr,
+        )
+        results.append(result)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--controllers", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--color-rate", type=float, default=5.0, help="Hz per fake")
+    parser.add_argument("--clock-rate", type=float, default=0.2, help="Hz per fake")
+    parser.add_argument("--probe-interval", type=float, default=0.25)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show integration logs")
+    args = parser.parse_args()
+    if not args.verbose:
+        # connect/disconnect of hundreds of controllers is logged at error level
+        logging.disable(logging.ERROR)
+
+    results = asyncio.run(_main(args))
+    text = json.dumps({"args": vars(args), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Microbenchmarks of the per-event and per-command paths of the integration.
+
+All benchmarks run offline. Entities are created without a running Home
+Assistant instance and ``async_write_ha_state`` is replaced by a no-op, so
+only the integration's own work is measured. Discovery runs against fake
+controllers bound to loopback aliases (127.0.0.x, Linux only).
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import ipaddress
+import json
+import time
+from typing import Any
+
+import aiohttp
+
+from custom_components.fhem_rgbwwcontroller.core import controller_autodetect
+from custom_components.fhem_rgbwwcontroller.core.color_commands import (
+    ChannelsType,
+    ColorCommandHsv,
+    parse_color_commands,
+)
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    ControllerApiColorCommand,
+)
+
+from .common import make_controller, make_light
+from .fake_controller import FakeRgbwwController
+
+
+@dataclass
+class Benchmark:
+    """A benchmark measuring ``ops`` operations per loop."""
+
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], Any]] | None = None
+    run_async: Callable[[], Awaitable[int]] | None = None  # returns elapsed ns
+    loops: int = 1000
+    ops: int = 1
+
+    @property
+    def is_async(self) -> bool:
+        return self.run_async is not None
+
+
+def _color_event(i: int) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "method": "color_event",
+        "params": {
+            "mode": "hsv",
+            "hsv": {"h": i % 360, "s": 100, "v": 50 + i % 50, "ct": 2700},
+            "raw": {"r": i % 1024, "g": 512, "b": 0, "cw": 0, "ww": 100},
+        },
+    }
+
+
+_BURST_SIZE = 200
+_BURST = b"".join(json.dumps(_color_event(i)).encode() for i in range(_BURST_SIZE))
+
+
+def _stream_burst(chunk_size: int) -> Callable[[], Callable[[], Any]]:
+    chunks = [
+        _BURST[i : i + chunk_size] for i in range(0, len(_BURST), chunk_size)
+    ]
+
+    def setup() -> Callable[[], Any]:
+        controller = make_controller()
+
+        def run() -> None:
+            # the reader and dispatcher halves of the stream path
+            for chunk in chunks:
+                controller._enqueue_stream_data(chunk)  # noqa: SLF001
+                while controller._dispatch_batch():  # noqa: SLF001
+                    pass
+
+        return run
+
+    return setup
+
+
+def _update_colorstate(params: dict[str, Any]) -> Callable[[], Any]:
+    controller = make_controller()
+    return lambda: controller._update_colorstate_from_json(params)  # noqa: SLF001
+
+
+def _light_update(params: dict[str, Any]) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        controller = make_controller()
+        controller._update_colorstate_from_json(params)  # noqa: SLF001
+        return make_light(controller).on_update_color
+
+    return setup
+
+
+_SHORT_CLI = "120,100,50 5 2s q"
+_LONG_CLI = "; ".join(
+    f"{i % 360},100,{i % 100},2700 {i % 7} {i % 3}s q r:step{i}:" for i in range(500)
+)
+
+
+def _encode_single() -> Callable[[], Any]:
+    cmd = ColorCommandHsv(h="120", s="100", v="50", speed_or_fade_duration=1000)
+    return lambda: ControllerApiColorCommand.from_color_command(cmd).asdict_compact()
+
+
+def _encode_sequence() -> Callable[[], Any]:
+    cmds = parse_color_commands(_LONG_CLI, ChannelsType.HSV)[:50]
+    return lambda: [
+        ControllerApiColorCommand.from_color_command(c).asdict_compact() for c in cmds
+    ]
+
+
+_SUBNET = ipaddress.IPv4Network("127.0.0.0/28")
+_NUM_FAKES = 8
+
+
+async def _discovery() -> int:
+    hosts = [str(ip) for ip in list(_SUBNET.hosts())[1 : _NUM_FAKES + 1]]
+    first = FakeRgbwwController(hosts[0])
+    await first.start()
+    fakes = [first]
+    try:
+        for host in hosts[1:]:
+            fake = FakeRgbwwController(host, http_port=first.http_port)
+            await fake.start()
+            fakes.append(fake)
+
+        async with aiohttp.ClientSession() as session:
+            start = time.perf_counter_ns()
+            found = await asyncio.gather(
+                *controller_autodetect.get_scan_coros(
+                    None, _SUBNET, http_port=first.http_port, session=session
+                )
+            )
+            elapsed = time.perf_counter_ns() - start
+    finally:
+        for fake in fakes:
+            await fake.stop()
+
+    if sum(1 for c in found if c is not None) != _NUM_FAKES:
+        raise RuntimeError("discovery did not find all fake controllers")
+    return elapsed
+
+
+_HSV_PARAMS = _color_event(42)["params"] | {"mode": "hsv"}
+_RAW_PARAMS = _color_event(42)["params"] | {"mode": "raw"}
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark(
+        "stream.color_event_burst.4k_chunks",
+        "stream",
+        setup=_stream_burst(4096),
+        loops=50,
+        ops=_BURST_SIZE,
+    ),
+    Benchmark(
+        "stream.color_event_burst.37b_chunks",
+        "stream",
+        setup=_stream_burst(37),
+        loops=20,
+        ops=_BURST_SIZE,
+    ),
+    Benchmark(
+        "state.update_colorstate_from_json",
+        "state",
+        setup=lambda: _update_colorstate(_HSV_PARAMS),
+        loops=20000,
+    ),
+    Benchmark(
+        "light.on_update_color.hsv",
+        "light",
+        setup=_light_update(_HSV_PARAMS),
+        loops=20000,
+    ),
+    Benchmark(
+        "light.on_update_color.raw",
+        "light",
+        setup=_light_update(_RAW_PARAMS),
+        loops=20000,
+    ),
+    Benchmark(
+        "parse.cli.short",
+        "parse",
+        setup=lambda: lambda: parse_color_commands(_SHORT_CLI, ChannelsType.HSV),
+        loops=20000,
+    ),
+    Benchmark(
+        "parse.cli.500_steps",
+        "parse",
+        setup=lambda: lambda: parse_color_commands(_LONG_CLI, ChannelsType.HSV),
+        loops=20,
+        ops=500,
+    ),
+    Benchmark(
+        "encode.from_color_command.single",
+        "encode",
+        setup=_encode_single,
+        loops=20000,
+    ),
+    Benchmark(
+        "encode.from_color_command.50_steps",
+        "encode",
+        setup=_encode_sequence,
+        loops=200,
+        ops=50,
+    ),
+    Benchmark(
+        "discovery.fake_subnet_28",
+        "discovery",
+        run_async=_discovery,
+        ops=len(list(_SUBNET.hosts())),
+    ),
+]
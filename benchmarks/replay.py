@@ -0,0 +1,67 @@
+"""Replay a stream capture into a controller with its light and sensor.
+
+Usage::
+
+    python -m benchmarks.replay capture.bin [--speed 0] [--repeat 5] [--profile]
+
+Unlike ``stream_capture replay`` the entities are attached, so reading,
+decoding and all entity callbacks are measured on real traffic. ``--profile`` prints the
+top functions of a cProfile run.
+"""
+
+import argparse
+import asyncio
+import cProfile
+import pstats
+import statistics
+import sys
+
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+from .common import make_light, make_sync_sensor
+from .stream_capture import StreamCapture, replay
+
+
+def _attach_entities(controller: RgbwwController) -> None:
+    controller.state_completed = True
+    controller.register_callback(make_light(controller))
+    controller.register_callback(make_sync_sensor(controller))
+
+
+async def _replay_once(capture: StreamCapture, speed: float) -> float:
+    _, elapsed = await replay(capture, _attach_entities, speed)
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file")
+    parser.add_argument("--speed", type=float, default=0, help="0 = max speed")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    with StreamCapture(args.file) as capture:
+        stats = capture.stats()
+        print(stats, file=sys.stderr)
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.runcall(asyncio.run, _replay_once(capture, args.speed))
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+            return 0
+
+        samples = [
+            asyncio.run(_replay_once(capture, args.speed)) for _ in range(args.repeat)
+        ]
+    median = statistics.median(samples)
+    print(
+        f"median {median:.3f} s, {stats['bytes'] / median / 1e6:.1f} MB/s, "
+        f"{median / max(stats['chunks'], 1) * 1e6:.2f} us/chunk"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Run the offline benchmark suite and emit machine-readable results.
+
+Usage::
+
+    python -m benchmarks.run [--filter NAME] [--output results.json]
+                             [--compare baseline.json] [--threshold 1.25]
+
+Every benchmark reports nanoseconds per operation (min, median and mean over
+several repeats). With ``--compare`` the run exits non-zero if any benchmark
+got slower than ``threshold`` times its baseline median.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from . import hot_paths
+
+Result = dict[str, Any]
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_sync(func: Callable[[], Any], loops: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        func()
+    return time.perf_counter_ns() - start
+
+
+def _run_benchmark(bench: hot_paths.Benchmark, repeat: int) -> Result:
+    samples: list[float] = []
+    if bench.is_async:
+        for _ in range(repeat):
+            elapsed = asyncio.run(bench.run_async())
+            samples.append(elapsed / bench.ops)
+    else:
+        func = bench.setup()
+        _time_sync(func, max(bench.loops // 10, 1))  # warm-up
+        for _ in range(repeat):
+            samples.append(_time_sync(func, bench.loops) / (bench.loops * bench.ops))
+
+    return {
+        "name": bench.name,
+        "group": bench.group,
+        "ops_per_loop": bench.ops,
+        "loops": bench.loops,
+        "repeat": repeat,
+        "min_ns_per_op": round(min(samples), 1),
+        "median_ns_per_op": round(statistics.median(samples), 1),
+        "mean_ns_per_op": round(statistics.fmean(samples), 1),
+    }
+
+
+def _compare(results: list[Result], baseline_path: str, threshold: float) -> bool:
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {r["name"]: r for r in json.load(file)["results"]}
+
+    ok = True
+    for result in results:
+        if (base := baseline.get(result["name"])) is None:
+            continue
+        ratio = result["median_ns_per_op"] / base["median_ns_per_op"]
+        result["baseline_ratio"] = round(ratio, 3)
+        if ratio > threshold:
+            ok = False
+            print(
+                f"REGRESSION {result['name']}: {ratio:.2f}x slower than baseline",
+                file=sys.stderr,
+            )
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="run benchmarks containing NAME")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = []
+    for bench in hot_paths.BENCHMARKS:
+        if args.filter not in bench.name:
+            continue
+        result = _run_benchmark(bench, args.repeat)
+        results.append(result)
+        print(
+            f"{result['name']:<45} {result['median_ns_per_op']:>14,.1f} ns/op",
+            file=sys.stderr,
+        )
+
+    ok = _compare(results, args.compare, args.threshold) if args.compare else True
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""Capture and replay of the raw JSON stream of a controller.
+
+A capture stores every chunk read from the TCP stream together with the time
+it arrived, so chunk boundaries and timing of real traffic are preserved.
+File layout (little endian)::
+
+    header:  b"RGBWWCAP", version (u8), capture start (u64, ns since epoch)
+    records: delay since previous chunk (u32, us), length (u32), data
+
+Record from a controller and replay into the integration::
+
+    python -m benchmarks.stream_capture record 192.168.1.50 capture.bin \\
+        --duration 600
+    python -m benchmarks.stream_capture replay capture.bin --speed 0
+
+A replay serves the capture on a loopback port and lets ``RgbwwController``
+connect to it, so the real reader, framing and dispatcher are measured.
+Large captures are memory-mapped instead of read into memory.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterator
+import contextlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Any, BinaryIO, Self
+
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+_logger = logging.getLogger(__name__)
+
+MAGIC = b"RGBWWCAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sBQ")
+_RECORD = struct.Struct("<II")
+_MAX_DELAY_US = 0xFFFFFFFF
+_MMAP_THRESHOLD = 1 << 20
+
+
+class CaptureFormatError(Exception):
+    """The file is not a stream capture."""
+
+
+class CaptureWriter:
+    """Append timestamped stream chunks to a capture file."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._last = time.monotonic_ns()
+        file.write(_HEADER.pack(MAGIC, VERSION, time.time_ns()))
+        self.chunks = 0
+        self.bytes = 0
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> Self:
+        return cls(open(path, "wb"))  # noqa: SIM115
+
+    def write(self, data: bytes) -> None:
+        now = time.monotonic_ns()
+        delay = min((now - self._last) // 1000, _MAX_DELAY_US)
+        self._last = now
+        self._file.write(_RECORD.pack(delay, len(data)))
+        self._file.write(data)
+        self.chunks += 1
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class StreamCapture:
+    """Read-only view of a capture file."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size >= _MMAP_THRESHOLD:
+                self._data: bytes | mmap.mmap = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                self._data = file.read()
+
+        if len(self._data) < _HEADER.size:
+            raise CaptureFormatError("file too short")
+        magic, version, self.start_time_ns = _HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise CaptureFormatError(f"unsupported capture {magic!r} v{version}")
+
+    @property
+    def is_mapped(self) -> bool:
+        return isinstance(self._data, mmap.mmap)
+
+    def __iter__(self) -> Iterator[tuple[float, bytes]]:
+        """Yield ``(delay in s, chunk)`` for all records."""
+        data = self._data
+        pos = _HEADER.size
+        end = len(data)
+        unpack = _RECORD.unpack_from
+        while pos + _RECORD.size <= end:
+            delay, length = unpack(data, pos)
+            pos += _RECORD.size
+            if pos + length > end:
+                _logger.warning("Truncated record at offset %s", pos)
+                return
+            yield delay / 1e6, data[pos : pos + length]
+            pos += length
+
+    def stats(self) -> dict[str, Any]:
+        chunks = 0
+        size = 0
+        duration = 0.0
+        for delay, chunk in self:
+            chunks += 1
+            size += len(chunk)
+            duration += delay
+        return {
+            "chunks": chunks,
+            "bytes": size,
+            "duration_s": round(duration, 3),
+            "mapped": self.is_mapped,
+        }
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+async def record_stream(
+    host: str,
+    writer: CaptureWriter,
+    *,
+    port: int = 9090,
+    duration: float | None = None,
+) -> None:
+    """Copy the stream of ``host`` into ``writer`` until closed or timed out."""
+    reader, stream_writer = await asyncio.open_connection(host, port)
+    try:
+        async with asyncio.timeout(duration):
+            while data := await reader.read(4096):
+                writer.write(data)
+    except TimeoutError:
+        pass
+    finally:
+        stream_writer.close()
+        with contextlib.suppress(ConnectionError):
+            await stream_writer.wait_closed()
+
+
+async def _serve(
+    capture: StreamCapture,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    speed: float,
+) -> None:
+    start = time.perf_counter()
+    due = 0.0
+    try:
+        for delay, chunk in capture:
+            if speed > 0:
+                due += delay / speed
+                if (wait := due - (time.perf_counter() - start)) > 0:
+                    await asyncio.sleep(wait)
+            writer.write(chunk)
+            await writer.drain()
+        await reader.read()  # until the controller disconnects
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def replay(
+    capture: StreamCapture,
+    attach: Callable[[RgbwwController], None] | None = None,
+    speed: float = 1.0,
+) -> tuple[RgbwwController, float]:
+    """Stream the capture to a controller and return it with the elapsed s.
+
+    ``attach`` registers callbacks on the controller before it connects.
+    ``speed`` scales the recorded timing (2 plays twice as fast); 0 sends as
+    fast as the controller reads. The time runs until every chunk was read
+    and all messages were dispatched.
+    """
+    total = capture.stats()["bytes"]
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve(capture, reader, writer, speed), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    controller = RgbwwController(None, "127.0.0.1", tcp_port=port)
+    if attach is not None:
+        attach(controller)
+
+    start = time.perf_counter()
+    try:
+        await controller.connect()
+        while controller.stats.bytes_received < total or len(controller.queue):
+            await asyncio.sleep(0.001)
+        return controller, time.perf_counter() - start
+    finally:
+        await controller.disconnect()
+        server.close()
+        await server.wait_closed()
+
+
+class _MethodCounter:
+    def __init__(self) -> None:
+        self.methods: Counter[str] = Counter()
+
+    def on_update_color(self) -> None:
+        self.methods["color_event"] += 1
+
+    def on_connection_update(self) -> None: ...
+
+    def on_transition_finished(self, name: str, requeued: bool) -> None:
+        self.methods["transition_finished"] += 1
+
+    def on_config_update(self) -> None:
+        self.methods["config"] += 1
+
+    def on_state_completed(self) -> None:
+        self.methods["state_completed"] += 1
+
+    def on_clock_slave_status_update(self) -> None:
+        self.methods["clock_slave_status"] += 1
+
+
+async def _main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="capture the stream of a controller")
+    rec.add_argument("host")
+    rec.add_argument("file")
+    rec.add_argument("--port", type=int, default=9090)
+    rec.add_argument("--duration", type=float, help="stop after this many s")
+    info = sub.add_parser("info", help="show capture statistics")
+    info.add_argument("file")
+    play = sub.add_parser("replay", help="replay a capture into a controller")
+    play.add_argument("file")
+    play.add_argument("--speed", type=float, default=1.0, help="0 = max speed")
+    play.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        with CaptureWriter.open(args.file) as writer:
+            try:
+                await record_stream(
+                    args.host, writer, port=args.port, duration=args.duration
+                )
+            finally:
+                _logger.info("Captured %s chunks, %s bytes", writer.chunks, writer.bytes)
+        return 0
+
+    with StreamCapture(args.file) as capture:
+        stats = capture.stats()
+        print(stats)
+        if args.command == "info":
+            return 0
+
+        for _ in range(args.repeat):
+            counter = _MethodCounter()
+            controller, elapsed = await replay(
+                capture, lambda c: c.register_callback(counter), args.speed
+            )
+            print(
+                f"{elapsed:.3f} s, {stats['bytes'] / elapsed / 1e6:.1f} MB/s, "
+                f"{elapsed / max(stats['chunks'], 1) * 1e6:.2f} us/chunk, "
+                f"{dict(counter.methods)}, dropped {dict(controller.queue.dropped)}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        sys.exit(asyncio.run(_main()))
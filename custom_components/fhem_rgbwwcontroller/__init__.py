@@ -4,20 +4,154 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import (
+    ConfigEntryError,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.typing import ConfigType
+
+from .const import CONF_MEMBERS, CONF_RATE_LIMIT, DOMAIN, GROUP_MAX_PARALLEL
+from .core.color_commands import ChannelsType, parse_color_commands
+from .core.controller_group import ControllerGroup, encode_commands
+from .core.rate_limit import RateLimit
 from .core.rgbww_controller import RgbwwController
+from .core.sync_start import synchronized_start
+from .core.tracing import TRACER, LogSink, MemorySink, TraceSink
 
 _logger = logging.getLogger(__name__)
 
 _PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.SENSOR]
+_GROUP_PLATFORMS: list[Platform] = [Platform.LIGHT]
 
 ATTR_NAME = "name"
 DEFAULT_NAME = "World"
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_TRACING = "tracing"
+_ATTR_ENABLED = "enabled"
+_ATTR_SINKS = "sinks"
+_ATTR_CLEAR = "clear"
+
+SERVICE_SYNC_ANIMATION_CLI = "sync_animation_cli"
+_ATTR_ANIM_CLI_COMMAND = "anim_definition_command"
+_ATTR_CHANNELS_TYPE = "channels_type"
+
+_TRACE_SINKS: dict[str, TraceSink] = {"memory": MemorySink(), "log": LogSink()}
+
+_TRACING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(_ATTR_ENABLED): cv.boolean,
+        vol.Optional(_ATTR_SINKS, default=["memory"]): vol.All(
+            cv.ensure_list, [vol.In(_TRACE_SINKS)]
+        ),
+        vol.Optional(_ATTR_CLEAR, default=False): cv.boolean,
+    }
+)
+
+_SYNC_ANIMATION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(_ATTR_ANIM_CLI_COMMAND): cv.string,
+        vol.Optional(_ATTR_CHANNELS_TYPE, default=ChannelsType.HSV): vol.In(
+            [ChannelsType.HSV, ChannelsType.RGBWW]
+        ),
+    }
+)
+
+
+def _controllers_for_entities(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> list[RgbwwController]:
+    """Return the controllers behind lights of this integration, groups expanded."""
+    registry = er.async_get(hass)
+    controllers: list[RgbwwController] = []
+    for entity_id in entity_ids:
+        if (
+            (entity := registry.async_get(entity_id)) is None
+            or entity.platform != DOMAIN
+            or entity.config_entry_id is None
+            or (entry := hass.config_entries.async_get_entry(entity.config_entry_id))
+            is None
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            raise HomeAssistantError(f"{entity_id} is not a loaded RGBWW light")
+        runtime = entry.runtime_data
+        members = runtime.members if isinstance(runtime, ControllerGroup) else [runtime]
+        controllers += (c for c in members if c not in controllers)
+    return controllers
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration wide actions."""
+
+    async def _async_tracing(call: ServiceCall) -> ServiceResponse:
+        memory = _TRACE_SINKS["memory"]
+        assert isinstance(memory, MemorySink)
+        if (enabled := call.data.get(_ATTR_ENABLED)) is not None:
+            TRACER.clear_sinks()
+            if enabled:
+                for name in call.data[_ATTR_SINKS]:
+                    TRACER.add_sink(_TRACE_SINKS[name])
+
+        response: ServiceResponse = {
+            "enabled": TRACER.enabled,
+            "sinks": [n for n, sink in _TRACE_SINKS.items() if sink in TRACER.sinks],
+            "spans": memory.summary(),
+        }
+        if call.data[_ATTR_CLEAR]:
+            memory.clear()
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TRACING,
+        _async_tracing,
+        schema=_TRACING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_sync_animation(call: ServiceCall) -> ServiceResponse:
+        channels_type = call.data[_ATTR_CHANNELS_TYPE]
+        try:
+            commands = parse_color_commands(
+                call.data[_ATTR_ANIM_CLI_COMMAND], channels_type
+            )
+        except (ValueError, RuntimeError) as e:
+            raise HomeAssistantError(f"Invalid animation command: {e}") from e
+
+        controllers = _controllers_for_entities(hass, call.data[ATTR_ENTITY_ID])
+        results = await synchronized_start(
+            controllers, encode_commands(commands), channels_type
+        )
+        if not any(result.started for result in results):
+            raise HomeAssistantError(
+                "Synchronized start failed on all controllers: "
+                + ", ".join(f"{r.host}: {r.error}" for r in results)
+            )
+        return {"targets": [result.as_dict() for result in results]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SYNC_ANIMATION_CLI,
+        _async_sync_animation,
+        schema=_SYNC_ANIMATION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up FHEM RGBWW Controller from a config entry."""
@@ -29,12 +163,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up My RGB Controller from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    if CONF_MEMBERS in entry.data:
+        return await _async_setup_group_entry(hass, entry)
+
     # Extrahiere Host aus dem ConfigEntry
     host = entry.data[CONF_HOST]
 
     # Erstelle eine Hub-Instanz für DIESES GERÄT
     # Wir übergeben die entry.unique_id (also die IP) für eine eindeutige Identifikation
-    controller = RgbwwController(hass, host)
+    rate = entry.options.get(CONF_RATE_LIMIT)
+    controller = RgbwwController(
+        hass, host, rate_limit=RateLimit.from_rate(rate) if rate else None
+    )
     await controller.connect()
 
     entry.runtime_data = controller
@@ -45,10 +185,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Disconnect when the entry gets unloaded
     entry.async_on_unload(controller.disconnect)
 
+    # Groups hold the controller instance, pick up the new one
+    for group in hass.config_entries.async_entries(DOMAIN):
+        if (
+            entry.entry_id in group.data.get(CONF_MEMBERS, ())
+            and group.state is ConfigEntryState.LOADED
+        ):
+            hass.config_entries.async_schedule_reload(group.entry_id)
+
+    return True
+
+
+async def _async_setup_group_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    members: list[RgbwwController] = []
+    for member_id in entry.data[CONF_MEMBERS]:
+        if (member := hass.config_entries.async_get_entry(member_id)) is None:
+            _logger.warning("Group %s: member %s was removed", entry.title, member_id)
+            continue
+        if member.state is not ConfigEntryState.LOADED:
+            raise ConfigEntryNotReady(f"Group member {member.title} is not loaded")
+        members.append(member.runtime_data)
+    if not members:
+        raise ConfigEntryError(f"Group {entry.title} has no members")
+
+    entry.runtime_data = ControllerGroup(members, GROUP_MAX_PARALLEL)
+    await hass.config_entries.async_forward_entry_setups(entry, _GROUP_PLATFORMS)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # This function is required for reloading and removing the integration.
-    return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+    platforms = _GROUP_PLATFORMS if CONF_MEMBERS in entry.data else _PLATFORMS
+    return await hass.config_entries.async_unload_platforms(entry, platforms)
@@ -16,15 +16,17 @@ from .core.rgbww_controller import (
     RgbwwController,
 )
 from homeassistant.config_entries import (
+    ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
     OptionsFlowWithReload,
 )
 from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import callback
 from homeassistant.helpers.selector import TextSelector, selector
 from homeassistant.util import dt as dt_util
 
-from .const import DISCOVERY_RESULTS, DOMAIN
+from .const import CONF_MEMBERS, CONF_RATE_LIMIT, DISCOVERY_RESULTS, DOMAIN
 from .core import controller_autodetect
 
 _logger = logging.getLogger(__name__)
@@ -70,6 +72,9 @@ class RgbwwConfigFlow(ConfigFlow, domain=DOMAIN):
 
         options += ["scan_form", "add_manually"]
 
+        if len(self._controller_entries()) >= 2:
+            options.append("add_group")
+
         return self.async_show_menu(
             step_id="user",
             menu_options=options,
@@ -270,12 +275,66 @@ class RgbwwConfigFlow(ConfigFlow, domain=DOMAIN):
             host=ctrl.host,
         )
 
+    def _controller_entries(self) -> list[ConfigEntry]:
+        return [
+            entry
+            for entry in self._async_current_entries(include_ignore=False)
+            if CONF_MEMBERS not in entry.data
+        ]
+
+    async def async_step_add_group(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if len(user_input[CONF_MEMBERS]) < 2:
+                errors[CONF_MEMBERS] = "group_too_small"
+            else:
+                await self.async_set_unique_id(f"group_{user_input[CONF_NAME]}")
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={
+                        CONF_NAME: user_input[CONF_NAME],
+                        CONF_MEMBERS: user_input[CONF_MEMBERS],
+                    },
+                )
+
+        member_options = [
+            {"label": entry.title, "value": entry.entry_id}
+            for entry in self._controller_entries()
+        ]
+        return self.async_show_form(
+            step_id="add_group",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): str,
+                    vol.Required(CONF_MEMBERS): selector(
+                        {"select": {"options": member_options, "multiple": True}}
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> RgbwwFlowHandler:
+        return RgbwwFlowHandler()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        return CONF_MEMBERS not in config_entry.data  # groups have no options
+
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle reconfiguration of the integration."""
         cur_data = self._get_reconfigure_entry().data
         errors: dict[str, str] = {}
+        if CONF_MEMBERS in cur_data:
+            return self.async_abort(reason="group_reconfigure")
 
         if user_input:
             host = user_input[CONF_HOST]
@@ -331,15 +390,23 @@ class RgbwwFlowHandler(OptionsFlowWithReload):
             return self.async_create_entry(data=user_input)
 
         return self.async_show_form(
-            step_id="mqtt",
+            step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required(
-                        "mqtt.enabled",
-                    ): bool,
-                    vol.Required(
-                        "mqtt.host",
-                    ): str,
+                        CONF_RATE_LIMIT,
+                        default=self.config_entry.options.get(CONF_RATE_LIMIT, 0),
+                    ): selector(
+                        {
+                            "number": {
+                                "min": 0,
+                                "max": 50,
+                                "step": 0.5,
+                                "mode": "box",
+                                "unit_of_measurement": "requests/s",
+                            }
+                        }
+                    ),
                 }
             ),
             errors=errors,
@@ -2,6 +2,9 @@
 
 DOMAIN = "fhem_rgbwwcontroller"
 DISCOVERY_RESULTS = "discovery_results"
+TRANSITION_TRIGGERS = "transition_triggers"
+# Deprecated bus event, device triggers replace it
+LEGACY_EVENT_TRANSITION_FINISHED = "transition_finished"
 
 # Attribute names used in services
 ATTR_TRANSITION_MODE = "transition_mode"
@@ -20,3 +23,18 @@ ATTR_CH_GREEN = "green"
 ATTR_CH_BLUE = "blue"
 ATTR_CH_CW = "cw"
 ATTR_CH_WW = "ww"
+ATTR_WAIT = "wait"
+ATTR_WAIT_FOR = "wait_for"
+ATTR_WAIT_TIMEOUT = "wait_timeout"
+
+# Options of a controller entry
+CONF_RATE_LIMIT = "rate_limit"  # requests per s, 0 derives it from the firmware
+
+# Controller groups
+CONF_MEMBERS = "members"  # config entry ids of the member controllers
+GROUP_MAX_PARALLEL = 4  # requests in flight per group command
+
+# Clock sync statistics of the SyncOffset sensor
+SYNC_STATS_WINDOW = 60  # clock_slave_status messages
+SYNC_OFFSET_DEADBAND = 1  # sync cycles
+SYNC_OFFSET_MAX_INTERVAL = 300  # s between state writes without change
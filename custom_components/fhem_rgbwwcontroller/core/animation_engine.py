@@ -0,0 +1,528 @@
+"""Emulator of the controller firmware animation engine.
+
+Every channel (h, s, v, ct and r, g, b, cw, ww) owns a queue of transitions.
+Commands use the wire format of the HTTP API (see
+``ControllerApiColorCommand.asdict_compact``) and are applied according to
+their queue policy:
+
+* ``single`` clears the queue and replaces the running transition.
+* ``back`` appends to the queue.
+* ``front`` interrupts the running transition, which resumes where it left
+  off afterwards.
+* ``front_reset`` like front, but the interrupted transition restarts.
+
+The engine runs in virtual time (milliseconds). ``advance_to`` jumps from
+transition boundary to boundary instead of ticking, and loops of requeued
+steps are fast-forwarded once they are periodic, so hours of a looping
+animation are emulated in milliseconds.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+import itertools
+from typing import Any
+
+HSV_CHANNELS = ("h", "s", "v", "ct")
+RAW_CHANNELS = ("r", "g", "b", "cw", "ww")
+
+_HUE_RANGE = 360.0
+_CHANNEL_LIMITS: dict[str, tuple[float, float]] = {
+    "s": (0, 100),
+    "v": (0, 100),
+    "ct": (0, 100000),
+    "r": (0, 1023),
+    "g": (0, 1023),
+    "b": (0, 1023),
+    "cw": (0, 1023),
+    "ww": (0, 1023),
+}
+_EPSILON = 1e-6
+
+TransitionFinishedCallback = Callable[[float, str, bool], None]
+
+
+def parse_channel_value(value: str | float | None) -> tuple[bool, float] | None:
+    """Split a channel value into (is_relative, number).
+
+    Values prefixed with ``+`` or ``-`` are relative shifts, everything else is
+    an absolute target. ``None`` or an empty string leaves the channel alone.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return False, float(value)
+
+    value = value.strip()
+    if not value:
+        return None
+    return value[0] in "+-", float(value)
+
+
+def resolve_target(
+    channel: str,
+    start: float,
+    value: tuple[bool, float],
+    direction_long: bool | None,
+) -> float:
+    """Return the (unwrapped) end value of a transition starting at ``start``.
+
+    For the hue channel the returned value is ``start + delta`` where delta
+    already honours the short/long direction flag, so interpolating linearly
+    between start and end and wrapping modulo 360 yields the hue path.
+    """
+    relative, number = value
+    if channel == "h":
+        target = (start + number if relative else number) % _HUE_RANGE
+        delta = (target - start + 180.0) % _HUE_RANGE - 180.0
+        if direction_long and delta != 0:
+            delta = delta - _HUE_RANGE if delta > 0 else delta + _HUE_RANGE
+        return start + delta
+
+    low, high = _CHANNEL_LIMITS[channel]
+    target = start + number if relative else number
+    return min(max(target, low), high)
+
+
+@dataclass
+class ChannelSegments:
+    """Recorded transitions of a single channel, all times in milliseconds."""
+
+    initial: float
+    t0: list[float] = field(default_factory=list)
+    t1: list[float] = field(default_factory=list)
+    v0: list[float] = field(default_factory=list)
+    v1: list[float] = field(default_factory=list)
+
+    def append(self, t0: float, t1: float, v0: float, v1: float) -> None:
+        self.t0.append(t0)
+        self.t1.append(t1)
+        self.v0.append(v0)
+        self.v1.append(v1)
+
+
+@dataclass
+class _Run:
+    """Bookkeeping of a named command spanning several channels."""
+
+    name: str
+    requeue: bool
+    pending: dict[int, list[float]] = field(default_factory=dict)  # cycle -> [open, end]
+
+
+@dataclass(slots=True)
+class _Step:
+    value: tuple[bool, float]
+    fade: float  # ms, or speed in units per minute if use_speed
+    use_speed: bool
+    stay: float
+    requeue: bool
+    direction_long: bool
+    origin: int  # shared by all requeued copies of a step
+    run: _Run | None = None
+    cycle: int = 0
+
+    # runtime state
+    target: float | None = None  # absolute (wrapped) target once resolved
+    fade_left: float = 0.0
+    stay_left: float = 0.0
+    reset: bool = False
+    start_time: float = 0.0
+    start_value: float = 0.0
+    end_value: float = 0.0  # unwrapped
+
+    def copy_for_requeue(self) -> "_Step":
+        return _Step(
+            value=self.value,
+            fade=self.fade,
+            use_speed=self.use_speed,
+            stay=self.stay,
+            requeue=self.requeue,
+            direction_long=self.direction_long,
+            origin=self.origin,
+            run=self.run,
+            cycle=self.cycle + 1,
+        )
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + self.fade_left + self.stay_left
+
+
+class _Channel:
+    __slots__ = (
+        "name",
+        "value",
+        "current",
+        "queue",
+        "paused_at",
+        "stalled",
+        "segments",
+        "_marks",
+    )
+
+    def __init__(self, name: str, value: float, record: bool) -> None:
+        self.name = name
+        self.value = value
+        self.current: _Step | None = None
+        self.queue: deque[_Step] = deque()
+        self.paused_at: float | None = None
+        self.stalled = False
+        self.segments = ChannelSegments(initial=value) if record else None
+        self._marks: list[tuple[float, float, tuple[int, ...]]] = []
+
+    def value_at(self, t: float) -> float:
+        step = self.current
+        if step is None:
+            return self.value
+        if self.paused_at is not None:
+            t = min(t, self.paused_at)
+        if step.fade_left <= 0 or t >= step.start_time + step.fade_left:
+            value = step.end_value
+        else:
+            frac = max(t - step.start_time, 0.0) / step.fade_left
+            value = step.start_value + (step.end_value - step.start_value) * frac
+        return value % _HUE_RANGE if self.name == "h" else value
+
+
+class AnimationEngine:
+    """Virtual-time emulator of the per-channel transition engine."""
+
+    def __init__(
+        self,
+        initial: dict[str, float] | None = None,
+        *,
+        mode: str = "hsv",
+        record: bool = False,
+        on_transition_finished: TransitionFinishedCallback | None = None,
+    ) -> None:
+        initial = initial or {}
+        self.now = 0.0
+        self.mode = mode
+        self.loops = False  # True once a requeued step has been pushed
+        self.finite_end = 0.0  # end time of the last non-requeued step
+        self._record = record
+        self._on_finished = on_transition_finished
+        self._origins = itertools.count()
+        self._channels = {
+            name: _Channel(name, float(initial.get(name, 0)), record)
+            for name in (*HSV_CHANNELS, *RAW_CHANNELS)
+        }
+
+    # --- inspection ---
+
+    def values(self) -> dict[str, float]:
+        """Return the channel values at the current virtual time."""
+        return {name: ch.value_at(self.now) for name, ch in self._channels.items()}
+
+    def segments(self, names: Iterable[str]) -> dict[str, ChannelSegments]:
+        """Return the recorded transitions (requires ``record=True``)."""
+        result = {}
+        for name in names:
+            segments = self._channels[name].segments
+            assert segments is not None, "engine does not record segments"
+            result[name] = segments
+        return result
+
+    def is_idle(self, names: Iterable[str] | None = None) -> bool:
+        channels = self._select(names)
+        return all(ch.current is None or ch.stalled for ch in channels)
+
+    def has_finite_work(self) -> bool:
+        """Return True while steps that will not be requeued are pending."""
+        for ch in self._channels.values():
+            if ch.stalled or ch.paused_at is not None:
+                continue
+            if ch.current is not None and not ch.current.requeue:
+                return True
+            if any(not step.requeue for step in ch.queue):
+                return True
+        return False
+
+    def next_boundary(self) -> float | None:
+        """Return the virtual time of the next transition boundary."""
+        ends = [
+            ch.current.end_time
+            for ch in self._channels.values()
+            if ch.current is not None and ch.paused_at is None and not ch.stalled
+        ]
+        return min(ends, default=None)
+
+    # --- commands ---
+
+    def push(self, cmds: Iterable[dict[str, Any]]) -> None:
+        """Apply the commands of one request at the current virtual time."""
+        for cmd in cmds:
+            policy = cmd.get("q") or "single"
+            if "hsv" in cmd:
+                self.mode = "hsv"
+                values = cmd["hsv"]
+            elif "raw" in cmd:
+                self.mode = "raw"
+                values = cmd["raw"]
+            else:
+                continue
+
+            use_speed = cmd.get("s") is not None
+            run = None
+            if (name := cmd.get("name")) is not None:
+                run = _Run(name, bool(cmd.get("r")))
+            origin = next(self._origins)
+
+            for key, raw_value in values.items():
+                if (ch := self._channels.get(key)) is None:
+                    continue
+                if (value := parse_channel_value(raw_value)) is None:
+                    continue
+                step = _Step(
+                    value=value,
+                    fade=float(cmd["s"] if use_speed else cmd.get("t") or 0),
+                    use_speed=use_speed,
+                    stay=float(cmd.get("stay") or 0),
+                    requeue=bool(cmd.get("r")),
+                    direction_long=cmd.get("d") == "long",
+                    origin=origin,
+                    run=run,
+                )
+                if step.requeue:
+                    self.loops = True
+                if run is not None:
+                    run.pending.setdefault(0, [0, 0.0])[0] += 1
+                self._push_step(ch, step, policy)
+
+    def _push_step(self, ch: _Channel, step: _Step, policy: str) -> None:
+        ch.stalled = False
+        ch._marks.clear()
+        if policy == "single":
+            self._drop(ch.queue)
+            ch.queue.clear()
+            if ch.current is not None:
+                self._hold(ch)
+                self._drop((ch.current,))
+            ch.current = None
+            self._start(ch, step, self.now)
+        elif policy == "back":
+            if ch.current is None:
+                self._start(ch, step, self.now)
+            else:
+                ch.queue.append(step)
+        else:
+            if (current := ch.current) is not None:
+                self._hold(ch)
+                self._interrupt(current, reset=policy == "front_reset")
+                ch.queue.appendleft(current)
+                ch.current = None
+            self._start(ch, step, self.now)
+
+    def channel_command(self, command: str, channels: Iterable[str]) -> None:
+        """Apply a pause/continue/stop/skip channel command."""
+        for ch in self._select(channels):
+            match command:
+                case "pause":
+                    if ch.paused_at is None:
+                        if ch.current is not None and ch.segments is not None:
+                            value = ch.value_at(self.now)
+                            ch.segments.append(self.now, self.now, value, value)
+                        ch.paused_at = self.now
+                case "continue":
+                    if ch.paused_at is not None:
+                        if (step := ch.current) is not None:
+                            value = ch.value_at(self.now)
+                            step.start_time += self.now - ch.paused_at
+                            if ch.segments is not None:
+                                ch.segments.append(
+                                    self.now,
+                                    max(step.start_time + step.fade_left, self.now),
+                                    value,
+                                    step.end_value if step.fade_left else value,
+                                )
+                        ch.paused_at = None
+                case "stop":
+                    if ch.current is not None:
+                        self._hold(ch)
+                        self._drop((ch.current,))
+                    self._drop(ch.queue)
+                    ch.current = None
+                    ch.queue.clear()
+                case "skip":
+                    if ch.current is not None:
+                        ch.current.fade_left = ch.current.stay_left = 0
+                        ch.current.start_time = self.now
+                        self._finish(ch, self.now)
+                case _:
+                    raise ValueError(f"Invalid channel command: {command}")
+
+    # --- time ---
+
+    def advance(self, delta: float) -> None:
+        self.advance_to(self.now + delta)
+
+    def advance_to(self, t: float) -> None:
+        """Run the engine up to virtual time ``t`` (ms)."""
+        if t < self.now:
+            raise ValueError("time must not run backwards")
+        for ch in self._channels.values():
+            self._advance_channel(ch, t)
+        self.now = t
+
+    def _advance_channel(self, ch: _Channel, t: float) -> None:
+        instant = 0  # consecutive steps finishing without time passing
+        while (
+            (step := ch.current) is not None
+            and ch.paused_at is None
+            and not ch.stalled
+            and (end := step.end_time) <= t
+        ):
+            self._finish(ch, end)
+            if ch.current is None:
+                break
+            if ch.current.end_time > end:
+                instant = 0
+                if not self._record:
+                    self._fast_forward(ch, t)
+                continue
+            instant += 1
+            if instant > len(ch.queue) + 1 and all(s.requeue for s in ch.queue):
+                # A loop of instant requeued steps would spin forever without
+                # advancing, the firmware gets stuck on the last value.
+                ch.stalled = True
+
+    def _fast_forward(self, ch: _Channel, t: float) -> None:
+        """Skip whole cycles of a periodic requeue loop."""
+        step = ch.current
+        assert step is not None
+        steps = (step, *ch.queue)
+        if not all(s.requeue and s.run is None for s in steps):
+            ch._marks.clear()
+            return
+
+        signature = tuple(s.origin for s in steps)
+        marks = ch._marks
+        if marks and marks[0][2][0] != signature[0]:
+            return  # not at a cycle boundary
+        if marks and marks[-1][2] != signature:
+            marks.clear()
+        marks.append((step.start_time, step.start_value, signature))
+        if len(marks) < 3:
+            return
+        del marks[:-3]
+
+        (t0, v0, _), (t1, v1, _), (t2, v2, _) = marks
+        period = t2 - t1
+        if period <= 0 or abs(period - (t1 - t0)) > _EPSILON:
+            return
+        shift = self._shift(ch.name, v1, v2)
+        if abs(shift - self._shift(ch.name, v0, v1)) > _EPSILON:
+            return
+        if ch.name != "h" and abs(shift) > _EPSILON:
+            return
+
+        cycles = int((t - step.end_time) // period)
+        if cycles <= 0:
+            return
+
+        offset = cycles * period
+        for s in steps:
+            s.start_time += offset
+        if ch.name == "h":
+            step.start_value = (v2 + cycles * shift) % _HUE_RANGE
+            step.end_value = step.start_value + (step.end_value - v2)
+            step.target = step.end_value % _HUE_RANGE
+            ch.value = step.start_value
+        marks.clear()
+
+    @staticmethod
+    def _shift(name: str, a: float, b: float) -> float:
+        delta = b - a
+        return delta % _HUE_RANGE if name == "h" else delta
+
+    # --- internals ---
+
+    def _select(self, names: Iterable[str] | None) -> list[_Channel]:
+        if names is None:
+            return list(self._channels.values())
+        return [self._channels[name] for name in names]
+
+    def _start(self, ch: _Channel, step: _Step, t: float) -> None:
+        start = ch.value
+        if step.target is None:
+            end = resolve_target(ch.name, start, step.value, step.direction_long)
+            step.target = end % _HUE_RANGE if ch.name == "h" else end
+            step.fade_left = self._fade_duration(step, start, end)
+            step.stay_left = step.stay
+        else:
+            end = resolve_target(
+                ch.name, start, (False, step.target), step.direction_long
+            )
+            if step.reset:
+                step.fade_left = self._fade_duration(step, start, end)
+                step.stay_left = step.stay
+                step.reset = False
+
+        step.start_time = t
+        step.start_value = start
+        step.end_value = end
+        ch.current = step
+        if ch.paused_at is not None:
+            ch.paused_at = t
+        if ch.segments is not None:
+            ch.segments.append(t, t + step.fade_left, start, end)
+
+    def _hold(self, ch: _Channel) -> None:
+        """Freeze the channel at its current value, ending the running fade."""
+        ch.value = ch.value_at(self.now)
+        if ch.segments is not None:
+            ch.segments.append(self.now, self.now, ch.value, ch.value)
+
+    @staticmethod
+    def _fade_duration(step: _Step, start: float, end: float) -> float:
+        if not step.use_speed:
+            return step.fade
+        if step.fade <= 0:
+            return 0.0
+        return abs(end - start) / step.fade * 60000.0
+
+    def _interrupt(self, step: _Step, reset: bool) -> None:
+        if reset:
+            step.reset = True
+            return
+        played = self.now - step.start_time
+        if played < step.fade_left:
+            step.fade_left -= played
+        else:
+            step.stay_left = max(step.stay_left - (played - step.fade_left), 0.0)
+            step.fade_left = 0.0
+
+    def _finish(self, ch: _Channel, t: float) -> None:
+        step = ch.current
+        assert step is not None
+        assert step.target is not None
+        ch.value = step.target
+        ch.current = None
+
+        if step.requeue:
+            ch.queue.append(step.copy_for_requeue())
+            if step.run is not None:
+                step.run.pending.setdefault(step.cycle + 1, [0, 0.0])[0] += 1
+        else:
+            self.finite_end = max(self.finite_end, t)
+
+        if (run := step.run) is not None and (
+            pending := run.pending.get(step.cycle)
+        ) is not None:
+            pending[0] -= 1
+            pending[1] = max(pending[1], t)
+            if pending[0] == 0:
+                del run.pending[step.cycle]
+                if self._on_finished is not None:
+                    self._on_finished(pending[1], run.name, run.requeue)
+
+        if ch.queue:
+            self._start(ch, ch.queue.popleft(), t)
+
+    @staticmethod
+    def _drop(steps: Iterable[_Step]) -> None:
+        """Forget dropped steps so their named runs never report finished."""
+        for step in steps:
+            if step.run is not None:
+                step.run.pending.pop(step.cycle, None)
@@ -0,0 +1,114 @@
+"""Offline rendering of animation sequences into sampled color trajectories.
+
+The transitions are planned by the firmware emulator in ``animation_engine``;
+the preview only evaluates the segments at the sample times it returns.
+"""
+
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+import math
+from typing import Any
+
+from .animation_engine import AnimationEngine, ChannelSegments
+from .color_commands import ColorCommandHsv, ColorCommandRgbww
+from .rgbww_controller import ControllerApiColorCommand
+
+_HUE_RANGE = 360.0
+
+
+@dataclass
+class AnimationTimeline:
+    """Per-channel transitions of a rendered animation."""
+
+    channels: dict[str, ChannelSegments]
+    duration: float  # ms until the last non-looping step has finished
+    loops: bool  # True if requeued steps keep the animation running forever
+    horizon: float  # ms up to which looping steps have been expanded
+
+    def sample_count(self, sample_rate: float) -> int:
+        end = self.horizon if self.loops else self.duration
+        return int(math.floor(end / 1000.0 * sample_rate)) + 1
+
+    def sample(self, times: Sequence[float]) -> dict[str, list[float]]:
+        """Return the channel values at ``times`` (ms, ascending)."""
+        return {
+            name: _sample_channel(name, seg, times)
+            for name, seg in self.channels.items()
+        }
+
+
+def _sample_channel(
+    name: str, seg: ChannelSegments, times: Sequence[float]
+) -> list[float]:
+    if not seg.t0:
+        return [seg.initial] * len(times)
+
+    values = []
+    for t in times:
+        idx = bisect_right(seg.t0, t) - 1
+        if idx < 0:
+            values.append(seg.initial)
+            continue
+        t0, t1 = seg.t0[idx], seg.t1[idx]
+        frac = min(max((t - t0) / (t1 - t0), 0.0), 1.0) if t1 > t0 else 1.0
+        value = seg.v0[idx] + (seg.v1[idx] - seg.v0[idx]) * frac
+        values.append(value % _HUE_RANGE if name == "h" else value)
+    return values
+
+
+def build_timeline(
+    commands: Sequence[ColorCommandHsv | ColorCommandRgbww],
+    initial: dict[str, float],
+    horizon: float,
+) -> AnimationTimeline:
+    """Plan the per-channel transitions of ``commands``.
+
+    ``initial`` holds the channel values before the animation starts and
+    ``horizon`` (ms) limits how far requeued steps are expanded. Steps that do
+    not loop are always planned completely.
+    """
+    engine = AnimationEngine(initial, record=True)
+    engine.push(
+        ControllerApiColorCommand.from_color_command(cmd).asdict_compact()
+        for cmd in commands
+    )
+    engine.advance_to(horizon)
+    while engine.has_finite_work() and (t := engine.next_boundary()) is not None:
+        engine.advance_to(t)
+
+    return AnimationTimeline(
+        channels=engine.segments(initial),
+        duration=engine.finite_end,
+        loops=engine.loops,
+        horizon=horizon,
+    )
+
+
+def render_preview(
+    timeline: AnimationTimeline, sample_rate: float, preview_points: int
+) -> dict[str, Any]:
+    """Render a timeline into a compact, JSON friendly summary."""
+    count = timeline.sample_count(sample_rate)
+    if count > preview_points > 1:
+        step = (count - 1) / (preview_points - 1)
+        picks = [round(i * step) for i in range(preview_points)]
+    else:
+        picks = list(range(count))
+
+    interval = 1000.0 / sample_rate
+    times = [i * interval for i in picks]
+    values = timeline.sample(times)
+
+    return {
+        "duration": None if timeline.loops else timeline.duration / 1000.0,
+        "loops": timeline.loops,
+        "rendered_until": times[-1] / 1000.0,
+        "sample_rate": sample_rate,
+        "sample_count": count,
+        "end_state": {name: round(v[-1], 2) for name, v in values.items()},
+        "preview": {
+            "t": [round(t / 1000.0, 3) for t in times],
+            **{name: [round(x, 2) for x in v] for name, v in values.items()},
+        },
+    }
@@ -0,0 +1,71 @@
+"""Precomputed conversions between controller and Home Assistant ranges.
+
+The controller uses 0..1023 for raw channels and 0..100 for the HSV value,
+Home Assistant 0..255 for both. The tables are built with the Home Assistant
+scaling helpers at import time, so a lookup returns exactly what calling the
+helper would, including its rounding at the bottom of the range (raw 0 maps
+to -1). Raw and rgbww channels outside their range are clamped to it.
+"""
+
+from homeassistant.util.scaling import (
+    scale_ranged_value_to_int_range,
+    scale_to_ranged_value,
+)
+
+RAW_RANGE = (0, 1023)
+PERCENT_RANGE = (0, 100)
+HA_RANGE = (0, 255)
+
+RAW_TO_HA: tuple[int, ...] = tuple(
+    scale_ranged_value_to_int_range(RAW_RANGE, HA_RANGE, v) for v in range(1024)
+)
+HA_TO_RAW: tuple[int, ...] = tuple(
+    scale_ranged_value_to_int_range(HA_RANGE, RAW_RANGE, v) for v in range(256)
+)
+PERCENT_TO_BRIGHTNESS: tuple[int, ...] = tuple(
+    scale_ranged_value_to_int_range(PERCENT_RANGE, HA_RANGE, v) for v in range(101)
+)
+BRIGHTNESS_TO_PERCENT: tuple[float, ...] = tuple(
+    scale_to_ranged_value(HA_RANGE, PERCENT_RANGE, v) for v in range(256)
+)
+
+
+def _raw_to_ha(v: float) -> int:
+    if type(v) is int and 0 <= v <= 1023:
+        return RAW_TO_HA[v]
+    return scale_ranged_value_to_int_range(RAW_RANGE, HA_RANGE, min(max(v, 0), 1023))
+
+
+def _ha_to_raw(v: float) -> int:
+    if type(v) is int and 0 <= v <= 255:
+        return HA_TO_RAW[v]
+    return scale_ranged_value_to_int_range(HA_RANGE, RAW_RANGE, min(max(v, 0), 255))
+
+
+def raw_to_rgbww(
+    r: int, g: int, b: int, cw: int, ww: int
+) -> tuple[int, int, int, int, int]:
+    """Controller raw channels to a Home Assistant rgbww tuple."""
+    return _raw_to_ha(r), _raw_to_ha(g), _raw_to_ha(b), _raw_to_ha(cw), _raw_to_ha(ww)
+
+
+def rgbww_to_raw(
+    rgbww: tuple[int, int, int, int, int],
+) -> tuple[int, int, int, int, int]:
+    """Home Assistant rgbww tuple to controller raw channels."""
+    r, g, b, cw, ww = rgbww
+    return _ha_to_raw(r), _ha_to_raw(g), _ha_to_raw(b), _ha_to_raw(cw), _ha_to_raw(ww)
+
+
+def percent_to_brightness(v: float) -> int:
+    """HSV value in percent to a Home Assistant brightness."""
+    if type(v) is int and 0 <= v <= 100:
+        return PERCENT_TO_BRIGHTNESS[v]
+    return scale_ranged_value_to_int_range(PERCENT_RANGE, HA_RANGE, v)
+
+
+def brightness_to_percent(brightness: float) -> float:
+    """Home Assistant brightness to an HSV value in percent."""
+    if type(brightness) is int and 0 <= brightness <= 255:
+        return BRIGHTNESS_TO_PERCENT[brightness]
+    return scale_to_ranged_value(HA_RANGE, PERCENT_RANGE, brightness)
@@ -0,0 +1,140 @@
+"""Color commands sent while the controller is disconnected.
+
+Instead of running into the HTTP timeout, the commands are journaled and
+replayed in one request once the controller is back. The journal is kept
+compact while recording:
+
+* A command with the ``single`` queue policy (the default) drops whatever is
+  queued on its channels, so earlier entries that only touch those channels
+  are discarded.
+* Consecutive simple set commands (one absolute color, no name, requeue or
+  stay, like turn on/off and slider changes) are merged into the final state.
+* Everything else is an animation that is only replayed within ``ttl``
+  seconds after it was sent.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+_logger = logging.getLogger(__name__)
+
+_SECTIONS = ("hsv", "raw")
+
+
+@dataclass(slots=True)
+class _Entry:
+    cmds: list[dict[str, Any]]
+    channels: frozenset[str]  # "hsv.h", "raw.cw", ...
+    expires: float | None  # time.monotonic(), None for set commands
+
+
+def command_channels(cmds: Sequence[dict[str, Any]]) -> frozenset[str]:
+    """Return the channels set by ``cmds``, like "hsv.h" or "raw.cw"."""
+    return frozenset(
+        f"{section}.{channel}"
+        for cmd in cmds
+        for section in _SECTIONS
+        for channel in cmd.get(section, ())
+    )
+
+
+def replaced_channels(cmds: Sequence[dict[str, Any]]) -> frozenset[str]:
+    """Return the channels on which ``cmds`` drop the queued steps."""
+    return command_channels([cmd for cmd in cmds if _replaces(cmd)])
+
+
+def _replaces(cmd: dict[str, Any]) -> bool:
+    return cmd.get("q") in (None, "single")  # the controller defaults to single
+
+
+def _is_set(cmds: Sequence[dict[str, Any]]) -> bool:
+    if len(cmds) != 1:
+        return False
+    cmd = cmds[0]
+    if not _replaces(cmd) or cmd.get("r") or cmd.get("name") or cmd.get("stay"):
+        return False
+    values = [v for section in _SECTIONS for v in cmd.get(section, {}).values()]
+    return bool(values) and not any(
+        isinstance(v, str) and v[:1] in "+-" for v in values
+    )
+
+
+class CommandJournal:
+    """Compacted color commands waiting for the connection to come back."""
+
+    ttl = 30.0  # s an animation stays worth replaying
+    max_entries = 32
+
+    def __init__(self) -> None:
+        self._entries: list[_Entry] = []
+        self.recorded = 0
+        self.compacted = 0  # entries superseded or merged
+        self.expired = 0
+        self.replayed = 0  # commands
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, cmds: Sequence[dict[str, Any]]) -> None:
+        if not cmds:
+            return
+        self.recorded += 1
+        is_set = _is_set(cmds)
+        entry = _Entry(
+            list(cmds),
+            command_channels(cmds),
+            None if is_set else time.monotonic() + self.ttl,
+        )
+
+        if replaced := replaced_channels(cmds):
+            kept = [e for e in self._entries if not e.channels <= replaced]
+            self.compacted += len(self._entries) - len(kept)
+            self._entries = kept
+
+        if is_set and self._entries and self._merge(self._entries[-1], entry):
+            self.compacted += 1
+        else:
+            self._entries.append(entry)
+
+        if len(self._entries) > self.max_entries:
+            self._entries.pop(0)
+            self.compacted += 1
+
+    @staticmethod
+    def _merge(last: _Entry, entry: _Entry) -> bool:
+        """Merge the set command ``entry`` into ``last`` if that is one too."""
+        if last.expires is not None:
+            return False
+        old, new = last.cmds[0], entry.cmds[0]
+        if not any(section in old and section in new for section in _SECTIONS):
+            return False  # the mode changed, keep both in order
+        # the newer transition (or its absence) wins, the channels add up
+        merged = {**{k: v for k, v in old.items() if k in _SECTIONS}, **new}
+        for section in _SECTIONS:
+            if section in old and section in new:
+                merged[section] = {**old[section], **new[section]}
+        last.cmds = [merged]
+        last.channels = last.channels | entry.channels
+        return True
+
+    def take(self) -> list[dict[str, Any]]:
+        """Return the commands to replay and clear the journal."""
+        now = time.monotonic()
+        entries, self._entries = self._entries, []
+        live = [e for e in entries if e.expires is None or e.expires > now]
+        self.expired += len(entries) - len(live)
+        cmds = [cmd for e in live for cmd in e.cmds]
+        self.replayed += len(cmds)
+        return cmds
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._entries),
+            "recorded": self.recorded,
+            "compacted": self.compacted,
+            "expired": self.expired,
+            "replayed": self.replayed,
+        }
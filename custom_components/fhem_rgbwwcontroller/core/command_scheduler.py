@@ -0,0 +1,144 @@
+"""Serialize the HTTP requests to one controller by priority lane.
+
+The ESP handles one request at a time; parallel requests only queue up in its
+TCP stack. Requests wait in one of three lanes instead and the next free slot
+goes to the oldest request of the most important lane, so a turn off is not
+stuck behind a 50-step animation upload. Requests of one lane keep their
+order (pause, upload, continue).
+
+An interactive color command that replaces the queue on some channels
+supersedes the animation uploads still waiting for only those channels; the
+controller would drop them right away. They raise ``CommandSuperseded``
+without being sent.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from enum import IntEnum
+import logging
+import time
+from typing import Any, TypeVar
+
+from .command_journal import command_channels, replaced_channels
+from .statistics import RollingWindow
+
+_logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class Lane(IntEnum):
+    """Priority of a request, lower runs first."""
+
+    INTERACTIVE = 0  # turn on/off, slider changes, journal replay
+    ANIMATION = 1  # animation uploads, effects, channel commands
+    HOUSEKEEPING = 2  # info/config/color refresh
+
+
+class CommandSuperseded(Exception):
+    """The request was dropped for a newer one before it was sent."""
+
+
+@dataclass(slots=True)
+class _Queued:
+    turn: asyncio.Future[bool]  # True if superseded instead of run
+    channels: frozenset[str] | None  # of an animation upload
+
+
+@dataclass(slots=True)
+class _LaneStats:
+    high_water: int = 0
+    submitted: int = 0
+    wait_ms: RollingWindow = field(default_factory=lambda: RollingWindow(64))
+
+
+class CommandScheduler:
+    """At most one request in flight, picked by lane priority."""
+
+    def __init__(self) -> None:
+        self._lanes: dict[Lane, deque[_Queued]] = {lane: deque() for lane in Lane}
+        self._stats = {lane: _LaneStats() for lane in Lane}
+        self._busy = False
+        self.superseded = 0
+
+    async def run(
+        self,
+        lane: Lane,
+        request: Callable[[], Awaitable[_T]],
+        cmds: Sequence[dict[str, Any]] | None = None,
+    ) -> _T:
+        """Run ``request`` when it is its turn.
+
+        ``cmds`` are the encoded color commands of the request, if any.
+        Raises ``CommandSuperseded`` if the request was superseded.
+        """
+        stats = self._stats[lane]
+        stats.submitted += 1
+        if cmds is not None and lane is Lane.INTERACTIVE:
+            self._supersede(cmds)
+
+        started = time.monotonic()
+        if self._busy:
+            queued = _Queued(
+                asyncio.get_running_loop().create_future(),
+                command_channels(cmds)
+                if cmds is not None and lane is Lane.ANIMATION
+                else None,
+            )
+            waiting = self._lanes[lane]
+            waiting.append(queued)
+            stats.high_water = max(stats.high_water, len(waiting))
+            try:
+                if await queued.turn:
+                    raise CommandSuperseded(
+                        "superseded by an interactive command"
+                    )
+            except asyncio.CancelledError:
+                if queued in waiting:
+                    waiting.remove(queued)
+                elif queued.turn.done() and not queued.turn.result():
+                    self._next()  # pass on the slot handed to us
+                raise
+        else:
+            self._busy = True
+        stats.wait_ms.add((time.monotonic() - started) * 1000)
+
+        try:
+            return await request()
+        finally:
+            self._next()
+
+    def _next(self) -> None:
+        for lane in Lane:
+            if waiting := self._lanes[lane]:
+                waiting.popleft().turn.set_result(False)
+                return  # still busy, the slot moves on
+        self._busy = False
+
+    def _supersede(self, cmds: Sequence[dict[str, Any]]) -> None:
+        if not (replaced := replaced_channels(cmds)):
+            return
+        waiting = self._lanes[Lane.ANIMATION]
+        for queued in list(waiting):
+            if queued.channels and queued.channels <= replaced:
+                waiting.remove(queued)
+                queued.turn.set_result(True)
+                self.superseded += 1
+                _logger.debug("Animation upload superseded by an interactive command")
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "in_flight": self._busy,
+            "superseded": self.superseded,
+            "lanes": {
+                lane.name.lower(): {
+                    "depth": len(self._lanes[lane]),
+                    "high_water": stats.high_water,
+                    "submitted": stats.submitted,
+                    "wait_ms": stats.wait_ms.summary(),
+                }
+                for lane, stats in self._stats.items()
+            },
+        }
@@ -0,0 +1,90 @@
+"""Counters describing the health of the stream and HTTP connection."""
+
+from collections import Counter, deque
+import time
+
+from .statistics import RollingWindow
+
+
+class ConnectionStats:
+    """Plain counters, updated on every message and read by polled sensors.
+
+    Rates are computed from the counter deltas between two reads that are at
+    least ``rate_interval`` seconds apart, so several sensors reading them in
+    the same poll cycle see the same values.
+    """
+
+    rate_interval = 10.0
+    http_window = 100
+    history_size = 20
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.session_started: float | None = None  # epoch s
+        self.last_keep_alive: float | None = None  # epoch s
+        self.messages: Counter[str] = Counter()
+        self.bytes_received = 0
+        self.decode_errors = 0
+        self.http_requests = 0
+        self.http_errors = 0
+        self.suppressed_writes = 0  # entity state writes skipped as unchanged
+        self._http_outcomes = RollingWindow(self.http_window)
+        # (epoch s, "connected" | "disconnected" | "connect_failed", reason)
+        self.history: deque[tuple[float, str, str | None]] = deque(
+            maxlen=self.history_size
+        )
+
+        self._rate_time = time.monotonic()
+        self._rate_messages: Counter[str] = Counter()
+        self._rate_bytes = 0
+        self._message_rates: dict[str, float] = {}
+        self._byte_rate = 0.0
+
+    @property
+    def reconnects(self) -> int:
+        return max(self.connects - 1, 0)
+
+    def on_connected(self) -> None:
+        self.connects += 1
+        self.session_started = time.time()
+        self.history.append((self.session_started, "connected", None))
+
+    def on_disconnected(self, reason: str) -> None:
+        event = "connect_failed" if self.session_started is None else "disconnected"
+        self.history.append((time.time(), event, reason))
+        self.session_started = None
+
+    def add_http_result(self, ok: bool) -> None:
+        self.http_requests += 1
+        if not ok:
+            self.http_errors += 1
+        self._http_outcomes.add(0.0 if ok else 100.0)
+
+    @property
+    def http_error_rate(self) -> float | None:
+        """Percentage of failed requests among the most recent ones."""
+        return self._http_outcomes.mean()
+
+    def _update_rates(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._rate_time
+        if elapsed < self.rate_interval:
+            return
+        self._message_rates = {
+            method: (count - self._rate_messages[method]) / elapsed
+            for method, count in self.messages.items()
+        }
+        self._byte_rate = (self.bytes_received - self._rate_bytes) / elapsed
+        self._rate_time = now
+        self._rate_messages = self.messages.copy()
+        self._rate_bytes = self.bytes_received
+
+    def message_rates(self) -> dict[str, float]:
+        """Messages per second by method."""
+        self._update_rates()
+        return self._message_rates
+
+    def byte_rate(self) -> float:
+        """Received stream bytes per second."""
+        self._update_rates()
+        return self._byte_rate
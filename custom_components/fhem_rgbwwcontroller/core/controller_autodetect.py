@@ -5,6 +5,8 @@ import logging
 import os
 import random
 
+from aiohttp import ClientSession
+
 from homeassistant.core import HomeAssistant
 
 from .rgbww_controller import ControllerUnavailableError, RgbwwController
@@ -15,7 +17,11 @@ _scan_semaphore = asyncio.Semaphore(25)  # Limit to 25 concurrent scans
 
 
 def get_scan_coros(
-    hass: HomeAssistant, network: ipaddress.IPv4Network
+    hass: HomeAssistant | None,
+    network: ipaddress.IPv4Network,
+    *,
+    http_port: int = 80,
+    session: ClientSession | None = None,
 ) -> list[Awaitable[RgbwwController | None]]:
     """Scans the given network for FHEM RGBWW Controller devices."""
     if network.prefixlen < 13:
@@ -26,19 +32,32 @@ def get_scan_coros(
     if os.getenv("SIMULATION"):
         return [_check_ip_dummy(hass, str(ip)) for ip in network.hosts()]
 
-    return [_check_ip(hass, str(ip)) for ip in network.hosts()]
+    return [
+        _check_ip(hass, str(ip), http_port, session) for ip in network.hosts()
+    ]
 
 
-async def _check_ip_dummy(ip: str) -> RgbwwController | None:
+async def _check_ip_dummy(hass: HomeAssistant | None, ip: str) -> RgbwwController | None:
     await asyncio.sleep(random.randint(2, 20))
     if random.choice([True, False]):
         return None
-    return RgbwwController(ip)
+    return RgbwwController(hass, ip)
 
 
-async def _check_ip(hass: HomeAssistant, ip: str) -> RgbwwController | None:
+async def _check_ip(
+    hass: HomeAssistant | None,
+    ip: str,
+    http_port: int = 80,
+    session: ClientSession | None = None,
+) -> RgbwwController | None:
     async with _scan_semaphore:
-        controller = RgbwwController(hass, ip, http_request_timeout=2)
+        controller = RgbwwController(
+            hass,
+            ip,
+            http_request_timeout=2,
+            http_port=http_port,
+            session=session,
+        )
 
         try:
             await controller.refresh()
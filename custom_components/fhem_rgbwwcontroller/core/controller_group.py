@@ -0,0 +1,162 @@
+"""Send the same color commands to several controllers at once."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+import logging
+import time
+from typing import Any, Literal
+
+from .command_scheduler import CommandSuperseded, Lane
+from .light_commands import LightCommand
+from .rgbww_controller import (
+    ControllerApiColorCommand,
+    ControllerUnavailableError,
+    RgbwwController,
+    SendResult,
+)
+from .transition_waiters import TransitionResult
+
+_logger = logging.getLogger(__name__)
+
+
+def encode_commands(commands: Sequence[LightCommand]) -> tuple[dict[str, Any], ...]:
+    return tuple(
+        ControllerApiColorCommand.from_color_command(cmd).asdict_compact()
+        for cmd in commands
+    )
+
+
+class GroupSendError(ControllerUnavailableError):
+    """No member of the group accepted the command."""
+
+    def __init__(self, failures: dict[str, Exception]) -> None:
+        super().__init__(
+            "All group members failed: "
+            + ", ".join(f"{host}: {err}" for host, err in failures.items())
+        )
+        self.failures = failures
+
+
+class ControllerGroup:
+    """Fan out encoded commands to the member controllers.
+
+    Commands are encoded once and posted to all members concurrently, with
+    at most ``max_parallel`` requests in flight. A failing member does not
+    stop the others; failures are returned per member host. A member whose
+    upload was superseded counts as failed, it did not get the commands.
+    """
+
+    def __init__(
+        self, members: Sequence[RgbwwController], max_parallel: int = 4
+    ) -> None:
+        self.members = list(members)
+        self._semaphore = asyncio.Semaphore(max_parallel)
+
+    async def send_commands(
+        self, commands: Sequence[LightCommand]
+    ) -> tuple[dict[str, Exception], list[str]]:
+        encoded = encode_commands(commands)
+        return await self.send_encoded(lambda _: encoded)
+
+    async def send_encoded(
+        self,
+        encoded_for: Callable[[RgbwwController], Sequence[dict[str, Any]]],
+        lane: Lane = Lane.ANIMATION,
+    ) -> tuple[dict[str, Exception], list[str]]:
+        """Send ``encoded_for(member)`` to every member.
+
+        Returns the members that failed and the members that queued the
+        commands for their reconnect. Raises ``GroupSendError`` if all
+        of them failed.
+        """
+        queued: list[str] = []
+
+        async def send(member: RgbwwController) -> None:
+            sent, _ = await member.send_encoded_color_commands(
+                encoded_for(member), lane=lane
+            )
+            if sent is SendResult.QUEUED:
+                queued.append(member.host)
+
+        return await self._fan_out(send), queued
+
+    async def send_channel_command(
+        self, command: Literal["pause", "continue", "stop"], channels: list[str]
+    ) -> dict[str, Exception]:
+        """Pause, continue or stop ``channels`` on every member."""
+
+        async def send(member: RgbwwController) -> None:
+            await member.send_channel_command(command, channels)
+
+        return await self._fan_out(send)
+
+    async def send_encoded_and_wait(
+        self,
+        encoded: Sequence[dict[str, Any]],
+        wait_for: tuple[str, bool],
+        timeout: float,
+    ) -> tuple[dict[str, TransitionResult], dict[str, Exception], list[str]]:
+        """Send ``encoded`` to every member and wait for the step ``wait_for``.
+
+        Returns the transition result of every member that accepted the
+        commands, the members that failed and the members that queued them.
+        """
+        started = time.monotonic()
+        waiters: dict[RgbwwController, asyncio.Future[bool]] = {}
+        queued: list[str] = []
+
+        async def send(member: RgbwwController) -> None:
+            sent, waiter = await member.send_encoded_color_commands(encoded, wait_for)
+            assert waiter is not None
+            waiters[member] = waiter
+            if sent is SendResult.QUEUED:
+                queued.append(member.host)
+
+        try:
+            failures = await self._fan_out(send)
+        except BaseException:
+            for member, waiter in waiters.items():
+                member.transitions.discard(waiter)
+            raise
+        # not limited by the semaphore, waiting does not load the network
+        results = await asyncio.gather(
+            *(
+                member.transitions.wait(waiter, started, timeout)
+                for member, waiter in waiters.items()
+            )
+        )
+        return (
+            {
+                member.host: result
+                for member, result in zip(waiters, results, strict=True)
+            },
+            failures,
+            queued,
+        )
+
+    async def _fan_out(
+        self, send: Callable[[RgbwwController], Awaitable[None]]
+    ) -> dict[str, Exception]:
+        async def limited(member: RgbwwController) -> None:
+            async with self._semaphore:
+                await send(member)
+
+        results = await asyncio.gather(
+            *(limited(member) for member in self.members), return_exceptions=True
+        )
+        failures: dict[str, Exception] = {}
+        for member, result in zip(self.members, results, strict=True):
+            if isinstance(result, ControllerUnavailableError | CommandSuperseded):
+                failures[member.host] = result
+            elif isinstance(result, BaseException):
+                raise result
+        if failures and len(failures) == len(self.members):
+            raise GroupSendError(failures)
+        if failures:
+            _logger.warning(
+                "Group command failed for %s of %s members: %s",
+                len(failures),
+                len(self.members),
+                failures,
+            )
+        return failures
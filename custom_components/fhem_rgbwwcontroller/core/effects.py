@@ -0,0 +1,203 @@
+"""Named light effects, encoded once and sent as a single request.
+
+An effect is a sequence of color commands. Looping effects replace whatever
+runs on the controller (``single`` policy on the first step), queue the
+following steps behind it (``back``) and requeue them. Flash effects
+interrupt a running animation with their first step (``front``) and queue
+the following steps behind it (``back``); the light appends the restore of
+the current color when triggering them. Only the last step is named after
+the effect, so ``transition_finished`` fires once per run (or loop) of the
+effect.
+
+Additional effects are read from ``fhem_rgbwwcontroller_effects.yaml`` in the
+Home Assistant configuration directory, using the animation CLI syntax::
+
+    disco:
+      commands: "0,100,100 1 r; 120,100,100 1 q r; 240,100,100 1 q r"
+    alarm:
+      channels: rgbww
+      commands: "1023,0,0,0,0 0 1s; 0,0,0,0,0 0 1s"
+      flash: true
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util.yaml import load_yaml
+
+from .color_commands import (
+    ChannelsType,
+    ColorCommandHsv,
+    _QueuePolicy,
+    parse_color_commands,
+)
+from .light_commands import LightCommand, restore_command
+from .rgbww_controller import ControllerApiColorCommand, _ColorState
+
+_logger = logging.getLogger(__name__)
+
+EFFECTS_FILE = "fhem_rgbwwcontroller_effects.yaml"
+
+
+@dataclass(frozen=True, slots=True)
+class Effect:
+    name: str
+    flash: bool
+    encoded: tuple[dict[str, Any], ...]  # ControllerApiColorCommand.asdict_compact()
+
+
+def compile_effect(name: str, commands: Sequence[LightCommand], flash: bool) -> Effect:
+    """Apply the queue policy and encode the commands of an effect."""
+    if not commands:
+        raise ValueError(f"effect {name} has no commands")
+    last = len(commands) - 1
+    steps = []
+    for i, cmd in enumerate(commands):
+        step = replace(cmd, anim_name=cmd.anim_name or (name if i == last else None))
+        if flash:
+            # a later front step would interrupt the earlier ones
+            step.queue_policy = _QueuePolicy.FRONT if i == 0 else _QueuePolicy.BACK
+        elif step.queue_policy is None:
+            step.queue_policy = _QueuePolicy.SINGLE if i == 0 else _QueuePolicy.BACK
+        steps.append(step)
+    return Effect(
+        name,
+        flash,
+        tuple(
+            ControllerApiColorCommand.from_color_command(step).asdict_compact()
+            for step in steps
+        ),
+    )
+
+
+def _hsv(
+    h: int | None = None,
+    s: int | None = None,
+    v: int | None = None,
+    *,
+    t: int = 0,
+    stay: int | None = None,
+    requeue: bool | None = None,
+) -> ColorCommandHsv:
+    return ColorCommandHsv(
+        h=h, s=s, v=v, speed_or_fade_duration=t, stay=stay, requeue=requeue
+    )
+
+
+BUILTIN_EFFECTS: dict[str, tuple[bool, tuple[LightCommand, ...]]] = {
+    "rainbow": (
+        False,
+        (
+            _hsv(h=0, s=100, v=100, t=5000, requeue=True),
+            _hsv(h=120, s=100, v=100, t=5000, requeue=True),
+            _hsv(h=240, s=100, v=100, t=5000, requeue=True),
+        ),
+    ),
+    "breathe": (
+        False,
+        (
+            _hsv(v=100, t=2000, requeue=True),
+            _hsv(v=10, t=2000, requeue=True),
+        ),
+    ),
+    "candle": (
+        False,
+        (
+            _hsv(h=28, s=100, v=70, t=150, requeue=True),
+            _hsv(v=55, t=120, requeue=True),
+            _hsv(v=80, t=200, requeue=True),
+            _hsv(v=60, t=90, requeue=True),
+            _hsv(v=75, t=160, requeue=True),
+        ),
+    ),
+    "police": (
+        True,
+        (
+            _hsv(h=0, s=100, v=100, stay=150),
+            _hsv(v=0, stay=100),
+            _hsv(h=240, s=100, v=100, stay=150),
+            _hsv(v=0, stay=100),
+        )
+        * 3,
+    ),
+    "sunrise": (
+        False,
+        (
+            _hsv(h=0, s=100, v=0),
+            _hsv(h=15, s=100, v=30, t=300_000),
+            _hsv(h=30, s=70, v=70, t=300_000),
+            _hsv(h=40, s=20, v=100, t=300_000),
+        ),
+    ),
+}
+
+_EFFECT_SCHEMA = vol.Any(
+    cv.string,
+    vol.Schema(
+        {
+            vol.Required("commands"): cv.string,
+            vol.Optional("channels", default=ChannelsType.HSV): vol.In(
+                [ChannelsType.HSV, ChannelsType.RGBWW]
+            ),
+            vol.Optional("flash", default=False): cv.boolean,
+        }
+    ),
+)
+_EFFECTS_FILE_SCHEMA = vol.Schema({cv.string: _EFFECT_SCHEMA})
+
+
+def load_effects(path: str | None) -> dict[str, Effect]:
+    """Compile the built-in effects and the ones defined in ``path``.
+
+    Does blocking I/O. Invalid user effects are logged and skipped.
+    """
+    effects = {
+        name: compile_effect(name, commands, flash)
+        for name, (flash, commands) in BUILTIN_EFFECTS.items()
+    }
+    if path is None:
+        return effects
+
+    try:
+        definitions = _EFFECTS_FILE_SCHEMA(load_yaml(path) or {})
+    except FileNotFoundError:
+        return effects
+    except (HomeAssistantError, vol.Invalid) as err:
+        _logger.error("Invalid effects file %s: %s", path, err)
+        return effects
+
+    for name, definition in definitions.items():
+        if isinstance(definition, str):
+            definition = {
+                "commands": definition,
+                "channels": ChannelsType.HSV,
+                "flash": False,
+            }
+        try:
+            commands = parse_color_commands(
+                definition["commands"], definition["channels"]
+            )
+            effects[name] = compile_effect(name, commands, definition["flash"])
+        except (ValueError, RuntimeError) as err:
+            _logger.error("Invalid effect %s in %s: %s", name, path, err)
+    return effects
+
+
+def effect_commands(
+    effect: Effect, current: _ColorState | None
+) -> Sequence[dict[str, Any]]:
+    """Return the encoded commands to start ``effect``.
+
+    Flash effects end with the restore of the ``current`` color, the only
+    step that is encoded when the effect is triggered.
+    """
+    if not effect.flash or current is None:
+        return effect.encoded
+    restore = ControllerApiColorCommand.from_color_command(restore_command(current))
+    return (*effect.encoded, restore.asdict_compact())
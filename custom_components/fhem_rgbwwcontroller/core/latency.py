@@ -0,0 +1,138 @@
+"""Latency of HTTP requests and of color commands until their stream echo.
+
+A color command is matched with the first ``color_event`` that moves one of
+its absolute target channels towards the target. Commands without an
+absolute target that differs from the current state (relative values,
+re-sending the current color) are not tracked because no echo can be
+attributed to them.
+"""
+
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from .statistics import RollingWindow
+from .tracing import TRACER
+
+_HSV_STATE = {"h": "hue", "s": "saturation", "v": "brightness", "ct": "color_temp"}
+_RAW_STATE = {"r": "raw_r", "g": "raw_g", "b": "raw_b", "cw": "raw_cw", "ww": "raw_ww"}
+
+
+@dataclass(slots=True)
+class _PendingEcho:
+    sent: float
+    section: str  # "hsv" or "raw"
+    targets: dict[str, float]
+    before: dict[str, float]
+    trace_id: int | None
+
+
+def channel_distance(channel: str, a: float, b: float) -> float:
+    if channel == "h":
+        d = abs(a - b) % 360
+        return min(d, 360 - d)
+    return abs(a - b)
+
+
+class EchoLatencyTracker:
+    """Rolling HTTP round trip and command-to-echo times in ms."""
+
+    window_size = 256
+    endpoint_window_size = 64
+    max_pending = 16
+    echo_timeout = 10.0
+
+    def __init__(self) -> None:
+        self.http_rtt = RollingWindow(self.window_size)
+        self.echo = RollingWindow(self.window_size)
+        self.http_endpoints: dict[str, RollingWindow] = {}
+        self.lost = 0
+        self._pending: list[_PendingEcho] = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def add_http_rtt(self, started: float, endpoint: str) -> None:
+        rtt = (time.monotonic() - started) * 1000
+        self.http_rtt.add(rtt)
+        if (window := self.http_endpoints.get(endpoint)) is None:
+            window = self.http_endpoints[endpoint] = RollingWindow(
+                self.endpoint_window_size
+            )
+        window.add(rtt)
+
+    def command_sent(self, cmd: dict[str, Any], color: Any) -> None:
+        """Start tracking an encoded color command (``asdict_compact``)."""
+        if "hsv" in cmd:
+            section, state_names = "hsv", _HSV_STATE
+        elif "raw" in cmd:
+            section, state_names = "raw", _RAW_STATE
+        else:
+            return
+
+        targets: dict[str, float] = {}
+        before: dict[str, float] = {}
+        for channel, value in cmd[section].items():
+            if channel not in state_names:
+                continue
+            if isinstance(value, str) and value[:1] in "+-":
+                continue  # relative to the current value
+            try:
+                target = float(value)
+            except (TypeError, ValueError):
+                continue
+            current = float(getattr(color, state_names[channel]))
+            if channel_distance(channel, current, target) > 0:
+                targets[channel] = target
+                before[channel] = current
+        if not targets:
+            return
+
+        if len(self._pending) >= self.max_pending:
+            self._pending.pop(0)
+            self.lost += 1
+        trace_id = TRACER.current_trace_id() if TRACER.enabled else None
+        self._pending.append(
+            _PendingEcho(time.monotonic(), section, targets, before, trace_id)
+        )
+
+    def on_color_event(self, params: dict[str, Any]) -> None:
+        """Resolve pending commands that this event is the echo of."""
+        now = time.monotonic()
+        still_pending = []
+        for pending in self._pending:
+            if now - pending.sent > self.echo_timeout:
+                self.lost += 1
+                continue
+            if self._is_echo(pending, params.get(pending.section)):
+                self.echo.add((now - pending.sent) * 1000)
+                if TRACER.enabled:
+                    TRACER.record("echo", pending.sent, now, pending.trace_id)
+            else:
+                still_pending.append(pending)
+        self._pending = still_pending
+
+    @staticmethod
+    def _is_echo(pending: _PendingEcho, values: dict[str, Any] | None) -> bool:
+        if not values:
+            return False
+        for channel, target in pending.targets.items():
+            if (value := values.get(channel)) is None:
+                continue
+            if channel_distance(channel, value, target) < channel_distance(
+                channel, pending.before[channel], target
+            ):
+                return True
+        return False
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "http_rtt_ms": self.http_rtt.summary(),
+            "http_rtt_ms_by_endpoint": {
+                endpoint: window.summary()
+                for endpoint, window in self.http_endpoints.items()
+            },
+            "echo_ms": self.echo.summary(),
+            "echo_lost": self.lost,
+        }
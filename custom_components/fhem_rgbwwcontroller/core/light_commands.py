@@ -0,0 +1,110 @@
+"""Build the controller request for the light's turn_on and turn_off.
+
+All service data of one call (hs, color temperature, brightness, rgbww,
+transition, flash) is merged into a single color command, so every call
+costs exactly one HTTP request. A flash is two steps sent in the same
+request: the flash color held for the flash duration, inserted with the
+``front`` policy, and the restore of the current color queued behind it with
+the ``back`` policy. Only one ``front`` step is sent per request, since each
+one interrupts whatever runs, including an earlier step of the same request.
+If an animation is running, it resumes after the flash and the restore
+follows once the queue has drained.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_FLASH,
+    ATTR_HS_COLOR,
+    ATTR_RGBWW_COLOR,
+    ATTR_TRANSITION,
+    FLASH_LONG,
+    FLASH_SHORT,
+)
+
+from .color_commands import ColorCommandHsv, ColorCommandRgbww, _QueuePolicy
+from .color_math import brightness_to_percent, rgbww_to_raw
+
+if TYPE_CHECKING:
+    from .rgbww_controller import _ColorState
+
+DEFAULT_TRANSITION = 500  # ms
+FLASH_DURATION = {FLASH_SHORT: 500, FLASH_LONG: 2000}  # ms
+
+LightCommand = ColorCommandHsv | ColorCommandRgbww
+
+
+def build_turn_on(
+    kwargs: dict[str, Any], current: "_ColorState | None", is_on: bool
+) -> list[LightCommand]:
+    """Return the commands for a turn_on call, sent as one request."""
+    brightness = kwargs.get(ATTR_BRIGHTNESS)
+    cmd: LightCommand
+
+    if (rgbww := kwargs.get(ATTR_RGBWW_COLOR)) is not None:
+        if brightness is not None and (peak := max(rgbww)) > 0:
+            rgbww = tuple(round(c * brightness / peak) for c in rgbww)
+        r, g, b, cw, ww = rgbww_to_raw(rgbww)
+        cmd = ColorCommandRgbww(r=r, g=g, b=b, cw=cw, ww=ww)
+    else:
+        cmd = ColorCommandHsv()
+        if (hs := kwargs.get(ATTR_HS_COLOR)) is not None:
+            cmd.h, cmd.s = hs
+        if (ct := kwargs.get(ATTR_COLOR_TEMP_KELVIN)) is not None:
+            cmd.ct = ct
+        if brightness is not None:
+            cmd.v = brightness_to_percent(brightness)
+        elif not is_on or (hs is None and ct is None):
+            cmd.v = 100  # plain turn on, or a color for a light that is off
+
+    return _finish(cmd, kwargs, current)
+
+
+def build_turn_off(
+    kwargs: dict[str, Any], current: "_ColorState | None"
+) -> list[LightCommand]:
+    """Return the commands for a turn_off call, sent as one request."""
+    return _finish(ColorCommandHsv(v=0), kwargs, current)
+
+
+def _finish(
+    cmd: LightCommand, kwargs: dict[str, Any], current: "_ColorState | None"
+) -> list[LightCommand]:
+    if (flash := kwargs.get(ATTR_FLASH)) is not None:
+        cmd.speed_or_fade_duration = 0
+        cmd.stay = FLASH_DURATION.get(flash, FLASH_DURATION[FLASH_SHORT])
+        cmd.queue_policy = _QueuePolicy.FRONT
+        if current is None:
+            return [cmd]
+        return [cmd, restore_command(current)]
+
+    if (transition := kwargs.get(ATTR_TRANSITION)) is not None:
+        cmd.speed_or_fade_duration = int(transition * 1000)  # s to ms
+    elif isinstance(cmd, ColorCommandRgbww) or cmd.v != 0:
+        cmd.speed_or_fade_duration = DEFAULT_TRANSITION
+    return [cmd]
+
+
+def restore_command(current: "_ColorState") -> LightCommand:
+    """Return a step back to ``current``, queued behind a flash."""
+    restore: LightCommand
+    if current.color_mode == "raw":
+        restore = ColorCommandRgbww(
+            r=current.raw_r,
+            g=current.raw_g,
+            b=current.raw_b,
+            cw=current.raw_cw,
+            ww=current.raw_ww,
+        )
+    else:
+        restore = ColorCommandHsv(
+            h=current.hue,
+            s=current.saturation,
+            v=current.brightness,
+            ct=current.color_temp,
+        )
+    restore.speed_or_fade_duration = 0
+    restore.queue_policy = _QueuePolicy.BACK
+    return restore
@@ -0,0 +1,45 @@
+"""Always-on log of the most recent stream messages."""
+
+import time
+from typing import Any
+
+
+class MessageLog:
+    """Preallocated ring buffer of ``(receive time, message)``.
+
+    Appending stores two references and bumps an index, no allocation and no
+    copy of the message, so it can stay enabled on the stream path.
+    """
+
+    __slots__ = ("_messages", "_pos", "_size", "_times", "total")
+
+    def __init__(self, size: int = 100) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._size = size
+        self._times = [0.0] * size
+        self._messages: list[dict[str, Any] | None] = [None] * size
+        self._pos = 0
+        self.total = 0
+
+    def append(self, message: dict[str, Any]) -> None:
+        pos = self._pos
+        self._times[pos] = time.time()
+        self._messages[pos] = message
+        self._pos = pos + 1 if pos + 1 < self._size else 0
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self._size)
+
+    def entries(self) -> list[tuple[float, dict[str, Any]]]:
+        """Return the logged messages, oldest first."""
+        count = len(self)
+        start = (self._pos - count) % self._size
+        result = []
+        for i in range(count):
+            pos = (start + i) % self._size
+            message = self._messages[pos]
+            assert message is not None
+            result.append((self._times[pos], message))
+        return result
@@ -0,0 +1,62 @@
+"""Bounded queue between the stream reader and the message dispatcher."""
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Collection
+from typing import Any
+
+
+class MessageQueue:
+    """FIFO of decoded stream messages with drop-oldest for stale state.
+
+    When the queue is full the oldest message whose method is in
+    ``droppable`` is discarded; those messages carry a full state snapshot
+    that a newer message supersedes. Other messages (``transition_finished``,
+    ``config``, ...) are never dropped, the queue grows past ``maxsize`` for
+    them instead.
+    """
+
+    def __init__(
+        self, maxsize: int = 256, droppable: Collection[str] = ("color_event",)
+    ) -> None:
+        self.maxsize = maxsize
+        self.droppable = frozenset(droppable)
+        self._items: deque[dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self.dropped: Counter[str] = Counter()
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, message: dict[str, Any]) -> None:
+        items = self._items
+        if len(items) >= self.maxsize:
+            self._drop_oldest()
+        items.append(message)
+        if len(items) > self.high_water:
+            self.high_water = len(items)
+        self._ready.set()
+
+    def _drop_oldest(self) -> None:
+        for i, queued in enumerate(self._items):
+            if (method := queued.get("method")) in self.droppable:
+                del self._items[i]
+                self.dropped[method] += 1
+                return
+
+    def clear(self) -> None:
+        """Drop all queued messages, the counters are kept."""
+        self._items.clear()
+        self._ready.clear()
+
+    def popleft(self) -> dict[str, Any] | None:
+        return self._items.popleft() if self._items else None
+
+    async def wait(self) -> None:
+        """Wait until messages were put (or ``wake`` was called)."""
+        await self._ready.wait()
+        self._ready.clear()
+
+    def wake(self) -> None:
+        self._ready.set()
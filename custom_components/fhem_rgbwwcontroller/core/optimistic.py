@@ -0,0 +1,129 @@
+"""Optimistic light state, confirmed or rolled back by the controller.
+
+After a command the light shows its target immediately and remembers it as
+pending. Color events that have not reached the target yet (the stale state
+before the command, the steps of the fade) are held back so the UI does not
+flicker. The first color event at the target confirms it. If none arrives
+before the deadline, the transition time plus a margin derived from the
+measured round trip times, the light goes back to the last state the
+controller reported.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .color_commands import ColorCommandHsv, ColorCommandRgbww
+from .latency import EchoLatencyTracker, channel_distance
+
+_logger = logging.getLogger(__name__)
+
+_HSV_FIELDS = {"h": "hue", "s": "saturation", "v": "brightness", "ct": "color_temp"}
+_RAW_FIELDS = {"r": "raw_r", "g": "raw_g", "b": "raw_b", "cw": "raw_cw", "ww": "raw_ww"}
+_TOLERANCE = {"color_temp": 10.0}  # the controller reports rounded values
+_DEFAULT_TOLERANCE = 1.0
+
+
+@dataclass(slots=True)
+class _PendingTarget:
+    command: ColorCommandHsv | ColorCommandRgbww
+    color_mode: str  # "hsv" or "raw"
+    targets: dict[str, float]  # color state attribute -> value
+    deadline: float  # time.monotonic()
+
+
+class OptimisticColor:
+    """The target of the most recent command until the controller echoes it."""
+
+    rtt_factor = 3.0
+    min_margin = 1.0  # s
+    max_margin = 10.0  # s
+    default_rtt = 0.5  # s, before any round trip was measured
+
+    def __init__(
+        self, latency: EchoLatencyTracker, on_timeout: Callable[[], None]
+    ) -> None:
+        self._latency = latency
+        self._on_timeout = on_timeout
+        self._pending: _PendingTarget | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self.confirmed = 0
+        self.rolled_back = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def expect(self, cmd: ColorCommandHsv | ColorCommandRgbww) -> None:
+        """Track ``cmd``, replacing any older pending command."""
+        self.cancel()
+        if isinstance(cmd, ColorCommandHsv):
+            color_mode, fields = "hsv", _HSV_FIELDS
+        else:
+            color_mode, fields = "raw", _RAW_FIELDS
+
+        targets: dict[str, float] = {}
+        for field_name, attr in fields.items():
+            value: Any = getattr(cmd, field_name)
+            if isinstance(value, (int, float)):  # relative strings can't be checked
+                targets[attr] = float(value)
+        if not targets:
+            return
+
+        timeout = (cmd.speed_or_fade_duration or 0) / 1000 + self._margin()
+        if cmd.use_speed:
+            timeout = self.max_margin  # duration depends on the distance
+        self._pending = _PendingTarget(
+            cmd, color_mode, targets, time.monotonic() + timeout
+        )
+        self._timer = asyncio.get_running_loop().call_later(timeout, self._expired)
+
+    def _margin(self) -> float:
+        rtt = self._latency.echo.percentile(95)
+        if rtt is None:
+            rtt = self._latency.http_rtt.percentile(95)
+        margin = self.rtt_factor * (rtt / 1000 if rtt is not None else self.default_rtt)
+        return min(max(margin, self.min_margin), self.max_margin)
+
+    def confirm(self, color: Any) -> bool:
+        """Return whether the controller ``color`` state reached the target.
+
+        A confirmed target is no longer pending.
+        """
+        pending = self._pending
+        if pending is None:
+            return True
+        if color.color_mode != pending.color_mode:
+            return False
+        for attr, target in pending.targets.items():
+            channel = "h" if attr == "hue" else attr
+            if channel_distance(
+                channel, getattr(color, attr), target
+            ) > _TOLERANCE.get(attr, _DEFAULT_TOLERANCE):
+                return False
+        self.cancel()
+        self.confirmed += 1
+        return True
+
+    def discard(self, cmd: ColorCommandHsv | ColorCommandRgbww) -> None:
+        """Stop tracking ``cmd`` unless a newer command replaced it."""
+        if self._pending is not None and self._pending.command is cmd:
+            self.cancel()
+
+    def cancel(self) -> None:
+        self._pending = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _expired(self) -> None:
+        self._timer = None
+        if self._pending is None:
+            return
+        _logger.debug("Command not confirmed in time, rolling back: %s", self._pending)
+        self._pending = None
+        self.rolled_back += 1
+        self._on_timeout()
@@ -0,0 +1,128 @@
+"""Token bucket protecting the HTTP server of a controller.
+
+The ESP HTTP server handles few requests per second; bursts from many
+automations, scans and config flows make it time out or reboot. Every
+request takes a token first. Tokens refill at ``rate`` per second up to
+``burst``; without one the request waits until the next token is due, so the
+device keeps working at its capacity instead of running into timeouts.
+
+Every ``RgbwwController`` owns its bucket, so it goes away with the config
+entry. The limit is set in the entry options or derived from the firmware
+info; the short-lived controllers of config flows and network scans are not
+throttled against the entry's budget.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .statistics import RollingWindow
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    rate: float  # requests per s
+    burst: int
+
+    @classmethod
+    def from_rate(cls, rate: float) -> "RateLimit":
+        """Return the limit for ``rate`` with a burst of one second."""
+        return cls(rate, max(1, round(rate)))
+
+
+DEFAULT_RATE_LIMIT = RateLimit(4.0, 4)
+_ESP32_RATE_LIMIT = RateLimit(16.0, 8)
+_LOW_HEAP_RATE_LIMIT = RateLimit(2.0, 2)
+
+_ESP32_MIN_HEAP = 100_000  # bytes, ESP8266 boards never have that much free
+_LOW_HEAP = 12_000  # bytes, the web server fails on allocations below that
+
+# Info fields naming the chip; which of them exist depends on the firmware
+_PLATFORM_FIELDS = ("soc", "platform", "chip", "firmware", "git_version")
+_PLATFORMS = ("esp32", "esp8266")
+
+
+def _platform(info: dict[str, Any]) -> str | None:
+    for name in _PLATFORM_FIELDS:
+        if isinstance(value := info.get(name), str):
+            value = value.lower()
+            for platform in _PLATFORMS:
+                if platform in value:
+                    return platform
+    return None
+
+
+def rate_limit_for_info(info: dict[str, Any]) -> RateLimit:
+    """Derive the limit from the chip and free heap reported by the firmware.
+
+    Firmware that does not name the chip is taken for an ESP32 by its heap.
+    """
+    heap = info.get("heap_free")
+    if isinstance(heap, int) and heap < _LOW_HEAP:
+        return _LOW_HEAP_RATE_LIMIT
+    if (platform := _platform(info)) is not None:
+        return _ESP32_RATE_LIMIT if platform == "esp32" else DEFAULT_RATE_LIMIT
+    if isinstance(heap, int) and heap >= _ESP32_MIN_HEAP:
+        return _ESP32_RATE_LIMIT
+    return DEFAULT_RATE_LIMIT
+
+
+class TokenBucket:
+    """Requests of one device, waiting in arrival order when out of tokens."""
+
+    def __init__(self, limit: RateLimit = DEFAULT_RATE_LIMIT) -> None:
+        self.limit = limit
+        self.configured = False  # set explicitly, not derived from info
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_ms = RollingWindow(64)  # of throttled requests
+
+    def set_limit(self, limit: RateLimit, configured: bool = False) -> None:
+        if self.configured and not configured:
+            return  # keep the explicit limit
+        if limit != self.limit:
+            _logger.debug("Rate limit changed from %s to %s", self.limit, limit)
+        self._refill(time.monotonic())
+        self.limit = limit
+        self.configured = configured
+        self._tokens = min(self._tokens, float(limit.burst))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self.limit.rate,
+            float(self.limit.burst),
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Take the token right away, possibly going into debt; later callers
+        # then wait behind the earlier ones without needing a lock.
+        self._refill(time.monotonic())
+        self._tokens -= 1
+        self.acquired += 1
+        if self._tokens >= 0:
+            return
+        wait = -self._tokens / self.limit.rate
+        self.throttled += 1
+        self.wait_ms.add(wait * 1000)
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._tokens += 1  # not sent, later callers need not wait for it
+            raise
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "rate": self.limit.rate,
+            "burst": self.limit.burst,
+            "configured": self.configured,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_ms": self.wait_ms.summary(),
+        }
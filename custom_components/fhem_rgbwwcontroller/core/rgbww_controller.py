@@ -1,7 +1,8 @@
 import asyncio
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 import contextlib
 from dataclasses import asdict, dataclass
+from enum import StrEnum
 import json
 import logging
 import os
@@ -9,13 +10,26 @@ import random
 import time
 from typing import Any, Literal, Protocol, Self
 
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientSession
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .color_commands import ColorCommandBase, ColorCommandHsv, ColorCommandRgbww
+from .command_journal import CommandJournal
+from .command_scheduler import CommandScheduler, Lane
+from .connection_stats import ConnectionStats
+from .latency import EchoLatencyTracker
+from .message_log import MessageLog
+from .message_queue import MessageQueue
+from .rate_limit import RateLimit, TokenBucket, rate_limit_for_info
+from .tracing import TRACER
+from .transition_waiters import (
+    TransitionWaiters,
+    expected_finishes,
+    replaces_queue,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -30,6 +44,13 @@ class ControllerUnavailableError(Exception):
     """Custom exception for when the controller is unavailable."""
 
 
+class SendResult(StrEnum):
+    """What happened to color commands handed to the controller."""
+
+    SENT = "sent"
+    QUEUED = "queued"  # journaled, replayed once the connection is back
+
+
 class RgbwwStateUpdate(Protocol):
     def on_update_color(self) -> None: ...
     def on_connection_update(self) -> None: ...
@@ -40,6 +61,25 @@ class RgbwwStateUpdate(Protocol):
     def delme_func(self) -> None: ...
 
 
+class ColorField:
+    """Bits of ``_ColorState.changed``."""
+
+    HUE = 1 << 0
+    SATURATION = 1 << 1
+    BRIGHTNESS = 1 << 2
+    COLOR_TEMP = 1 << 3
+    MODE = 1 << 4
+    RAW_R = 1 << 5
+    RAW_G = 1 << 6
+    RAW_B = 1 << 7
+    RAW_WW = 1 << 8
+    RAW_CW = 1 << 9
+
+    HSV = HUE | SATURATION | BRIGHTNESS | COLOR_TEMP
+    RAW = RAW_R | RAW_G | RAW_B | RAW_WW | RAW_CW
+    ALL = HSV | MODE | RAW
+
+
 @dataclass
 class _ColorState:
     color_temp: int
@@ -52,6 +92,10 @@ class _ColorState:
     raw_b: int
     raw_ww: int
     raw_cw: int
+    # Incremented for every applied color update, ``changed`` holds the
+    # ColorField bits that this update modified.
+    version: int = 0
+    changed: int = 0
 
 
 @dataclass
@@ -167,15 +211,39 @@ class RgbwwController:
 
     _TCP_PORT = 9090
     _WATCHDOG_DISCONNECT_TIMEOUT = 70
+    _RECONNECT_DELAY = 10
+    _QUEUE_SIZE = 256
+    _DISPATCH_BATCH = 32  # messages dispatched before yielding to the reader
 
     def __init__(
-        self, hass: HomeAssistant, host: str, http_request_timeout: int = 20
+        self,
+        hass: HomeAssistant | None,
+        host: str,
+        http_request_timeout: float = 20,
+        *,
+        http_port: int = 80,
+        tcp_port: int | None = None,
+        session: ClientSession | None = None,
+        rate_limit: RateLimit | None = None,
     ) -> None:
+        """Initialize the controller.
+
+        Either ``hass`` or ``session`` must be given. Ports only need to be
+        changed for non-standard setups like the local fake controller.
+        Without ``rate_limit`` the limit is derived from the firmware info.
+        """
         self._hass = hass
         self.host = host
+        self._base_url = (
+            f"http://{host}" if http_port == 80 else f"http://{host}:{http_port}"
+        )
+        self._tcp_port = tcp_port if tcp_port is not None else self._TCP_PORT
+        self._session = session
         self.connected = False
         self.color = _ColorState(0, 0, 0, 0, "raw", 0, 0, 0, 0, 0)
         self._connection_task: asyncio.Task[None] | None = None
+        self._dispatcher_task: asyncio.Task[None] | None = None
+        self._replay_task: asyncio.Task[None] | None = None
         self._info_cached: dict[str, Any] | None = None
         self._config_cached: dict[str, Any] | None = None
         self._clock_slave_status_cache: dict[str, Any] | None = None
@@ -187,6 +255,16 @@ class RgbwwController:
         self.state_completed = False
         self._simulation = os.getenv("SIMULATION")
         self._http_request_timeout = http_request_timeout
+        self.latency = EchoLatencyTracker()
+        self.stats = ConnectionStats()
+        self.message_log = MessageLog()
+        self.queue = MessageQueue(self._QUEUE_SIZE)
+        self.transitions = TransitionWaiters()
+        self.journal = CommandJournal()
+        self.scheduler = CommandScheduler()
+        self.rate_limit = TokenBucket()
+        if rate_limit is not None:
+            self.rate_limit.set_limit(rate_limit, configured=True)
 
     def _consume_json_msg(self) -> dict[str, Any] | None:
         try:
@@ -196,11 +274,62 @@ class RgbwwController:
 
             self._buffer = self._buffer[end_pos:]
         except json.JSONDecodeError:
+            stripped = self._buffer.lstrip()
+            if stripped[:1] not in ("", "{"):
+                # Garbage in front of the next message, resync on the next object
+                self.stats.decode_errors += 1
+                start = stripped.find("{")
+                self._buffer = stripped[start:] if start >= 0 else ""
+                return self._consume_json_msg()
+            self._buffer = stripped
             # Not a complete JSON object yet, break and wait for more data
             return None
         else:
             return json_obj
 
+    def _frame_stream_data(self, data: bytes) -> Iterator[dict[str, Any]]:
+        """Yield all complete messages after appending a received chunk."""
+        self.stats.bytes_received += len(data)
+        try:
+            self._buffer += data.decode("utf-8")
+        except UnicodeDecodeError:
+            self.stats.decode_errors += 1
+            self._buffer += data.decode("utf-8", errors="ignore")
+
+        while (json_msg := self._consume_json_msg()) is not None:
+            yield json_msg
+
+    def _enqueue_stream_data(self, data: bytes) -> None:
+        """Frame a received chunk and hand the messages to the dispatcher."""
+        log = self.message_log.append  # stamps the receive time
+        put = self.queue.put
+        for json_msg in self._frame_stream_data(data):
+            log(json_msg)
+            put(json_msg)
+
+    def _dispatch_batch(self) -> int:
+        """Run the callbacks of up to ``_DISPATCH_BATCH`` queued messages."""
+        queue = self.queue
+        dispatched = 0
+        while dispatched < self._DISPATCH_BATCH:
+            if (json_msg := queue.popleft()) is None:
+                break
+            try:
+                self._on_json_message(json_msg)
+            except Exception:
+                _logger.exception(
+                    "%s - Failed to handle %s", self.host, json_msg.get("method")
+                )
+            dispatched += 1
+        return dispatched
+
+    async def _run_dispatcher(self) -> None:
+        """Run the callbacks of queued messages, decoupled from socket reads."""
+        while not self._stop_event.is_set():
+            await self.queue.wait()
+            while self._dispatch_batch() == self._DISPATCH_BATCH:
+                await asyncio.sleep(0)  # let the reader catch up
+
     async def _run_connection_task(self):
         """Connects to a server and automatically reconnects if the connection is lost."""
         self._buffer = ""
@@ -215,7 +344,12 @@ class RgbwwController:
                         method = name
                         if method == "color":
                             method = "color_event"
-                        return {"method": method, "params": _SIM_RESPONSES[name]}
+                        json_msg = {
+                            "method": method,
+                            "params": _SIM_RESPONSES[name],
+                        }
+                        self.message_log.append(json_msg)
+                        return json_msg
 
                     if init:
                         await asyncio.sleep(0.3)
@@ -242,17 +376,20 @@ class RgbwwController:
                 _logger.exception("An unexpected error occurred", exc_info=e)
 
         while not self._stop_event.is_set():
+            reason = "stopped"
             try:
                 # 1. Attempt to connect
                 _logger.info(
-                    "🔌 Attempting to connect to %s:%s...", self.host, self._TCP_PORT
+                    "🔌 Attempting to connect to %s:%s...", self.host, self._tcp_port
                 )
                 reader, self._writer = await asyncio.open_connection(
-                    self.host, self._TCP_PORT
+                    self.host, self._tcp_port
                 )
 
                 # 2. Connection Established Notification
                 # If we reach this line, the connection was successful.
+                self._buffer = ""  # drop a partial message of the last session
+                self.stats.on_connected()
                 await self.on_connect_status_change(True)
 
                 # 3. Main loop to read data (your "work" goes here)
@@ -268,38 +405,41 @@ class RgbwwController:
                             "🔥 Keep-alive timeout! No data received for %s s.",
                             self._WATCHDOG_DISCONNECT_TIMEOUT,
                         )
+                        reason = "keep-alive timeout"
                         break
 
                     if not data:
                         # This indicates the server has closed the connection gracefully.
                         _logger.warning("🚪 Server closed the connection.")
+                        reason = "closed by controller"
                         break  # Exit the inner loop to trigger reconnection logic.
 
-                    self._buffer += data.decode("utf-8")
-
-                    while (json_msg := self._consume_json_msg()) is not None:
-                        self._on_json_message(json_msg)
+                    self._enqueue_stream_data(data)
                     # -----------------------------
             except (ConnectionResetError, asyncio.IncompleteReadError) as e:
                 # This happens if an established connection is lost mid-communication
                 _logger.warning("💔 Connection lost: %s", str(e))
+                reason = f"connection lost: {e}"
 
             except (ConnectionRefusedError, OSError) as e:
                 # This happens if the server is not running or unreachable
                 _logger.warning("❌ Connection failed: %s", str(e))
+                reason = f"connection failed: {e}"
 
             except Exception as e:
                 # Catch any other unexpected errors
                 _logger.error("An unexpected error occurred: %s", str(e))
+                reason = f"error: {e!r}"
 
             finally:
                 # 4. Cleanup before retrying
                 if self._writer:
                     self._writer.close()
                     await self._writer.wait_closed()
+                self.stats.on_disconnected(reason)
                 await self.on_connect_status_change(False)
 
-            reconnect_delay = 10
+            reconnect_delay = self._RECONNECT_DELAY
             _logger.info("🔄 Reconnecting in %s seconds...", reconnect_delay)
 
             with contextlib.suppress(asyncio.TimeoutError):
@@ -326,6 +466,14 @@ class RgbwwController:
             return  # No change
 
         self.connected = connected
+        if not connected:
+            # finished events sent while disconnected are lost
+            self.transitions.interrupt("connection lost")
+        elif self.journal and self._replay_task is None:
+            # not awaited, the stream must be read meanwhile
+            self._replay_task = asyncio.create_task(
+                self._replay_journal(), name="fhem_rgbwwcontroller_replay"
+            )
         for x in self._callbacks.values():
             x.on_connection_update()
 
@@ -335,6 +483,10 @@ class RgbwwController:
             return  # Connection task already running
 
         self._stop_event = asyncio.Event()
+        self.queue.clear()  # messages of the previous session are stale
+        self._dispatcher_task = asyncio.create_task(
+            self._run_dispatcher(), name="fhem_rgbwwcontroller_dispatcher"
+        )
         self._connection_task = asyncio.create_task(
             self._run_connection_task(), name="fhem_rgbwwcontroller_connection"
         )
@@ -348,6 +500,7 @@ class RgbwwController:
 
         # 1. Signal the loop to not attempt reconnection
         self._stop_event.set()
+        self.queue.wake()
 
         # 2. If there's an active connection, close it to interrupt reader.read()
         if self._writer:
@@ -355,39 +508,151 @@ class RgbwwController:
             self._writer.close()
             await self._writer.wait_closed()
 
+        # 3. Stop the tasks, so nothing outlives the config entry
+        for task in (self._replay_task, self._dispatcher_task, self._connection_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._replay_task = None
+        self._dispatcher_task = None
+        self._connection_task = None
+
     async def send_color_command(
-        self, color_command: ColorCommandHsv | ColorCommandRgbww
-    ) -> None:
-        await self._send_color(
-            payload=ControllerApiColorCommand.from_color_command(
+        self,
+        color_command: ColorCommandHsv | ColorCommandRgbww,
+        lane: Lane = Lane.INTERACTIVE,
+    ) -> SendResult:
+        with TRACER.span("serialize", steps=1):
+            payload = ControllerApiColorCommand.from_color_command(
                 color_command
             ).asdict_compact()
-        )
+        self._interrupt_replaced((payload,))
+        return await self._send_color(payload, lane)
 
     async def send_color_commands(
-        self, anim_commands: Sequence[ColorCommandHsv | ColorCommandRgbww]
-    ) -> None:
-        cmds = {
-            "cmds": [
-                ControllerApiColorCommand.from_color_command(x).asdict_compact()
-                for x in anim_commands
-            ]
-        }
-        await self._send_color(cmds)
+        self,
+        anim_commands: Sequence[ColorCommandHsv | ColorCommandRgbww],
+        lane: Lane = Lane.INTERACTIVE,
+    ) -> SendResult:
+        with TRACER.span("serialize", steps=len(anim_commands)):
+            cmds = {
+                "cmds": [
+                    ControllerApiColorCommand.from_color_command(x).asdict_compact()
+                    for x in anim_commands
+                ]
+            }
+        self._interrupt_replaced(cmds["cmds"])
+        return await self._send_color(cmds, lane)
+
+    async def send_encoded_color_commands(
+        self,
+        encoded: Sequence[dict[str, Any]],
+        wait_for: tuple[str, bool] | None = None,
+        lane: Lane = Lane.ANIMATION,
+    ) -> tuple[SendResult, asyncio.Future[bool] | None]:
+        """Send commands that were encoded in advance (``asdict_compact``).
+
+        With ``wait_for`` (name, requeued) also returns a future resolved once
+        every command of ``encoded`` with that name and requeue flag that is
+        not dropped by a later one finished, see ``expected_finishes``. Raises ``CommandSuperseded`` if an
+        interactive command replaced the upload while it waited for its turn.
+        """
+        self._interrupt_replaced(encoded)
+        if wait_for is None:
+            return await self._send_encoded(encoded, lane), None
+
+        name, requeued = wait_for
+        waiter = self.transitions.expect(
+            name, requeued, expected_finishes(encoded, name, requeued)
+        )
+        try:
+            result = await self._send_encoded(encoded, lane)
+        except BaseException:
+            self.transitions.discard(waiter)
+            raise
+        return result, waiter
+
+    async def _send_encoded(
+        self, encoded: Sequence[dict[str, Any]], lane: Lane
+    ) -> SendResult:
+        return await self._send_color({"cmds": encoded}, lane)
+
+    def _interrupt_replaced(self, cmds: Sequence[dict[str, Any]]) -> None:
+        if replaces_queue(cmds):
+            self.transitions.interrupt("queue replaced")
+
+    async def _send_color(self, payload: dict[str, Any], lane: Lane) -> SendResult:
+        cmds = payload.get("cmds", (payload,))
+        if self._replay_task is not None or (
+            not self.connected and self._connection_task is not None
+        ):
+            # briefly away, don't wait for the HTTP timeout. While replaying,
+            # queue behind the journal so the commands keep their order.
+            self.journal.record(cmds)
+            _logger.info("%s - Command journaled for the replay", self.host)
+            return SendResult.QUEUED
+        if cmds:
+            self.latency.command_sent(cmds[0], self.color)
+        try:
+            with TRACER.span("send", endpoint="color"):
+                await self._send_http_post("color", payload, lane, cmds)
+        except ControllerUnavailableError as err:
+            if self._connection_task is None:
+                raise  # not connecting, nothing would replay it
+            # the stream has not noticed yet (keep-alive watchdog), so drop it:
+            # the reconnect replays the journal
+            self.journal.record(cmds)
+            _logger.warning(
+                "%s - Color command failed, journaled for the replay: %s",
+                self.host,
+                err,
+            )
+            self._drop_connection()
+            return SendResult.QUEUED
+        return SendResult.SENT
+
+    def _drop_connection(self) -> None:
+        if self.connected and self._writer is not None:
+            self._writer.close()
 
-    async def _send_color(self, payload: dict[str, Any]) -> None:
-        await self._send_http_post("color", payload=payload)
+    async def _replay_journal(self) -> None:
+        # commands sent during the replay are journaled as well
+        try:
+            while cmds := self.journal.take():
+                _logger.info(
+                    "%s - Replaying %s journaled commands", self.host, len(cmds)
+                )
+                with TRACER.span("send", endpoint="color"):
+                    await self._send_http_post(
+                        "color", {"cmds": cmds}, Lane.INTERACTIVE
+                    )
+        except ControllerUnavailableError as err:
+            _logger.warning("%s - Replay failed, dropped: %s", self.host, err)
+        finally:
+            self._replay_task = None
 
     async def send_channel_command(
         self,
         command: Literal["pause", "continue", "stop"],
         channels: list[str],
+        at: float | None = None,
     ) -> None:
+        """Pause, continue or stop ``channels``.
+
+        With ``at`` (``time.monotonic()``) the command takes its request slot
+        and rate limit token ahead and holds them until it is posted at ``at``.
+        """
         channel_name_map = {
             "hue": "h",
             "saturation": "s",
             "value": "v",
             "color_temp": "ct",
+            "red": "r",
+            "green": "g",
+            "blue": "b",
+            "cw": "cw",
+            "ww": "ww",
         }
         if command not in ["pause", "continue", "stop"]:
             raise ValueError("Invalid command")
@@ -399,47 +664,80 @@ class RgbwwController:
         channels = [channel_name_map[ch] for ch in channels]
         data: dict[str, Any] = {"channels": channels}
 
-        await self._send_http_post(command, data)
+        if command == "stop":
+            self.transitions.interrupt("stopped")
+        lane = Lane.ANIMATION if at is None else Lane.INTERACTIVE
+        with TRACER.span("send", endpoint=command):
+            await self._send_http_post(command, data, lane, at=at)
 
     def _update_colorstate_from_json(self, json_msg: dict[str, Any]) -> None:
-        if "hsv" in json_msg:
-            self.color.hue = json_msg["hsv"].get("h", self.color.hue)
-            self.color.saturation = json_msg["hsv"].get("s", self.color.saturation)
-            self.color.color_temp = json_msg["hsv"].get("ct", self.color.color_temp)
-            self.color.brightness = json_msg["hsv"].get("v", self.color.brightness)
-
-        if "raw" in json_msg:
-            self.color.raw_ww = json_msg["raw"].get("ww", self.color.raw_ww)
-            self.color.raw_cw = json_msg["raw"].get("cw", self.color.raw_cw)
-            self.color.raw_r = json_msg["raw"].get("r", self.color.raw_r)
-            self.color.raw_g = json_msg["raw"].get("g", self.color.raw_g)
-            self.color.raw_b = json_msg["raw"].get("b", self.color.raw_b)
-
-        if "mode" in json_msg:
-            self.color.color_mode = json_msg["mode"]
+        color = self.color
+        changed = 0
+        if (hsv := json_msg.get("hsv")) is not None:
+            if (value := hsv.get("h", color.hue)) != color.hue:
+                color.hue = value
+                changed |= ColorField.HUE
+            if (value := hsv.get("s", color.saturation)) != color.saturation:
+                color.saturation = value
+                changed |= ColorField.SATURATION
+            if (value := hsv.get("ct", color.color_temp)) != color.color_temp:
+                color.color_temp = value
+                changed |= ColorField.COLOR_TEMP
+            if (value := hsv.get("v", color.brightness)) != color.brightness:
+                color.brightness = value
+                changed |= ColorField.BRIGHTNESS
+
+        if (raw := json_msg.get("raw")) is not None:
+            if (value := raw.get("ww", color.raw_ww)) != color.raw_ww:
+                color.raw_ww = value
+                changed |= ColorField.RAW_WW
+            if (value := raw.get("cw", color.raw_cw)) != color.raw_cw:
+                color.raw_cw = value
+                changed |= ColorField.RAW_CW
+            if (value := raw.get("r", color.raw_r)) != color.raw_r:
+                color.raw_r = value
+                changed |= ColorField.RAW_R
+            if (value := raw.get("g", color.raw_g)) != color.raw_g:
+                color.raw_g = value
+                changed |= ColorField.RAW_G
+            if (value := raw.get("b", color.raw_b)) != color.raw_b:
+                color.raw_b = value
+                changed |= ColorField.RAW_B
+
+        if "mode" in json_msg and json_msg["mode"] != color.color_mode:
+            color.color_mode = json_msg["mode"]
+            changed |= ColorField.MODE
+
+        color.version += 1
+        color.changed = changed
 
     def _on_json_message(self, json_msg: dict[str, Any]) -> None:
         # ANY data from the server resets the timer.
-        match json_msg["method"]:
+        method = json_msg["method"]
+        self.stats.messages[method] += 1
+        match method:
             case "color_event":
                 self._update_colorstate_from_json(json_msg["params"])
                 _logger.debug("%s - %s", self.host, self.color)
+                if self.latency.pending:
+                    self.latency.on_color_event(json_msg["params"])
 
                 for x in self._callbacks.values():
                     x.on_update_color()
             case "info":
-                self._info_cached = json_msg["params"]
+                self._set_info(json_msg["params"])
             case "transition_finished":
+                name = json_msg["params"]["name"]
+                requeued = json_msg["params"]["requeued"]
+                self.transitions.finished(name, requeued)
                 for x in self._callbacks.values():
-                    x.on_transition_finished(
-                        json_msg["params"]["name"], json_msg["params"]["requeued"]
-                    )
+                    x.on_transition_finished(name, requeued)
             case "config":
                 self._config_cached = json_msg["params"]
                 for x in self._callbacks.values():
                     x.on_config_update()
             case "keep_alive":
-                pass
+                self.stats.last_keep_alive = time.time()
             case "state_completed":
                 self.state_completed = True
                 for x in self._callbacks.values():
@@ -460,7 +758,7 @@ class RgbwwController:
                 _logger.warning(
                     "%s: EspLedController_ProcessRead: Unknown message type: %s",
                     self.host,
-                    json_msg["method"],
+                    method,
                 )
 
     async def refresh(self) -> None:
@@ -470,7 +768,7 @@ class RgbwwController:
         await self._refresh_color()
 
     async def _refresh_info(self) -> None:
-        self._info_cached = await self._send_http_get("info")
+        self._set_info(await self._send_http_get("info"))
 
     async def _refresh_config(self) -> None:
         self._config_cached = await self._send_http_get("config")
@@ -501,19 +799,52 @@ class RgbwwController:
     def clock_slave_status(self) -> dict[str, Any] | None:
         return self._clock_slave_status_cache
 
-    async def _send_http_post(self, endpoint: str, payload: dict[str, Any]) -> None:
+    def _set_info(self, info: dict[str, Any]) -> None:
+        self._info_cached = info
+        self.rate_limit.set_limit(rate_limit_for_info(info))
+
+    def _get_session(self) -> ClientSession:
+        if self._session is not None:
+            return self._session
+        assert self._hass is not None
+        return async_get_clientsession(self._hass)
+
+    async def _send_http_post(
+        self,
+        endpoint: str,
+        payload: dict[str, Any],
+        lane: Lane = Lane.HOUSEKEEPING,
+        cmds: Sequence[dict[str, Any]] | None = None,
+        at: float | None = None,
+    ) -> None:
+        """Post ``payload`` when it is its turn in ``lane``, see ``CommandScheduler``.
+
+        ``cmds`` are the color commands in the payload, if any. With ``at`` the
+        request holds its turn until then.
+        """
         if self._simulation:
             if endpoint == "config":
                 return None
             raise HomeAssistantError("Endpoint not supported by simulation")
 
-        session = async_get_clientsession(self._hass)
+        await self.scheduler.run(
+            lane, lambda: self._http_post(endpoint, payload, at), cmds
+        )
+
+    async def _http_post(
+        self, endpoint: str, payload: dict[str, Any], at: float | None = None
+    ) -> None:
+        await self.rate_limit.acquire()
+        if at is not None:
+            await asyncio.sleep(max(at - time.monotonic(), 0))
+        session = self._get_session()
+        started = time.monotonic()
         try:
             # Use a timeout to prevent the request from hanging indefinitely
             async with asyncio.timeout(self._http_request_timeout):
                 # The actual request using the shared session
                 response = await session.post(
-                    f"http://{self.host}/{endpoint}",
+                    f"{self._base_url}/{endpoint}",
                     json=payload,
                     headers=_HTTP_HEADERS,
                 )
@@ -521,37 +852,52 @@ class RgbwwController:
                 # Raise an exception if the response has an error status (4xx or 5xx)
                 response.raise_for_status()
 
-                return await response.json()
+                result = await response.json()
+                self.latency.add_http_rtt(started, endpoint)
+                self.stats.add_http_result(ok=True)
+                return result
 
         # Handle cases where the device is offline or the connection fails
         except (ClientError, asyncio.TimeoutError) as err:
+            self.stats.add_http_result(ok=False)
             raise ControllerUnavailableError(
                 f"Failed to connect to controller: {err}"
             ) from err
 
-    async def _send_http_get(self, endpoint: str) -> dict[str, Any]:
+    async def _send_http_get(
+        self, endpoint: str, lane: Lane = Lane.HOUSEKEEPING
+    ) -> dict[str, Any]:
         if self._simulation:
             if endpoint not in _SIM_RESPONSES:
                 raise HomeAssistantError("Endpoint not supported by simulation")
             return _SIM_RESPONSES[endpoint]
 
-        session = async_get_clientsession(self._hass)
+        return await self.scheduler.run(lane, lambda: self._http_get(endpoint))
+
+    async def _http_get(self, endpoint: str) -> dict[str, Any]:
+        await self.rate_limit.acquire()
+        session = self._get_session()
+        started = time.monotonic()
         try:
             # Use a timeout to prevent the request from hanging indefinitely
             async with asyncio.timeout(self._http_request_timeout):
                 # The actual request using the shared session
                 response = await session.get(
-                    f"http://{self.host}/{endpoint}", headers=_HTTP_HEADERS
+                    f"{self._base_url}/{endpoint}", headers=_HTTP_HEADERS
                 )
 
                 # Raise an exception if the response has an error status (4xx or 5xx)
                 response.raise_for_status()
 
                 # Return the JSON response
-                return await response.json()
+                result = await response.json()
+                self.latency.add_http_rtt(started, endpoint)
+                self.stats.add_http_result(ok=True)
+                return result
 
         # Handle cases where the device is offline or the connection fails
         except (ClientError, asyncio.TimeoutError) as err:
+            self.stats.add_http_result(ok=False)
             raise ControllerUnavailableError(
                 f"Failed to connect to controller: {err}"
             ) from err
@@ -0,0 +1,138 @@
+"""Rolling statistics over the most recent samples of a measurement."""
+
+import math
+
+
+class RollingWindow:
+    """Fixed-size ring buffer keeping the last ``size`` samples.
+
+    Adding a sample is O(1) and never allocates. Percentiles sort a copy of
+    the window, so they are meant for (throttled) state updates, not for the
+    per-message path.
+    """
+
+    __slots__ = ("_count", "_pos", "_values", "total")
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._values = [0.0] * size
+        self._pos = 0
+        self._count = 0
+        self.total = 0  # samples ever added
+
+    def add(self, value: float) -> None:
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+        self.total += 1
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def values(self) -> list[float]:
+        """Return the samples in the window, oldest first."""
+        if self._count < len(self._values):
+            return self._values[: self._count]
+        return self._values[self._pos :] + self._values[: self._pos]
+
+    def mean(self) -> float | None:
+        if not self._count:
+            return None
+        return math.fsum(self.values()) / self._count
+
+    def stdev(self) -> float | None:
+        """Population standard deviation (jitter) of the window."""
+        if not self._count:
+            return None
+        values = self.values()
+        mean = math.fsum(values) / self._count
+        return math.sqrt(math.fsum((v - mean) ** 2 for v in values) / self._count)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the nearest-rank percentile, ``q`` in [0, 100]."""
+        if not self._count:
+            return None
+        return _nearest_rank(sorted(self.values()), q)
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return sample count, p50, p95 and p99 of the window."""
+        if not self._count:
+            return {"samples": 0, "p50": None, "p95": None, "p99": None}
+        ordered = sorted(self.values())
+        return {
+            "samples": len(ordered),
+            "p50": _nearest_rank(ordered, 50),
+            "p95": _nearest_rank(ordered, 95),
+            "p99": _nearest_rank(ordered, 99),
+        }
+
+
+def _nearest_rank(ordered: list[float], q: float) -> float:
+    return ordered[max(math.ceil(q / 100 * len(ordered)), 1) - 1]
+
+
+class DeadbandThrottle:
+    """Decide whether a new value is worth a state write.
+
+    A write is due when the value moved more than ``deadband`` away from the
+    last written value, or ``max_interval`` seconds passed since that write.
+    """
+
+    __slots__ = ("_last_time", "_last_value", "deadband", "max_interval", "suppressed")
+
+    def __init__(self, deadband: float, max_interval: float) -> None:
+        self.deadband = deadband
+        self.max_interval = max_interval
+        self._last_value: float | None = None
+        self._last_time = 0.0
+        self.suppressed = 0
+
+    def should_write(self, value: float, now: float) -> bool:
+        if (
+            self._last_value is None
+            or abs(value - self._last_value) > self.deadband
+            or now - self._last_time >= self.max_interval
+        ):
+            self._last_value = value
+            self._last_time = now
+            return True
+        self.suppressed += 1
+        return False
+
+    def reset(self) -> None:
+        self._last_value = None
+
+
+class ClockSyncStatistics:
+    """Rolling offset and ``current_interval`` of ``clock_slave_status``."""
+
+    def __init__(self, window: int = 60) -> None:
+        self.offset = RollingWindow(window)
+        self.interval = RollingWindow(window)
+
+    def add(self, offset: float, current_interval: float) -> None:
+        self.offset.add(offset)
+        self.interval.add(current_interval)
+
+    def summary(self) -> dict[str, float | None]:
+        """Offset p95 is taken of the absolute offset."""
+        abs_offsets = sorted(abs(v) for v in self.offset.values())
+        return {
+            "offset_mean": _round(self.offset.mean()),
+            "offset_jitter": _round(self.offset.stdev()),
+            "offset_p95": _nearest_rank(abs_offsets, 95) if abs_offsets else None,
+            "interval_mean": _round(self.interval.mean()),
+            "interval_jitter": _round(self.interval.stdev()),
+            "interval_p95": self.interval.percentile(95),
+            "samples": len(self.offset),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
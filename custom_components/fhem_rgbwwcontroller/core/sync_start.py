@@ -0,0 +1,133 @@
+"""Start the same animation on several controllers at the same instant.
+
+The firmware has no scheduled start, so the start is staged: every target
+pauses its channels and receives the animation, which stays paused at its
+first step. Then ``continue`` is sent to each target early by its estimated
+one-way latency (half the median round trip of its channel commands, which
+includes the ``pause`` just sent), so all requests land at one shared instant.
+Each ``continue`` takes its request slot and rate limit token before the
+deadline, so neither a queued request nor the limit can delay it. From there
+the controllers' clock sync keeps the running animations frame-aligned. A
+target whose upload fails is continued right away instead of staying paused.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Literal
+
+from .command_scheduler import CommandSuperseded
+from .rgbww_controller import ControllerUnavailableError, RgbwwController, SendResult
+
+_logger = logging.getLogger(__name__)
+
+CHANNELS = {
+    "hsv": ["hue", "saturation", "value", "color_temp"],
+    "rgbww": ["red", "green", "blue", "cw", "ww"],
+}
+
+START_MARGIN = 0.02  # s added to the slowest target's latency
+
+
+@dataclass(slots=True)
+class SyncStartResult:
+    host: str
+    started: bool
+    latency_ms: float | None = None  # estimated one-way latency
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "host": self.host,
+            "started": self.started,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+        }
+
+
+def _one_way_latency(controller: RgbwwController) -> float:
+    """Half the median round trip of the recent channel commands, in s."""
+    endpoints = controller.latency.http_endpoints
+    for endpoint in ("continue", "pause"):
+        if (window := endpoints.get(endpoint)) is not None and (
+            rtt := window.percentile(50)
+        ) is not None:
+            return rtt / 2000
+    rtt = controller.latency.http_rtt.percentile(50)
+    return rtt / 2000 if rtt is not None else 0.0
+
+
+async def _stage(
+    controller: RgbwwController, encoded: Sequence[dict[str, Any]], channels: list[str]
+) -> None:
+    await controller.send_channel_command("pause", channels)
+    try:
+        sent, _ = await controller.send_encoded_color_commands(encoded)
+        if sent is SendResult.QUEUED:
+            # replayed once reconnected, but not in sync
+            raise ControllerUnavailableError("not connected, the animation was queued")
+    except Exception:
+        # don't leave the target paused
+        await _resume([controller], channels)
+        raise
+
+
+async def _resume(controllers: Sequence[RgbwwController], channels: list[str]) -> None:
+    outcomes = await asyncio.gather(
+        *(c.send_channel_command("continue", channels) for c in controllers),
+        return_exceptions=True,
+    )
+    for controller, outcome in zip(controllers, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            _logger.warning("Could not resume %s: %s", controller.host, outcome)
+
+
+async def synchronized_start(
+    controllers: Sequence[RgbwwController],
+    encoded: Sequence[dict[str, Any]],
+    channels_type: Literal["hsv", "rgbww"],
+) -> list[SyncStartResult]:
+    """Stage ``encoded`` on all controllers and start it on all at once."""
+    channels = CHANNELS[channels_type]
+    results = {c.host: SyncStartResult(c.host, False) for c in controllers}
+
+    staged: list[RgbwwController] = []
+    outcomes = await asyncio.gather(
+        *(_stage(c, encoded, channels) for c in controllers), return_exceptions=True
+    )
+    failure: BaseException | None = None
+    for controller, outcome in zip(controllers, outcomes, strict=True):
+        if isinstance(outcome, ControllerUnavailableError | CommandSuperseded):
+            results[controller.host].error = str(outcome)
+        elif isinstance(outcome, BaseException):
+            failure = failure or outcome
+        else:
+            staged.append(controller)
+    if failure is not None:
+        await _resume(staged, channels)
+        raise failure
+
+    latencies = {c.host: _one_way_latency(c) for c in staged}
+    start = time.monotonic() + max(latencies.values(), default=0) + START_MARGIN
+    outcomes = await asyncio.gather(
+        *(
+            c.send_channel_command("continue", channels, at=start - latencies[c.host])
+            for c in staged
+        ),
+        return_exceptions=True,
+    )
+    for controller, outcome in zip(staged, outcomes, strict=True):
+        result = results[controller.host]
+        result.latency_ms = round(latencies[controller.host] * 1000, 1)
+        if isinstance(outcome, ControllerUnavailableError):
+            # stays paused on its first step until continued manually
+            result.error = str(outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            result.started = True
+
+    _logger.debug("Synchronized start: %s", results)
+    return list(results.values())
@@ -0,0 +1,152 @@
+"""Opt-in timing spans for the stages of a color command.
+
+Stages are ``parse`` (CLI string or service data to commands), ``serialize``
+(commands to the API payload), ``send`` (HTTP request) and ``echo`` (command
+sent until the controller reports the change on its stream). Spans of one
+service call share a trace id.
+
+Without a sink ``TRACER.span`` returns a shared no-op context manager, so the
+instrumented code only pays for a method call and an empty ``with``.
+"""
+
+from collections import deque
+from collections.abc import Iterator
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import itertools
+import logging
+import time
+from typing import Any, Protocol
+
+from .statistics import RollingWindow
+
+_logger = logging.getLogger(__name__)
+
+_trace_id: ContextVar[int | None] = ContextVar("fhem_rgbwwcontroller_trace_id")
+_trace_ids = itertools.count(1)
+_NOOP = contextlib.nullcontext()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: int | None
+    start: float  # time.monotonic()
+    duration_ms: float
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class TraceSink(Protocol):
+    def emit(self, span: Span) -> None: ...
+
+
+class LogSink:
+    """Log every span at debug level."""
+
+    def emit(self, span: Span) -> None:
+        _logger.debug(
+            "trace %s %s: %.3f ms %s",
+            span.trace_id,
+            span.name,
+            span.duration_ms,
+            span.attrs,
+        )
+
+
+class MemorySink:
+    """Keep the most recent spans and summarize them per stage."""
+
+    def __init__(self, size: int = 1000) -> None:
+        self.spans: deque[Span] = deque(maxlen=size)
+
+    def emit(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def summary(self) -> dict[str, Any]:
+        windows: dict[str, RollingWindow] = {}
+        for span in self.spans:
+            if (window := windows.get(span.name)) is None:
+                window = windows[span.name] = RollingWindow(len(self.spans))
+            window.add(span.duration_ms)
+        return {
+            name: window.summary() | {"mean": window.mean()}
+            for name, window in windows.items()
+        }
+
+
+class Tracer:
+    """Dispatches spans to the configured sinks."""
+
+    def __init__(self) -> None:
+        self.sinks: list[TraceSink] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink: TraceSink) -> None:
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def clear_sinks(self) -> None:
+        self.sinks.clear()
+
+    def trace(self) -> contextlib.AbstractContextManager[Any]:
+        """Group the spans inside the ``with`` block under a new trace id."""
+        if not self.sinks:
+            return _NOOP
+        return self._trace()
+
+    @contextlib.contextmanager
+    def _trace(self) -> Iterator[None]:
+        token = _trace_id.set(next(_trace_ids))
+        try:
+            yield
+        finally:
+            _trace_id.reset(token)
+
+    def current_trace_id(self) -> int | None:
+        return _trace_id.get(None)
+
+    def span(self, name: str, **attrs: Any) -> contextlib.AbstractContextManager[Any]:
+        """Time the ``with`` block."""
+        if not self.sinks:
+            return _NOOP
+        return self._span(name, attrs)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, attrs: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        start = time.monotonic()
+        try:
+            yield attrs  # the block may add attributes
+        except BaseException as err:
+            attrs["error"] = type(err).__name__
+            raise
+        finally:
+            self.record(name, start, time.monotonic(), **attrs)
+
+    def record(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        trace_id: int | None = None,
+        **attrs: Any,
+    ) -> None:
+        """Emit a span measured by the caller."""
+        span = Span(
+            name,
+            trace_id if trace_id is not None else _trace_id.get(None),
+            start,
+            (end - start) * 1000,
+            attrs,
+        )
+        for sink in self.sinks:
+            sink.emit(span)
+
+
+TRACER = Tracer()
@@ -0,0 +1,97 @@
+"""Index of the ``transition_finished`` device triggers.
+
+Triggers are indexed by device and by step name, so a finished step only
+reaches the triggers of its own device that can match it. Triggers with a
+name pattern are matched once per step name; looping animations repeat the
+same names and hit the cached result.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+import logging
+
+_logger = logging.getLogger(__name__)
+
+TransitionAction = Callable[[str, bool], None]  # (name, requeued)
+
+_MATCH_CACHE_SIZE = 64  # step names per device
+
+
+@dataclass(slots=True)
+class _Trigger:
+    action: TransitionAction
+    pattern: str | None = None
+
+
+@dataclass(slots=True)
+class _DeviceTriggers:
+    any_name: list[_Trigger] = field(default_factory=list)
+    by_name: dict[str, list[_Trigger]] = field(default_factory=dict)
+    patterns: list[_Trigger] = field(default_factory=list)
+    matches: dict[str, tuple[_Trigger, ...]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.any_name or self.by_name or self.patterns)
+
+    def match(self, name: str) -> tuple[_Trigger, ...]:
+        if (matched := self.matches.get(name)) is not None:
+            return matched
+        matched = (
+            *self.any_name,
+            *self.by_name.get(name, ()),
+            *(t for t in self.patterns if fnmatchcase(name, t.pattern or "")),
+        )
+        if len(self.matches) >= _MATCH_CACHE_SIZE:
+            self.matches.clear()
+        self.matches[name] = matched
+        return matched
+
+
+class TransitionTriggers:
+    """Triggers by device id, dispatched without going through the event bus."""
+
+    def __init__(self) -> None:
+        self._devices: dict[str, _DeviceTriggers] = {}
+
+    def attach(
+        self,
+        device_id: str,
+        action: TransitionAction,
+        name: str | None = None,
+        pattern: str | None = None,
+    ) -> Callable[[], None]:
+        """Call ``action`` for the finished steps of the device.
+
+        Filters by the exact step ``name`` or a glob ``pattern``, or passes
+        every step if both are None. Returns the function to detach it.
+        """
+        device = self._devices.setdefault(device_id, _DeviceTriggers())
+        trigger = _Trigger(action, pattern)
+        if name is not None:
+            triggers = device.by_name.setdefault(name, [])
+        elif pattern is not None:
+            triggers = device.patterns
+        else:
+            triggers = device.any_name
+        triggers.append(trigger)
+        device.matches.clear()
+
+        def detach() -> None:
+            triggers.remove(trigger)
+            if name is not None and not triggers:
+                del device.by_name[name]
+            device.matches.clear()
+            if not device and self._devices.get(device_id) is device:
+                del self._devices[device_id]
+
+        return detach
+
+    def dispatch(self, device_id: str, name: str, requeued: bool) -> None:
+        if (device := self._devices.get(device_id)) is None:
+            return
+        for trigger in device.match(name):
+            try:
+                trigger.action(name, requeued)
+            except Exception:
+                _logger.exception("Error in transition_finished trigger")
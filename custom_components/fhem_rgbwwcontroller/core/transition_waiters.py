@@ -0,0 +1,160 @@
+"""Wait for named animation steps to finish on the controller.
+
+The controller reports ``transition_finished`` with the name and requeue flag
+of a named command once all its channels completed. Waiters are futures keyed
+by that pair. A step that is dropped (``single`` queue policy, the default,
+or ``stop``) never reports finished, so the waiters are resolved as
+interrupted when this integration replaces the queue or loses the event
+stream. Replacements by other clients are only caught by the timeout.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .command_journal import command_channels
+
+_logger = logging.getLogger(__name__)
+
+_REPLACING_POLICIES = (None, "single")  # the controller defaults to single
+
+
+@dataclass(slots=True)
+class _Waiter:
+    future: asyncio.Future[bool]  # True once finished, False if interrupted
+    remaining: int  # finished events still expected
+
+
+@dataclass(slots=True)
+class TransitionResult:
+    finished: bool
+    interrupted: bool
+    duration: float  # s from sending until the step finished or gave up
+
+    @property
+    def timed_out(self) -> bool:
+        return not self.finished and not self.interrupted
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "finished": self.finished,
+            "interrupted": self.interrupted,
+            "timeout": self.timed_out,
+            "duration": round(self.duration, 3),
+        }
+
+
+def wait_target(
+    encoded: Sequence[dict[str, Any]], name: str | None, default_name: str
+) -> tuple[Sequence[dict[str, Any]], tuple[str, bool]]:
+    """Return the commands to send and the (name, requeued) step to wait for.
+
+    Without ``name`` the last step is awaited; it is named ``default_name``
+    if it has no name yet.
+    """
+    if not encoded:
+        raise ValueError("animation has no steps")
+    if name is not None:
+        for cmd in reversed(encoded):
+            if cmd.get("name") == name:
+                return encoded, (name, bool(cmd.get("r")))
+        raise ValueError(f"animation has no step named {name}")
+
+    last = encoded[-1]
+    if (last_name := last.get("name")) is None:
+        last_name = default_name
+        encoded = (*encoded[:-1], {**last, "name": last_name})
+    return encoded, (last_name, bool(last.get("r")))
+
+
+def expected_finishes(
+    encoded: Sequence[dict[str, Any]], name: str, requeued: bool
+) -> int:
+    """Return how many steps of ``encoded`` will report ``name`` finished.
+
+    A step that replaces the queue drops the earlier steps of the same
+    request sharing a channel with it; those never finish.
+    """
+    kept: list[tuple[dict[str, Any], frozenset[str]]] = []
+    for cmd in encoded:
+        channels = command_channels((cmd,))
+        if cmd.get("q") in _REPLACING_POLICIES:
+            kept = [(c, ch) for c, ch in kept if not ch & channels]
+        kept.append((cmd, channels))
+    return sum(
+        1
+        for cmd, _ in kept
+        if cmd.get("name") == name and bool(cmd.get("r")) == requeued
+    )
+
+
+def replaces_queue(encoded: Sequence[dict[str, Any]]) -> bool:
+    """Return whether sending ``encoded`` drops the steps already queued."""
+    return any(cmd.get("q") in _REPLACING_POLICIES for cmd in encoded)
+
+
+class TransitionWaiters:
+    """Futures resolved by the ``transition_finished`` events."""
+
+    def __init__(self) -> None:
+        self._waiters: dict[tuple[str, bool], list[_Waiter]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def expect(self, name: str, requeued: bool, count: int = 1) -> asyncio.Future[bool]:
+        """Return a future resolved after ``count`` finished events of the step.
+
+        With ``count`` 0 the step never runs and the future is interrupted.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if count <= 0:
+            future.set_result(False)
+            return future
+        self._waiters.setdefault((name, requeued), []).append(
+            _Waiter(future, count)
+        )
+        return future
+
+    def discard(self, future: asyncio.Future[bool]) -> None:
+        for key, waiters in list(self._waiters.items()):
+            waiters[:] = [w for w in waiters if w.future is not future]
+            if not waiters:
+                del self._waiters[key]
+
+    def finished(self, name: str, requeued: bool) -> None:
+        if (waiters := self._waiters.get((name, requeued))) is None:
+            return
+        for waiter in waiters:
+            waiter.remaining -= 1
+            if waiter.remaining <= 0 and not waiter.future.done():
+                waiter.future.set_result(True)
+        waiters[:] = [w for w in waiters if not w.future.done()]
+        if not waiters:
+            del self._waiters[(name, requeued)]
+
+    def interrupt(self, reason: str) -> None:
+        if not self._waiters:
+            return
+        _logger.debug("Interrupting %s transition waiters: %s", len(self), reason)
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                if not waiter.future.done():
+                    waiter.future.set_result(False)
+        self._waiters.clear()
+
+    async def wait(
+        self, future: asyncio.Future[bool], started: float, timeout: float
+    ) -> TransitionResult:
+        """Wait for ``future`` until ``timeout`` s after ``started``."""
+        try:
+            async with asyncio.timeout(started + timeout - time.monotonic()):
+                finished = await future
+        except asyncio.TimeoutError:
+            return TransitionResult(False, False, time.monotonic() - started)
+        finally:
+            self.discard(future)
+        return TransitionResult(finished, not finished, time.monotonic() - started)
@@ -1,68 +1,112 @@
+"""Device triggers for the controllers, dispatched without the event bus."""
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
 from homeassistant.const import (
-    CONF_TYPE,
     CONF_DEVICE_ID,
     CONF_DOMAIN,
+    CONF_NAME,
+    CONF_PLATFORM,
+    CONF_TYPE,
 )
-import voluptuous as vol
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.components.homeassistant.triggers import event as event_trigger
-from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
-from .const import DOMAIN
 
-from homeassistant.const import (
-    CONF_PLATFORM,
-)
+from .const import CONF_MEMBERS, DOMAIN, TRANSITION_TRIGGERS
+from .core.transition_triggers import TransitionTriggers
 
+TRIGGER_TYPES = {"transition_finished"}
 
+CONF_NAME_PATTERN = "name_pattern"  # glob, e.g. "sunrise_*"
 
-TRIGGER_TYPES = {"transition_finished"}
+_STEP_FILTER_SCHEMA = {
+    vol.Exclusive(CONF_NAME, "step"): cv.string,
+    vol.Exclusive(CONF_NAME_PATTERN, "step"): cv.string,
+}
 
 TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
     {
-        #    vol.Required("type"): "transition_finished",
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        **_STEP_FILTER_SCHEMA,
     }
 )
 
 
+@callback
+def async_get_transition_triggers(hass: HomeAssistant) -> TransitionTriggers:
+    data = hass.data.setdefault(DOMAIN, {})
+    if (triggers := data.get(TRANSITION_TRIGGERS)) is None:
+        triggers = data[TRANSITION_TRIGGERS] = TransitionTriggers()
+    return triggers
 
-async def async_get_triggers(hass, device_id):
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
     """Return a list of supported triggers."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return []
+    for entry_id in device.config_entries:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is not None and CONF_MEMBERS in entry.data:
+            return []  # groups report no transitions of their own
 
-    triggers = []
-    triggers.append(
-        TRIGGER_SCHEMA(
-            {
-                # Required fields of TRIGGER_BASE_SCHEMA
-                CONF_PLATFORM: "device",
-                CONF_DOMAIN: DOMAIN,
-                CONF_DEVICE_ID: device_id,
-                # Required fields of TRIGGER_SCHEMA
-                CONF_TYPE: "transition_finished",
-            }
-        )
-    )
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
 
-    return triggers
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """Let the UI filter by step name or pattern."""
+    return {"extra_fields": vol.Schema(_STEP_FILTER_SCHEMA)}
 
 
 async def async_attach_trigger(
     hass: HomeAssistant,
     config: ConfigType,
-    action: CALLBACK_TYPE,
-    trigger_info: dict,
-):
-    """Called when a user creates a trigger in the UI."""
-    event_config = event_trigger.TRIGGER_SCHEMA(
-        {
-            event_trigger.CONF_PLATFORM: "event",
-            event_trigger.CONF_EVENT_TYPE: "transition_finished",
-            event_trigger.CONF_EVENT_DATA: {
-                CONF_DEVICE_ID: config[CONF_DEVICE_ID],
-                CONF_TYPE: config[CONF_TYPE],
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger to the index of its device."""
+    trigger_data = trigger_info["trigger_data"]
+    device_id = config[CONF_DEVICE_ID]
+    job = HassJob(action, f"{DOMAIN} {config[CONF_TYPE]} trigger")
+
+    @callback
+    def on_transition_finished(name: str, requeued: bool) -> None:
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: device_id,
+                    CONF_TYPE: config[CONF_TYPE],
+                    "name": name,
+                    "requeued": requeued,
+                    "description": f"transition {name} finished",
+                }
             },
-        }
-    )
-    return await event_trigger.async_attach_trigger(
-        hass, event_config, action, trigger_info
+        )
+
+    return async_get_transition_triggers(hass).attach(
+        device_id,
+        on_transition_finished,
+        name=config.get(CONF_NAME),
+        pattern=config.get(CONF_NAME_PATTERN),
     )
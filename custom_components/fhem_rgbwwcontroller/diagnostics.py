@@ -0,0 +1,87 @@
+"""Diagnostics support for the FHEM RGBWW Controller integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import UTC, datetime
+from typing import Any, cast
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .core.controller_group import ControllerGroup
+from .core.rgbww_controller import RgbwwController
+
+TO_REDACT = {"password", "ssid", "username", "mac"}
+
+
+def _cached(getter: Callable[[], dict[str, Any]]) -> dict[str, Any] | None:
+    try:
+        return getter()
+    except RuntimeError:
+        return None  # not received from the controller yet
+
+
+def _isotime(epoch: float | None) -> str | None:
+    return None if epoch is None else datetime.fromtimestamp(epoch, UTC).isoformat()
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    if isinstance(group := entry.runtime_data, ControllerGroup):
+        return {
+            "entry": dict(entry.data),
+            "members": [
+                {"host": member.host, "connected": member.connected}
+                for member in group.members
+            ],
+        }
+
+    controller = cast(RgbwwController, entry.runtime_data)
+    stats = controller.stats
+
+    data = {
+        "entry": dict(entry.data),
+        "connected": controller.connected,
+        "state_completed": controller.state_completed,
+        "info": _cached(lambda: controller.info),
+        "config": _cached(lambda: controller.config),
+        "color": asdict(controller.color),
+        "clock_slave_status": controller.clock_slave_status,
+        "timing": controller.latency.summary(),
+        "counters": {
+            "connects": stats.connects,
+            "reconnects": stats.reconnects,
+            "messages": dict(stats.messages),
+            "bytes_received": stats.bytes_received,
+            "decode_errors": stats.decode_errors,
+            "http_requests": stats.http_requests,
+            "http_errors": stats.http_errors,
+            "http_error_rate": stats.http_error_rate,
+            "messages_logged": controller.message_log.total,
+            "suppressed_writes": stats.suppressed_writes,
+        },
+        "dispatch_queue": {
+            "size": len(controller.queue),
+            "high_water": controller.queue.high_water,
+            "dropped": dict(controller.queue.dropped),
+        },
+        "offline_journal": controller.journal.summary(),
+        "command_scheduler": controller.scheduler.summary(),
+        "rate_limit": controller.rate_limit.summary(),
+        "session_started": _isotime(stats.session_started),
+        "last_keep_alive": _isotime(stats.last_keep_alive),
+        "connection_history": [
+            {"time": _isotime(t), "event": event, "reason": reason}
+            for t, event, reason in stats.history
+        ],
+        "recent_messages": [
+            {"time": _isotime(t), "message": message}
+            for t, message in controller.message_log.entries()
+        ],
+    }
+    return async_redact_data(data, TO_REDACT)
@@ -0,0 +1,322 @@
+"""Light entity controlling a group of controllers with one action."""
+
+from collections.abc import Awaitable, Callable, Sequence
+import logging
+import math
+from statistics import fmean
+from typing import Any
+
+from homeassistant.components.light import (
+    ATTR_EFFECT,
+    ATTR_FLASH,
+    DEFAULT_MAX_KELVIN,
+    DEFAULT_MIN_KELVIN,
+    EFFECT_OFF,
+    ColorMode,
+    LightEntity,
+    LightEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import ServiceCall, ServiceResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import ATTR_WAIT_TIMEOUT, DOMAIN
+from .core.color_math import percent_to_brightness
+from .core.command_scheduler import Lane
+from .core.controller_group import ControllerGroup, GroupSendError, encode_commands
+from .core.effects import Effect, effect_commands
+from .core.light_commands import (
+    LightCommand,
+    build_turn_off,
+    build_turn_on,
+    restore_command,
+)
+from .core.rgbww_controller import RgbwwController, _ColorState
+from .core.transition_waiters import TransitionResult
+
+_logger = logging.getLogger(__name__)
+
+
+def _is_on(color: _ColorState) -> bool:
+    if color.color_mode == "raw":
+        return (
+            color.raw_r > 0
+            or color.raw_g > 0
+            or color.raw_b > 0
+            or color.raw_ww > 0
+            or color.raw_cw > 0
+        )
+    return color.brightness > 0
+
+
+def _mean_hue(colors: Sequence[_ColorState]) -> float:
+    """Circular mean of the hues, weighted by saturation (350 and 10 give 0)."""
+    weights = [color.saturation for color in colors]
+    if not any(weights):
+        weights = [1.0] * len(colors)
+    pairs = list(zip(weights, colors, strict=True))
+    x = sum(w * math.cos(math.radians(c.hue)) for w, c in pairs)
+    y = sum(w * math.sin(math.radians(c.hue)) for w, c in pairs)
+    if math.isclose(x, 0, abs_tol=1e-9) and math.isclose(y, 0, abs_tol=1e-9):
+        return colors[0].hue  # opposite hues cancel out
+    return math.degrees(math.atan2(y, x)) % 360
+
+
+class RgbwwGroupLight(LightEntity):
+    """Sends every command to all member controllers concurrently.
+
+    The state is aggregated from the members' push updates: on if any member
+    is on, brightness and hs color are the mean over the members that are on
+    in HSV mode (the hue as circular mean).
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = None
+    _attr_should_poll = False
+
+    _attr_max_color_temp_kelvin = DEFAULT_MAX_KELVIN
+    _attr_min_color_temp_kelvin = DEFAULT_MIN_KELVIN
+
+    def __init__(
+        self,
+        group: ControllerGroup,
+        config_entry: ConfigEntry,
+        effects: dict[str, Effect] | None = None,
+    ) -> None:
+        """Initialize the group light."""
+        self._group = group
+        self._attr_unique_id = f"{config_entry.entry_id}_group"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config_entry.title,
+            manufacturer="FHEM Community :)",
+            model="Controller group",
+        )
+        self._attr_supported_color_modes = {ColorMode.HS, ColorMode.COLOR_TEMP}
+        self._attr_color_mode = ColorMode.HS
+        self._attr_supported_features = (
+            LightEntityFeature.TRANSITION
+            | LightEntityFeature.FLASH
+            | LightEntityFeature.EFFECT
+        )
+        self._effects = effects or {}
+        self._attr_effect_list = list(self._effects)
+        self._attr_effect = None
+        self._attr_extra_state_attributes = {
+            "members": [member.host for member in group.members],
+            "failed_members": {},
+        }
+        self._update_scheduled = False
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the events of all members."""
+        await super().async_added_to_hass()
+        for member in self._group.members:
+            member.register_callback(self)
+        self._aggregate()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from the members."""
+        for member in self._group.members:
+            member.unregister_callback(self)
+        await super().async_will_remove_from_hass()
+
+    # protocol rgbww state, called by every member
+    def on_update_color(self) -> None:  # noqa: D102
+        self._schedule_update()
+
+    def on_connection_update(self) -> None:  # noqa: D102
+        self._schedule_update()
+
+    def on_state_completed(self) -> None:  # noqa: D102
+        self._schedule_update()
+
+    def on_transition_finished(self, name: str, requeued: bool) -> None: ...  # noqa: D102
+    def on_config_update(self) -> None: ...  # noqa: D102
+    def on_clock_slave_status_update(self) -> None: ...  # noqa: D102
+
+    def _schedule_update(self) -> None:
+        # members report the same command within one loop iteration, write once
+        if self._update_scheduled or self.hass is None:
+            return
+        self._update_scheduled = True
+        self.hass.loop.call_soon(self._scheduled_update)
+
+    @callback
+    def _scheduled_update(self) -> None:
+        self._update_scheduled = False
+        self._aggregate()
+        self.async_write_ha_state()
+
+    def _aggregate(self) -> None:
+        members = self._group.members
+        self._attr_available = any(member.connected for member in members)
+        on = [
+            member.color
+            for member in members
+            if member.state_completed and _is_on(member.color)
+        ]
+        self._attr_is_on = bool(on)
+        if hsv := [color for color in on if color.color_mode == "hsv"]:
+            self._attr_hs_color = (
+                _mean_hue(hsv),
+                fmean(color.saturation for color in hsv),
+            )
+            self._attr_brightness = percent_to_brightness(
+                fmean(color.brightness for color in hsv)
+            )
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn all members on."""
+        if (name := kwargs.get(ATTR_EFFECT)) is not None and name != EFFECT_OFF:
+            if (effect := self._effects.get(name)) is None:
+                raise HomeAssistantError(f"Unknown effect: {name}")
+            await self._send(
+                lambda member: effect_commands(effect, _current_color(member))
+            )
+            if not effect.flash:
+                self._attr_effect = name
+            self.async_write_ha_state()
+            return
+
+        await self._send_light_commands(
+            build_turn_on(kwargs, None, is_on=bool(self._attr_is_on)),
+            flash=ATTR_FLASH in kwargs,
+        )
+        if ATTR_FLASH not in kwargs:
+            self._attr_effect = None
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn all members off."""
+        await self._send_light_commands(
+            build_turn_off(kwargs, None), flash=ATTR_FLASH in kwargs
+        )
+        if ATTR_FLASH not in kwargs:
+            self._attr_effect = None
+        self.async_write_ha_state()
+
+    async def service_animation(
+        self,
+        call: ServiceCall,
+        encoded: Sequence[dict[str, Any]],
+        wait_for: tuple[str, bool] | None = None,
+    ) -> ServiceResponse:
+        """Send an animation that the service layer encoded to all members.
+
+        With ``wait_for`` returns once that step finished, was interrupted or
+        timed out on every member.
+        """
+        response: dict[str, Any] = {"success": True, "steps": len(encoded)}
+        try:
+            if wait_for is None:
+                queued = await self._send(lambda _: encoded)
+                response["queued"] = bool(queued)
+            else:
+                results, queued = await self._send_and_wait(
+                    encoded, wait_for, call.data[ATTR_WAIT_TIMEOUT]
+                )
+                response |= {
+                    "queued": bool(queued),
+                    "finished": all(r.finished for r in results.values()),
+                    "interrupted": any(r.interrupted for r in results.values()),
+                    "timeout": any(r.timed_out for r in results.values()),
+                    "duration": round(
+                        max(r.duration for r in results.values()), 3
+                    ),
+                    "members": {
+                        host: r.as_dict() for host, r in results.items()
+                    },
+                }
+        except HomeAssistantError as e:
+            if call.return_response:
+                return {"success": False, "error": str(e)}
+            raise
+        self.async_write_ha_state()
+        response["failed_members"] = self._attr_extra_state_attributes[
+            "failed_members"
+        ]
+        return response
+
+    async def service_channel(self, call: ServiceCall) -> None:
+        """Pause, continue or stop channels on all members."""
+        await self._fan_out(
+            lambda: self._group.send_channel_command(
+                call.data["command"], call.data["channels"]
+            )
+        )
+
+    def render_start_color(self) -> _ColorState:
+        """Color a rendered animation starts from, the first member's with state."""
+        members = self._group.members
+        member = next((m for m in members if m.state_completed), members[0])
+        return member.color
+
+    async def _send_light_commands(
+        self, commands: Sequence[LightCommand], flash: bool
+    ) -> None:
+        encoded = encode_commands(commands)
+        if not flash:
+            await self._send(lambda _: encoded, Lane.INTERACTIVE)
+            return
+
+        def with_restore(member: RgbwwController) -> Sequence[dict[str, Any]]:
+            # every member flashes back to its own color
+            if (current := _current_color(member)) is None:
+                return encoded
+            return (*encoded, *encode_commands([restore_command(current)]))
+
+        await self._send(with_restore, Lane.INTERACTIVE)
+
+    async def _send(
+        self,
+        encoded_for: Callable[[RgbwwController], Sequence[dict[str, Any]]],
+        lane: Lane = Lane.ANIMATION,
+    ) -> list[str]:
+        """Send to all members, return the ones that queued the commands."""
+        try:
+            failures, queued = await self._group.send_encoded(encoded_for, lane)
+        except GroupSendError as e:
+            self._set_failed_members(e.failures)
+            self.async_write_ha_state()
+            raise HomeAssistantError(str(e)) from e
+        self._set_failed_members(failures)
+        return queued
+
+    async def _fan_out(
+        self, send: Callable[[], Awaitable[dict[str, Exception]]]
+    ) -> None:
+        try:
+            failures = await send()
+        except GroupSendError as e:
+            self._set_failed_members(e.failures)
+            self.async_write_ha_state()
+            raise HomeAssistantError(str(e)) from e
+        self._set_failed_members(failures)
+
+    async def _send_and_wait(
+        self,
+        encoded: Sequence[dict[str, Any]],
+        wait_for: tuple[str, bool],
+        timeout: float,
+    ) -> tuple[dict[str, TransitionResult], list[str]]:
+        try:
+            results, failures, queued = await self._group.send_encoded_and_wait(
+                encoded, wait_for, timeout
+            )
+        except GroupSendError as e:
+            self._set_failed_members(e.failures)
+            self.async_write_ha_state()
+            raise HomeAssistantError(str(e)) from e
+        self._set_failed_members(failures)
+        return results, queued
+
+    def _set_failed_members(self, failures: dict[str, Exception]) -> None:
+        self._attr_extra_state_attributes["failed_members"] = {
+            host: str(err) for host, err in failures.items()
+        }
+
+
+def _current_color(member: RgbwwController) -> _ColorState | None:
+    return member.color if member.state_completed else None
@@ -1,8 +1,12 @@
 """Light platform for the fhem led controller integration."""
 
-import functools
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
 import logging
+import time
 from typing import Any, cast
+import uuid
 
 import voluptuous as vol
 
@@ -10,18 +14,25 @@ from .rgbww_entity import RgbwwEntity
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_COLOR_TEMP_KELVIN,
+    ATTR_EFFECT,
+    ATTR_FLASH,
     ATTR_HS_COLOR,
     ATTR_RGBWW_COLOR,
-    ATTR_TRANSITION,
     DEFAULT_MAX_KELVIN,
     DEFAULT_MIN_KELVIN,
+    EFFECT_OFF,
     ColorMode,
     LightEntity,
     LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_platform
 
@@ -29,10 +40,6 @@ from homeassistant.helpers import entity_platform
 import homeassistant.helpers.config_validation as cv
 import homeassistant.helpers.device_registry as dr
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.util.scaling import (
-    scale_ranged_value_to_int_range,
-    scale_to_ranged_value,
-)
 
 from .const import (
     ATTR_ANIM_DEFINITION_LIST,
@@ -49,15 +56,38 @@ from .const import (
     ATTR_STAY,
     ATTR_TRANSITION_MODE,
     ATTR_TRANSITION_VALUE,
+    ATTR_WAIT,
+    ATTR_WAIT_FOR,
+    ATTR_WAIT_TIMEOUT,
     DOMAIN,
+    LEGACY_EVENT_TRANSITION_FINISHED,
+    TRANSITION_TRIGGERS,
 )
+from .core.animation_engine import HSV_CHANNELS, RAW_CHANNELS
+from .core.animation_timeline import build_timeline, render_preview
+from .core.color_math import percent_to_brightness, raw_to_rgbww
 from .core.color_commands import (
     ChannelsType,
     ColorCommandHsv,
     ColorCommandRgbww,
     parse_color_commands,
 )
-from .core.rgbww_controller import ControllerUnavailableError, RgbwwController
+from .core.command_journal import CommandJournal
+from .core.command_scheduler import CommandSuperseded
+from .core.controller_group import ControllerGroup, encode_commands
+from .core.effects import EFFECTS_FILE, Effect, effect_commands, load_effects
+from .core.light_commands import LightCommand, build_turn_off, build_turn_on
+from .core.optimistic import OptimisticColor
+from .core.rgbww_controller import (
+    ColorField,
+    ControllerUnavailableError,
+    RgbwwController,
+    SendResult,
+    _ColorState,
+)
+from .core.tracing import TRACER
+from .core.transition_waiters import wait_target
+from .group_light import RgbwwGroupLight
 
 SERVICE_ANIMATION_HSV = "animation_hsv"
 SERVICE_ANIMATION_CLI_HSV = "animation_cli_hsv"
@@ -67,12 +97,77 @@ SERVICE_PAUSE = "PAUSE"
 SERVICE_CONTINUE = "CONTINUE"
 SERVICE_SKIP = "SKIP"
 SERVICE_STOP = "STOP"
+SERVICE_RENDER_ANIMATION_CLI = "render_animation_cli"
 
 _SERVICE_ATTR_ANIM_CLI_COMMAND = "anim_definition_command"
+_SERVICE_ATTR_CHANNELS_TYPE = "channels_type"
+_SERVICE_ATTR_SAMPLE_RATE = "sample_rate"
+_SERVICE_ATTR_HORIZON = "horizon"
+_SERVICE_ATTR_PREVIEW_POINTS = "preview_points"
 
 
 _logger = logging.getLogger(__name__)
 
+# s a light stays available after the connection was lost, as long as the
+# journal keeps animations worth replaying
+RECONNECT_GRACE = CommandJournal.ttl
+
+# Encoded animations by the identity of their call, shared by the entities it
+# targets. The call is kept with its result so its id cannot be reused while
+# cached; ServiceCall has __slots__ and no weak references.
+_ENCODED_CALLS: OrderedDict[
+    int, tuple[ServiceCall, tuple[dict[str, Any], ...]]
+] = OrderedDict()
+_ENCODED_CALLS_SIZE = 16
+
+
+def _encode_once(
+    call: ServiceCall, source: str, parse: Callable[[], Sequence[LightCommand]]
+) -> tuple[dict[str, Any], ...]:
+    """Parse and encode the animation of ``call`` for the first targeted entity.
+
+    Home Assistant calls the entity handler once per targeted light with the
+    same call object, all of them get the result of the first one.
+    """
+    cached = _ENCODED_CALLS.get(id(call))
+    if cached is not None and cached[0] is call:
+        return cached[1]
+    try:
+        with TRACER.span("parse", source=source):
+            commands = parse()
+    except (ValueError, RuntimeError) as e:
+        raise HomeAssistantError(f"Invalid animation command: {e}") from e
+    with TRACER.span("serialize", steps=len(commands)):
+        encoded = encode_commands(commands)
+    _ENCODED_CALLS[id(call)] = (call, encoded)
+    if len(_ENCODED_CALLS) > _ENCODED_CALLS_SIZE:
+        _ENCODED_CALLS.popitem(last=False)
+    return encoded
+
+
+def _wait_target(
+    call: ServiceCall, encoded: Sequence[dict[str, Any]]
+) -> tuple[Sequence[dict[str, Any]], tuple[str, bool] | None]:
+    """Return the commands to send and the step to wait for, if requested."""
+    if not call.data.get(ATTR_WAIT):
+        return encoded, None
+    try:
+        return wait_target(
+            encoded, call.data.get(ATTR_WAIT_FOR), f"ha_wait_{uuid.uuid4().hex[:12]}"
+        )
+    except ValueError as e:
+        raise HomeAssistantError(f"Cannot wait for the animation: {e}") from e
+
+
+# Options of all animation services to wait for a step to finish
+_WAIT_SCHEMA = {
+    vol.Optional(ATTR_WAIT, default=False): cv.boolean,
+    vol.Optional(ATTR_WAIT_FOR): cv.string,
+    vol.Optional(ATTR_WAIT_TIMEOUT, default=60): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=3600)
+    ),
+}
+
 
 def _get_animation_service_base_schema() -> vol.Schema:
     return vol.Schema(
@@ -96,7 +191,9 @@ def _get_animation_service_base_schema() -> vol.Schema:
 
 
 def _register_channel_services():
-    async def on_service_channel(light_entity: RgbwwLight, call: ServiceCall) -> None:
+    async def on_service_channel(
+        light_entity: RgbwwLight | RgbwwGroupLight, call: ServiceCall
+    ) -> None:
         """Handle the channel service call."""
         _logger.debug(
             "Channel service called for entity %s. Channel: %s",
@@ -154,40 +251,65 @@ def _register_animation_hsv_service():
             # 3. Ensure the list is not empty, as per your description.
             vol.Length(min=1),
         ),
+        **_WAIT_SCHEMA,
     }
 
     async def on_service_animation_hsv(
-        light_entity: RgbwwLight, call: ServiceCall
-    ) -> None:
+        light_entity: RgbwwLight | RgbwwGroupLight, call: ServiceCall
+    ) -> ServiceResponse:
         """Handle the animation service call."""
         _logger.debug("Animation service called for entity %s", light_entity.entity_id)
 
-        await light_entity.service_animation_hsv(call)
+        with TRACER.trace():
+            encoded = _encode_once(
+                call,
+                "service",
+                lambda: [
+                    ColorCommandHsv.from_service(cmd)
+                    for cmd in call.data[ATTR_ANIM_DEFINITION_LIST]
+                ],
+            )
+            return await light_entity.service_animation(
+                call, *_wait_target(call, encoded)
+            )
 
     platform = entity_platform.async_get_current_platform()
     platform.async_register_entity_service(
         SERVICE_ANIMATION_HSV,
         ANIMATION_SERVICE_SCHEMA,
         on_service_animation_hsv,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     async def on_service_animation_cli_hsv(
-        light_entity: RgbwwLight, call: ServiceCall
-    ) -> None:
+        light_entity: RgbwwLight | RgbwwGroupLight, call: ServiceCall
+    ) -> ServiceResponse:
         _logger.debug(
             "Animation HSV CLI service called for entity %s", light_entity.entity_id
         )
 
-        await light_entity.service_animation_cli_hsv(call)
+        with TRACER.trace():
+            encoded = _encode_once(
+                call,
+                "cli",
+                lambda: parse_color_commands(
+                    call.data[_SERVICE_ATTR_ANIM_CLI_COMMAND], ChannelsType.HSV
+                ),
+            )
+            return await light_entity.service_animation(
+                call, *_wait_target(call, encoded)
+            )
 
     ANIMATION_CLI_SERVICE_SCHEMA = {
-        vol.Required(_SERVICE_ATTR_ANIM_CLI_COMMAND): cv.string
+        vol.Required(_SERVICE_ATTR_ANIM_CLI_COMMAND): cv.string,
+        **_WAIT_SCHEMA,
     }
 
     platform.async_register_entity_service(
         SERVICE_ANIMATION_CLI_HSV,
         ANIMATION_CLI_SERVICE_SCHEMA,
         on_service_animation_cli_hsv,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
 
@@ -215,15 +337,27 @@ def _register_animation_rgbww_service():
             [ANIMATION_STEP_SCHEMA],
             vol.Length(min=1),
         ),
+        **_WAIT_SCHEMA,
     }
 
     async def on_service_animation_rgbww(
-        light_entity: RgbwwLight, call: ServiceCall
-    ) -> None:
+        light_entity: RgbwwLight | RgbwwGroupLight, call: ServiceCall
+    ) -> ServiceResponse:
         """Handle the animation service call."""
         _logger.debug("Animation service called for entity %s", light_entity.entity_id)
 
-        await light_entity.service_animation_rgbww(call)
+        with TRACER.trace():
+            encoded = _encode_once(
+                call,
+                "service",
+                lambda: [
+                    ColorCommandRgbww.from_service(cmd)
+                    for cmd in call.data[ATTR_ANIM_DEFINITION_LIST]
+                ],
+            )
+            return await light_entity.service_animation(
+                call, *_wait_target(call, encoded)
+            )
 
     # Register the service to set HSV with advanced options
     platform = entity_platform.async_get_current_platform()
@@ -231,25 +365,116 @@ def _register_animation_rgbww_service():
         SERVICE_ANIMATION_RGBWW,
         ANIMATION_SERVICE_SCHEMA,
         on_service_animation_rgbww,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     async def on_service_animation_cli_rgbww(
-        light_entity: RgbwwLight, call: ServiceCall
-    ) -> None:
+        light_entity: RgbwwLight | RgbwwGroupLight, call: ServiceCall
+    ) -> ServiceResponse:
         _logger.debug(
             "Animation HSV CLI service called for entity %s", light_entity.entity_id
         )
 
-        await light_entity.service_animation_cli_rgbww(call)
+        with TRACER.trace():
+            encoded = _encode_once(
+                call,
+                "cli",
+                lambda: parse_color_commands(
+                    call.data[_SERVICE_ATTR_ANIM_CLI_COMMAND], ChannelsType.RGBWW
+                ),
+            )
+            return await light_entity.service_animation(
+                call, *_wait_target(call, encoded)
+            )
 
     ANIMATION_CLI_SERVICE_SCHEMA = {
-        vol.Required(_SERVICE_ATTR_ANIM_CLI_COMMAND): cv.string
+        vol.Required(_SERVICE_ATTR_ANIM_CLI_COMMAND): cv.string,
+        **_WAIT_SCHEMA,
     }
 
     platform.async_register_entity_service(
         SERVICE_ANIMATION_CLI_RGBWW,
         ANIMATION_CLI_SERVICE_SCHEMA,
         on_service_animation_cli_rgbww,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _render_animation_cli(call: ServiceCall, color: _ColorState) -> ServiceResponse:
+    """Render the animation of the call, starting at ``color``."""
+    channels_type = ChannelsType(call.data[_SERVICE_ATTR_CHANNELS_TYPE])
+    try:
+        anims = parse_color_commands(
+            call.data[_SERVICE_ATTR_ANIM_CLI_COMMAND], channels_type
+        )
+    except (RuntimeError, ValueError) as e:
+        raise HomeAssistantError(f"Invalid animation command: {e}") from e
+
+    if channels_type == ChannelsType.HSV:
+        initial = dict(
+            zip(
+                HSV_CHANNELS,
+                (color.hue, color.saturation, color.brightness, color.color_temp),
+                strict=True,
+            )
+        )
+    else:
+        initial = dict(
+            zip(
+                RAW_CHANNELS,
+                (
+                    color.raw_r,
+                    color.raw_g,
+                    color.raw_b,
+                    color.raw_cw,
+                    color.raw_ww,
+                ),
+                strict=True,
+            )
+        )
+
+    timeline = build_timeline(
+        anims, initial, horizon=call.data[_SERVICE_ATTR_HORIZON] * 1000
+    )
+    return render_preview(
+        timeline,
+        sample_rate=call.data[_SERVICE_ATTR_SAMPLE_RATE],
+        preview_points=call.data[_SERVICE_ATTR_PREVIEW_POINTS],
+    )
+
+
+def _register_render_service():
+    async def on_service_render_animation_cli(
+        light_entity: RgbwwLight | RgbwwGroupLight, call: ServiceCall
+    ) -> ServiceResponse:
+        _logger.debug(
+            "Render animation service called for entity %s", light_entity.entity_id
+        )
+
+        return _render_animation_cli(call, light_entity.render_start_color())
+
+    RENDER_SERVICE_SCHEMA = {
+        vol.Required(_SERVICE_ATTR_ANIM_CLI_COMMAND): cv.string,
+        vol.Optional(_SERVICE_ATTR_CHANNELS_TYPE, default=ChannelsType.HSV): vol.In(
+            [ChannelsType.HSV, ChannelsType.RGBWW]
+        ),
+        vol.Optional(_SERVICE_ATTR_SAMPLE_RATE, default=20): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=200)
+        ),
+        vol.Optional(_SERVICE_ATTR_HORIZON, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=3600)
+        ),
+        vol.Optional(_SERVICE_ATTR_PREVIEW_POINTS, default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=2, max=1000)
+        ),
+    }
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_RENDER_ANIMATION_CLI,
+        RENDER_SERVICE_SCHEMA,
+        on_service_render_animation_cli,
+        supports_response=SupportsResponse.ONLY,
     )
 
 
@@ -258,19 +483,23 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
+    effects = await hass.async_add_executor_job(
+        load_effects, hass.config.path(EFFECTS_FILE)
+    )
+    if isinstance(entry.runtime_data, ControllerGroup):
+        async_add_entities((RgbwwGroupLight(entry.runtime_data, entry, effects),))
+        return
+
     controller = cast(RgbwwController, entry.runtime_data)
 
-    rgb = RgbwwLight(
-        hass,
-        controller,
-        entry,
-    )
+    rgb = RgbwwLight(hass, controller, entry, effects)
 
     async_add_entities((rgb,))
 
     _register_animation_hsv_service()
     _register_animation_rgbww_service()
     _register_channel_services()
+    _register_render_service()
 
 
 class RgbwwLight(RgbwwEntity, LightEntity):
@@ -286,6 +515,7 @@ class RgbwwLight(RgbwwEntity, LightEntity):
         hass: HomeAssistant,
         controller: RgbwwController,
         config_entry: ConfigEntry,
+        effects: dict[str, Effect] | None = None,
     ) -> None:
         """Initialize the light."""
         super().__init__(
@@ -301,12 +531,22 @@ class RgbwwLight(RgbwwEntity, LightEntity):
             ColorMode.COLOR_TEMP,
         }
         self._attr_supported_features = (
-            LightEntityFeature.TRANSITION | LightEntityFeature.FLASH
-            # | LightEntityFeature.EFFECT
+            LightEntityFeature.TRANSITION
+            | LightEntityFeature.FLASH
+            | LightEntityFeature.EFFECT
         )
+        self._effects = effects or {}
+        self._attr_effect_list = list(self._effects)
+        self._attr_effect = None
 
         # Initialize the attributes dictionary
         self._attr_extra_state_attributes = {}
+        self._color_version = -1
+        self._written_output: tuple[Any, ...] | None = None
+        self._optimistic = OptimisticColor(
+            controller.latency, self._on_optimistic_timeout
+        )
+        self._unavailable_timer: asyncio.TimerHandle | None = None
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to the events."""
@@ -316,6 +556,8 @@ class RgbwwLight(RgbwwEntity, LightEntity):
             self.on_state_completed()
 
     async def async_will_remove_from_hass(self) -> None:
+        self._optimistic.cancel()
+        self._cancel_unavailable_timer()
         await super().async_will_remove_from_hass()
 
     def on_clock_slave_status_update(self) -> None: ...  # noqa: D102
@@ -324,49 +566,61 @@ class RgbwwLight(RgbwwEntity, LightEntity):
         if not self._controller.state_completed:
             return
 
-        match self._controller.color.color_mode:
-            case "raw":
-                raw_conv = functools.partial(
-                    scale_ranged_value_to_int_range, (0, 1023), (0, 255)
-                )
+        color = self._controller.color
+        if self._optimistic.pending and not self._optimistic.confirm(color):
+            return  # keep showing the target of the last command
+        if color.version == self._color_version + 1:
+            changed = color.changed
+        else:
+            changed = ColorField.ALL  # first update or missed versions
+        self._color_version = color.version
 
-                self._attr_rgbww_color = (
-                    raw_conv(self._controller.color.raw_r),
-                    raw_conv(self._controller.color.raw_g),
-                    raw_conv(self._controller.color.raw_b),
-                    raw_conv(self._controller.color.raw_cw),
-                    raw_conv(self._controller.color.raw_ww),
+        match color.color_mode:
+            case "raw" if changed & (ColorField.RAW | ColorField.MODE):
+                self._attr_rgbww_color = raw_to_rgbww(
+                    color.raw_r, color.raw_g, color.raw_b, color.raw_cw, color.raw_ww
                 )
                 self._attr_is_on = (
-                    self._controller.color.raw_r > 0
-                    or self._controller.color.raw_g > 0
-                    or self._controller.color.raw_b > 0
-                    or self._controller.color.raw_ww > 0
-                    or self._controller.color.raw_cw > 0
+                    color.raw_r > 0
+                    or color.raw_g > 0
+                    or color.raw_b > 0
+                    or color.raw_ww > 0
+                    or color.raw_cw > 0
                 )
                 # self._attr_color_mode = ColorMode.RGBWW
-            case "hsv":
-                self._attr_hs_color = (
-                    self._controller.color.hue,
-                    self._controller.color.saturation,
-                )
+            case "hsv" if changed & (ColorField.HSV | ColorField.MODE):
+                self._attr_hs_color = (color.hue, color.saturation)
 
-                v = self._controller.color.brightness
+                v = color.brightness
                 if v is not None:
-                    self._attr_brightness = scale_ranged_value_to_int_range(
-                        (0, 100), (0, 255), v
-                    )
-                self._attr_extra_state_attributes["hsv_ct"] = (
-                    self._controller.color.color_temp
-                )
+                    self._attr_brightness = percent_to_brightness(v)
+                self._attr_extra_state_attributes["hsv_ct"] = color.color_temp
                 self._attr_is_on = v > 0
                 # self._attr_color_temp_kelvin = self._controller.color.color_temp
                 # self._attr_color_mode = ColorMode.HS
             case _:
                 ...
         self._attr_color_mode = ColorMode.HS
+        if self._color_output() == self._written_output:
+            self._controller.stats.suppressed_writes += 1
+            return
         self.async_write_ha_state()
 
+    def _color_output(self) -> tuple[Any, ...]:
+        return (
+            self._attr_is_on,
+            self._attr_hs_color,
+            self._attr_brightness,
+            self._attr_rgbww_color,
+            self._attr_color_mode,
+            self._attr_extra_state_attributes.get("hsv_ct"),
+        )
+
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember the color output it contained."""
+        self._written_output = self._color_output()
+        super().async_write_ha_state()
+
     def _update_ha_device(self) -> None:
         device_registry = dr.async_get(self.hass)
 
@@ -390,6 +644,8 @@ class RgbwwLight(RgbwwEntity, LightEntity):
 
     # protocol rgbww state
     def on_state_completed(self) -> None:
+        self._color_version = -1  # recompute everything
+        self._optimistic.cancel()
         self.on_update_color()  # Update color first to set color mode, otherwise brightness might be ignored
         self.on_connection_update()
         self.on_config_update()
@@ -398,77 +654,136 @@ class RgbwwLight(RgbwwEntity, LightEntity):
 
     def on_connection_update(self) -> None:
         if self._controller.connected:
+            self._cancel_unavailable_timer()
             return
-        self._attr_available = self._controller.connected
+        # Stay available while reconnecting, so commands still reach the
+        # controller and get journaled for the replay.
+        if self._unavailable_timer is None:
+            self._unavailable_timer = asyncio.get_running_loop().call_later(
+                RECONNECT_GRACE, self._on_reconnect_timeout
+            )
+
+    def _on_reconnect_timeout(self) -> None:
+        self._unavailable_timer = None
+        if self._controller.connected:
+            return
+        self._attr_available = False
         self.async_write_ha_state()
 
+    def _cancel_unavailable_timer(self) -> None:
+        if self._unavailable_timer is not None:
+            self._unavailable_timer.cancel()
+            self._unavailable_timer = None
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        try:
-            attr_changed = False
-            hsv_params: dict[str, Any] = {"speed_or_fade_duration": 500}
-
-            if (rgbww := kwargs.get(ATTR_RGBWW_COLOR)) is not None:
-                raw_conv = functools.partial(
-                    scale_ranged_value_to_int_range, (0, 255), (0, 1023)
-                )
-
-                ctrl_raw = (
-                    raw_conv(rgbww[0]),
-                    raw_conv(rgbww[1]),
-                    raw_conv(rgbww[2]),
-                    raw_conv(rgbww[3]),
-                    raw_conv(rgbww[4]),
-                )
-                await self._controller.set_raw(*ctrl_raw)
-                self._attr_rgbww_color = rgbww
-                attr_changed = True
-                self._attr_color_mode = ColorMode.RGBWW
-                self._attr_is_on = any(c > 0 for c in rgbww)
-            elif (hs := kwargs.get(ATTR_HS_COLOR)) is not None:
-                hsv_params = {"h": hs[0], "s": hs[1]}
-                self._attr_hs_color = hs
-                # self._attr_color_mode = ColorMode.RGBWW
-            if (ct := kwargs.get(ATTR_COLOR_TEMP_KELVIN)) is not None:
-                hsv_params["ct"] = ct
-                self._attr_color_temp_kelvin = ct
-                # we do not actually switch to color temp mode because we use it as a feature for hsv
-                # self._attr_color_mode = ColorMode.COLOR_TEMP
-
-            if not kwargs:  # Turn on with last known state or default
-                await self._controller.send_color_command(ColorCommandHsv(v=100))
-
-            if (brightness := kwargs.get(ATTR_BRIGHTNESS)) is not None:
-                hsv_params["v"] = scale_to_ranged_value((0, 255), (0, 100), brightness)
-                self._attr_brightness = brightness
-                self._attr_is_on = brightness > 0
-            if (transition := kwargs.get(ATTR_TRANSITION)) is not None:
-                hsv_params["speed_or_fade_duration"] = int(
-                    transition * 1000
-                )  # seconds to milliseconds
+        if (effect := kwargs.get(ATTR_EFFECT)) is not None and effect != EFFECT_OFF:
+            await self._start_effect(effect)
+            return
 
+        commands = build_turn_on(
+            kwargs, self._current_color(), is_on=bool(self._attr_is_on)
+        )
+        flash = ATTR_FLASH in kwargs
+        try:
+            await self._send_light_commands(commands, expect=not flash)
         except ControllerUnavailableError as e:
             _logger.error("async_turn_on failed. Controller error: %s", e)
-        else:
-            if hsv_params:
-                await self._controller.send_color_command(ColorCommandHsv(**hsv_params))
-                attr_changed = True
+            return
 
-            if attr_changed:
-                self.async_write_ha_state()
+        if flash:
+            return  # the color is restored after the flash
+
+        self._attr_effect = None
+        if (rgbww := kwargs.get(ATTR_RGBWW_COLOR)) is not None:
+            self._attr_rgbww_color = rgbww
+            self._attr_color_mode = ColorMode.RGBWW
+            self._attr_is_on = any(c > 0 for c in rgbww)
+        elif (hs := kwargs.get(ATTR_HS_COLOR)) is not None:
+            self._attr_hs_color = hs
+        if (ct := kwargs.get(ATTR_COLOR_TEMP_KELVIN)) is not None:
+            # we do not actually switch to color temp mode because we use it as a feature for hsv
+            self._attr_color_temp_kelvin = ct
+        if (brightness := kwargs.get(ATTR_BRIGHTNESS)) is not None:
+            self._attr_brightness = brightness
+            self._attr_is_on = brightness > 0
+        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
-        await self._controller.send_color_command(ColorCommandHsv(v=0))
+        commands = build_turn_off(kwargs, self._current_color())
+        flash = ATTR_FLASH in kwargs
+        await self._send_light_commands(commands, expect=not flash)
+        if flash:
+            return
+        self._attr_effect = None
+        self._attr_is_on = False
+        self.async_write_ha_state()
+
+    async def _start_effect(self, name: str) -> None:
+        if (effect := self._effects.get(name)) is None:
+            raise HomeAssistantError(f"Unknown effect: {name}")
+        try:
+            await self._controller.send_encoded_color_commands(
+                effect_commands(effect, self._current_color())
+            )
+        except ControllerUnavailableError as e:
+            _logger.error("Starting effect %s failed. Controller error: %s", name, e)
+            return
+        except CommandSuperseded:
+            _logger.debug("Effect %s superseded before it was sent", name)
+            return
+        if effect.flash:
+            return  # the previous color or animation continues afterwards
+        self._optimistic.cancel()
+        self._attr_effect = name
+        self._attr_is_on = True
+        self.async_write_ha_state()
+
+    def _on_optimistic_timeout(self) -> None:
+        # show the last state the controller reported
+        self._color_version = -1
+        self.on_update_color()
+
+    def _current_color(self) -> _ColorState | None:
+        if not self._controller.state_completed:
+            return None
+        return self._controller.color
+
+    async def _send_light_commands(
+        self, commands: list[LightCommand], expect: bool
+    ) -> None:
+        if expect:
+            # before the send, the echo can arrive ahead of the response
+            self._optimistic.expect(commands[0])
+        try:
+            # one request either way, ``cmds`` only when a flash needs two steps
+            if len(commands) == 1:
+                await self._controller.send_color_command(commands[0])
+            else:
+                await self._controller.send_color_commands(commands)
+        except BaseException:
+            if expect:
+                self._optimistic.discard(commands[0])
+            raise
 
     def on_transition_finished(self, name: str, requeued: bool) -> None:
-        event_data: dict[str, Any] = {
-            "device_id": "rgbwwid",
-            "type": "transition_finished",
-            "name": name,
-            "requeued": requeued,
-        }
-        self.hass.bus.async_fire("transition_finished", event_data)
+        # The light itself does not change. Deprecated: the original bus
+        # event and payload, kept until automations moved to device triggers.
+        self.hass.bus.async_fire(
+            LEGACY_EVENT_TRANSITION_FINISHED,
+            {
+                "device_id": "rgbwwid",
+                "type": "transition_finished",
+                "name": name,
+                "requeued": requeued,
+            },
+        )
+        triggers = self.hass.data.get(DOMAIN, {}).get(TRANSITION_TRIGGERS)
+        if triggers is None or self.registry_entry is None:
+            return
+        if (device_id := self.registry_entry.device_id) is not None:
+            triggers.dispatch(device_id, name, requeued)
 
     def on_config_update(self) -> None:
         if not self._controller.state_completed:
@@ -482,93 +797,52 @@ class RgbwwLight(RgbwwEntity, LightEntity):
         ]["ww"]
         self.async_write_ha_state()
 
-    async def service_animation_cli_hsv(self, call: ServiceCall) -> None:
+    async def service_animation(
+        self,
+        call: ServiceCall,
+        encoded: Sequence[dict[str, Any]],
+        wait_for: tuple[str, bool] | None = None,
+    ) -> ServiceResponse:
+        """Send an animation that the service layer encoded for all targets.
+
+        With ``wait_for`` returns once that step finished, was interrupted or
+        timed out.
+        """
+        started = time.monotonic()
         try:
-            anims = parse_color_commands(
-                call.data[_SERVICE_ATTR_ANIM_CLI_COMMAND], ChannelsType.HSV
-            )
-            await self._controller.send_color_commands(anims)
-        except ControllerUnavailableError as e:
-            # Catch specific errors from your controller library
-            _logger.error(
-                "Animation failed: Device at %s is unavailable. Error: %s",
-                self._controller.host,  # Assuming controller has an IP property
-                e,
+            sent, waiter = await self._controller.send_encoded_color_commands(
+                encoded, wait_for
             )
-            # Optionally, re-raise as a HA error to notify the user in the UI
-            raise HomeAssistantError(
-                f"Failed to start animation: {self.name} is unavailable."
-            ) from e
-
-    async def service_animation_hsv(self, call: ServiceCall) -> None:
-        try:
-            color_commands = [
-                ColorCommandHsv.from_service(cmd)
-                for cmd in call.data[ATTR_ANIM_DEFINITION_LIST]
-            ]
-            await self._controller.send_color_commands(color_commands)
         except ControllerUnavailableError as e:
-            # Catch specific errors from your controller library
             _logger.error(
                 "Animation failed: Device at %s is unavailable. Error: %s",
-                self._controller.host,  # Assuming controller has an IP property
-                e,
-            )
-            # Optionally, re-raise as a HA error to notify the user in the UI
-            raise HomeAssistantError(
-                f"Failed to start animation: {self.name} is unavailable."
-            ) from e
-        except Exception as e:
-            _logger.error(
-                "Animation failed: Error: %s",
                 self._controller.host,
                 e,
             )
-            raise HomeAssistantError(f"Failed to start animation. Error: {e}") from e
-
-    async def service_animation_cli_rgbww(self, call: ServiceCall) -> None:
-        try:
-            anims = parse_color_commands(
-                call.data[_SERVICE_ATTR_ANIM_CLI_COMMAND], ChannelsType.RGBWW
-            )
-            await self._controller.send_color_commands(anims)
-        except ControllerUnavailableError as e:
-            # Catch specific errors from your controller library
-            _logger.error(
-                "Animation failed: Device at %s is unavailable. Error: %s",
-                self._controller.host,  # Assuming controller has an IP property
-                e,
-            )
-            # Optionally, re-raise as a HA error to notify the user in the UI
+            if call.return_response:
+                return {"success": False, "error": str(e)}
             raise HomeAssistantError(
                 f"Failed to start animation: {self.name} is unavailable."
             ) from e
+        except CommandSuperseded as e:
+            if call.return_response:
+                return {"success": False, "error": str(e)}
+            raise HomeAssistantError(f"Animation not started: {e}") from e
+        response = {
+            "success": True,
+            "steps": len(encoded),
+            "queued": sent is SendResult.QUEUED,
+        }
+        if waiter is None:
+            return response
+        result = await self._controller.transitions.wait(
+            waiter, started, call.data[ATTR_WAIT_TIMEOUT]
+        )
+        return response | result.as_dict()
 
-    async def service_animation_rgbww(self, call: ServiceCall) -> None:
-        try:
-            color_commands = [
-                ColorCommandRgbww.from_service(cmd)
-                for cmd in call.data[ATTR_ANIM_DEFINITION_LIST]
-            ]
-            await self._controller.send_color_commands(color_commands)
-        except ControllerUnavailableError as e:
-            # Catch specific errors from your controller library
-            _logger.error(
-                "Animation failed: Device at %s is unavailable. Error: %s",
-                self._controller.host,  # Assuming controller has an IP property
-                e,
-            )
-            # Optionally, re-raise as a HA error to notify the user in the UI
-            raise HomeAssistantError(
-                f"Failed to start animation: {self.name} is unavailable."
-            ) from e
-        except Exception as e:
-            _logger.error(
-                "Animation failed: Error: %s",
-                self._controller.host,
-                e,
-            )
-            raise HomeAssistantError(f"Failed to start animation. Error: {e}") from e
+    def render_start_color(self) -> _ColorState:
+        """Color a rendered animation starts from."""
+        return self._controller.color
 
     async def service_channel(self, call: ServiceCall) -> None:
         try:
@@ -2,24 +2,31 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 import logging
-from typing import cast
+import time
+from typing import Any, Literal, cast
 
 import voluptuous as vol
 
+from .const import SYNC_OFFSET_DEADBAND, SYNC_OFFSET_MAX_INTERVAL, SYNC_STATS_WINDOW
 from .core.rgbww_controller import (
     RgbwwController,
 )
+from .core.statistics import ClockSyncStatistics, DeadbandThrottle
 from .rgbww_entity import RgbwwEntity
 from homeassistant.components.sensor import (
     PLATFORM_SCHEMA as SENSOR_PLATFORM_SCHEMA,
+    SensorDeviceClass,
     SensorEntity,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfDataRate, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +34,10 @@ CONF_METER_NUMBER = "meter_number"
 
 SCAN_INTERVAL = timedelta(minutes=15)
 
+# The diagnostic sensors only copy in-memory statistics and refresh on their
+# own timer, so the platform keeps its slow SCAN_INTERVAL.
+DIAGNOSTIC_UPDATE_INTERVAL = timedelta(seconds=30)
+
 PLATFORM_SCHEMA = SENSOR_PLATFORM_SCHEMA.extend(
     {vol.Required(CONF_METER_NUMBER): cv.string}
 )
@@ -41,17 +52,32 @@ async def async_setup_entry(
 
     sync_offset = SyncOffsetSensor(hass, controller, entry)
 
-    async_add_entities((sync_offset,))
+    async_add_entities(
+        (
+            sync_offset,
+            LatencySensor(hass, controller, entry, "http_rtt"),
+            LatencySensor(hass, controller, entry, "echo"),
+            *(
+                ConnectionSensor(hass, controller, entry, kind)
+                for kind in ConnectionSensor.KINDS
+            ),
+        )
+    )
 
 
 class SyncOffsetSensor(RgbwwEntity, SensorEntity):
     # _attr_device_class = SensorDeviceClass.
+    _attr_should_poll = False
 
     def __init__(
         self,
         hass: HomeAssistant,
         controller: RgbwwController,
         config_entry: ConfigEntry,
+        *,
+        window: int = SYNC_STATS_WINDOW,
+        deadband: float = SYNC_OFFSET_DEADBAND,
+        max_interval: float = SYNC_OFFSET_MAX_INTERVAL,
     ):
         """Initialize the sensor."""
         super().__init__(
@@ -61,6 +87,8 @@ class SyncOffsetSensor(RgbwwEntity, SensorEntity):
         self._attr_name = config_entry.title + " SyncOffet"
         self._attr_unique_id = f"{config_entry.unique_id}_syncoffset"
         self._attr_native_unit_of_measurement = "sync cycles"
+        self.statistics = ClockSyncStatistics(window)
+        self._throttle = DeadbandThrottle(deadband, max_interval)
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to the events."""
@@ -76,12 +104,227 @@ class SyncOffsetSensor(RgbwwEntity, SensorEntity):
 
     def on_config_update(self) -> None:
         self._attr_available = self._controller.config["sync"]["cmd_slave_enabled"]
+        self._throttle.reset()
         self.async_write_ha_state()
 
     def on_state_completed(self) -> None:
         self._attr_available = True
 
     def on_clock_slave_status_update(self) -> None:
-        self._attr_native_value = self._controller.clock_slave_status["offset"]
-        # clockCurrentInterval
+        status = self._controller.clock_slave_status
+        offset = status["offset"]
+        self.statistics.add(offset, status["current_interval"])
+        # Most messages only repeat the offset, write it when it moved or to
+        # refresh the state now and then.
+        if not self._throttle.should_write(offset, time.monotonic()):
+            return
+        self._attr_native_value = offset
+        self._attr_extra_state_attributes = self.statistics.summary()
         self.async_write_ha_state()
+
+
+class _DiagnosticSensor(RgbwwEntity, SensorEntity):
+    """Sensor copying controller statistics every DIAGNOSTIC_UPDATE_INTERVAL."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        await self.async_update()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_refresh, DIAGNOSTIC_UPDATE_INTERVAL
+            )
+        )
+
+    async def _async_refresh(self, now: datetime) -> None:
+        await self.async_update()
+        self.async_write_ha_state()
+
+    def on_clock_slave_status_update(self) -> None: ...
+
+
+class LatencySensor(_DiagnosticSensor):
+    """Median HTTP round trip or command-to-echo time, p95/p99 as attributes."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+
+    _NAMES = {"http_rtt": "HTTP round trip", "echo": "Command echo latency"}
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller: RgbwwController,
+        config_entry: ConfigEntry,
+        kind: Literal["http_rtt", "echo"],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            hass=hass, controller=controller, device_id=config_entry.unique_id
+        )
+        self._kind = kind
+        self._attr_name = f"{config_entry.title} {self._NAMES[kind]}"
+        self._attr_unique_id = f"{config_entry.unique_id}_{kind}"
+
+    async def async_update(self) -> None:
+        """Copy the rolling statistics."""
+        latency = self._controller.latency
+        window = latency.http_rtt if self._kind == "http_rtt" else latency.echo
+        summary = window.summary()
+        self._attr_native_value = summary["p50"]
+        attributes: dict[str, Any] = {
+            "p95": summary["p95"],
+            "p99": summary["p99"],
+            "samples": summary["samples"],
+        }
+        if self._kind == "echo":
+            attributes["lost"] = latency.lost
+        self._attr_extra_state_attributes = attributes
+
+
+ConnectionSensorKind = Literal[
+    "reconnects",
+    "connected_since",
+    "messages_per_second",
+    "bytes_per_second",
+    "decode_errors",
+    "last_keep_alive",
+    "http_error_rate",
+    "http_throttled",
+]
+
+
+class ConnectionSensor(_DiagnosticSensor):
+    """Health of the stream and HTTP connection, see ``ConnectionStats``."""
+
+    # kind: (name, device class, unit, state class, enabled by default)
+    KINDS: dict[
+        ConnectionSensorKind,
+        tuple[str, SensorDeviceClass | None, str | None, SensorStateClass | None, bool],
+    ] = {
+        "reconnects": (
+            "Reconnects",
+            None,
+            None,
+            SensorStateClass.TOTAL_INCREASING,
+            True,
+        ),
+        "connected_since": (
+            "Connected since",
+            SensorDeviceClass.TIMESTAMP,
+            None,
+            None,
+            True,
+        ),
+        "messages_per_second": (
+            "Stream messages",
+            None,
+            "msg/s",
+            SensorStateClass.MEASUREMENT,
+            False,
+        ),
+        "bytes_per_second": (
+            "Stream throughput",
+            SensorDeviceClass.DATA_RATE,
+            UnitOfDataRate.BYTES_PER_SECOND,
+            SensorStateClass.MEASUREMENT,
+            False,
+        ),
+        "decode_errors": (
+            "Stream decode errors",
+            None,
+            None,
+            SensorStateClass.TOTAL_INCREASING,
+            True,
+        ),
+        "last_keep_alive": (
+            "Last keep-alive",
+            SensorDeviceClass.TIMESTAMP,
+            None,
+            None,
+            False,
+        ),
+        "http_error_rate": (
+            "HTTP error rate",
+            None,
+            "%",
+            SensorStateClass.MEASUREMENT,
+            True,
+        ),
+        "http_throttled": (
+            "HTTP throttled requests",
+            None,
+            None,
+            SensorStateClass.TOTAL_INCREASING,
+            False,
+        ),
+    }
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        controller: RgbwwController,
+        config_entry: ConfigEntry,
+        kind: ConnectionSensorKind,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            hass=hass, controller=controller, device_id=config_entry.unique_id
+        )
+        name, device_class, unit, state_class, enabled = self.KINDS[kind]
+        self._kind = kind
+        self._attr_name = f"{config_entry.title} {name}"
+        self._attr_unique_id = f"{config_entry.unique_id}_{kind}"
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_entity_registry_enabled_default = enabled
+        if kind in ("messages_per_second", "bytes_per_second", "http_error_rate"):
+            self._attr_suggested_display_precision = 1
+
+    async def async_update(self) -> None:
+        """Read the counters."""
+        stats = self._controller.stats
+        match self._kind:
+            case "reconnects":
+                self._attr_native_value = stats.reconnects
+            case "connected_since":
+                self._attr_native_value = _timestamp(stats.session_started)
+            case "messages_per_second":
+                rates = stats.message_rates()
+                self._attr_native_value = sum(rates.values())
+                self._attr_extra_state_attributes = {
+                    method: round(rate, 2) for method, rate in rates.items()
+                }
+            case "bytes_per_second":
+                self._attr_native_value = stats.byte_rate()
+            case "decode_errors":
+                self._attr_native_value = stats.decode_errors
+            case "last_keep_alive":
+                self._attr_native_value = _timestamp(stats.last_keep_alive)
+            case "http_error_rate":
+                self._attr_native_value = stats.http_error_rate
+                self._attr_extra_state_attributes = {
+                    "requests": stats.http_requests,
+                    "errors": stats.http_errors,
+                }
+            case "http_throttled":
+                bucket = self._controller.rate_limit
+                wait = bucket.wait_ms.summary()
+                self._attr_native_value = bucket.throttled
+                self._attr_extra_state_attributes = {
+                    "requests": bucket.acquired,
+                    "rate": bucket.limit.rate,
+                    "burst": bucket.limit.burst,
+                    "configured": bucket.configured,
+                    "wait_ms_p50": wait["p50"],
+                    "wait_ms_p95": wait["p95"],
+                }
+
+
+def _timestamp(epoch: float | None) -> datetime | None:
+    return None if epoch is None else datetime.fromtimestamp(epoch, UTC)
@@ -0,0 +1,34 @@
+"""Helpers shared by the tests."""
+
+import asyncio
+from collections.abc import Callable
+
+import aiohttp
+
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+
+async def async_wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    """Wait until ``condition`` holds, polling the event loop."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+async def async_connect(
+    fake: FakeRgbwwController, session: aiohttp.ClientSession
+) -> RgbwwController:
+    """Return a controller connected to ``fake`` with its initial state."""
+    controller = RgbwwController(
+        None,
+        fake.host,
+        http_port=fake.http_port,
+        tcp_port=fake.tcp_port,
+        session=session,
+    )
+    await controller.connect()
+    await async_wait_for(lambda: controller.connected and controller.state_completed)
+    return controller
@@ -0,0 +1,36 @@
+"""Fixtures running the integration against the fake controller."""
+
+from collections.abc import AsyncIterator
+
+import aiohttp
+import pytest_asyncio
+
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+from .common import async_connect
+
+
+@pytest_asyncio.fixture
+async def fake() -> AsyncIterator[FakeRgbwwController]:
+    """A fake controller whose animation engine only runs on ``advance``."""
+    async with FakeRgbwwController(autorun=False) as fake:
+        yield fake
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def controller(
+    fake: FakeRgbwwController, session: aiohttp.ClientSession
+) -> AsyncIterator[RgbwwController]:
+    """A controller connected to ``fake`` with its initial state received."""
+    controller = await async_connect(fake, session)
+    yield controller
+    await controller.disconnect()
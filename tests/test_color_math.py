@@ -0,0 +1,46 @@
+"""The lookup tables return exactly what the Home Assistant helpers would."""
+
+from homeassistant.util import scaling
+
+from custom_components.fhem_rgbwwcontroller.core.color_math import (
+    HA_RANGE,
+    PERCENT_RANGE,
+    RAW_RANGE,
+    brightness_to_percent,
+    percent_to_brightness,
+    raw_to_rgbww,
+    rgbww_to_raw,
+)
+
+
+def test_raw_matches_the_helper() -> None:
+    for v in range(1024):
+        expected = scaling.scale_ranged_value_to_int_range(RAW_RANGE, HA_RANGE, v)
+        assert raw_to_rgbww(v, v, v, v, v) == (expected,) * 5
+
+
+def test_rgbww_matches_the_helper() -> None:
+    for v in range(256):
+        expected = scaling.scale_ranged_value_to_int_range(HA_RANGE, RAW_RANGE, v)
+        assert rgbww_to_raw((v, v, v, v, v)) == (expected,) * 5
+
+
+def test_percent_and_brightness_match_the_helpers() -> None:
+    for v in range(101):
+        assert percent_to_brightness(v) == scaling.scale_ranged_value_to_int_range(
+            PERCENT_RANGE, HA_RANGE, v
+        )
+    for v in range(256):
+        assert brightness_to_percent(v) == scaling.scale_to_ranged_value(
+            HA_RANGE, PERCENT_RANGE, v
+        )
+
+
+def test_values_outside_the_range_are_clamped() -> None:
+    assert raw_to_rgbww(-1, -1023, 1024, 5000, 0) == raw_to_rgbww(0, 0, 1023, 1023, 0)
+    assert rgbww_to_raw((-1, -255, 256, 1000, 0)) == rgbww_to_raw((0, 0, 255, 255, 0))
+
+
+def test_floats_use_the_helper() -> None:
+    expected = scaling.scale_ranged_value_to_int_range(RAW_RANGE, HA_RANGE, 511.5)
+    assert raw_to_rgbww(511.5, 0, 0, 0, 0)[0] == expected  # type: ignore[arg-type]
@@ -0,0 +1,64 @@
+"""Color updates are versioned and unchanged output is not written again."""
+
+import pytest
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    ColorField,
+    RgbwwController,
+)
+
+from .common import async_wait_for
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _color_event(
+    fake: FakeRgbwwController, controller: RgbwwController, **hsv: int
+) -> None:
+    version = controller.color.version
+    if hsv:
+        await fake.apply_color_commands([{"hsv": hsv, "t": 0}])
+    else:
+        await fake.emit("color_event", fake.color_params())
+    await async_wait_for(lambda: controller.color.version == version + 1)
+
+
+async def test_changed_holds_the_modified_fields(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    color = controller.color
+
+    await _color_event(fake, controller, h=color.hue + 10)
+    assert color.changed == ColorField.HUE
+
+    await _color_event(fake, controller, s=50, v=40)
+    assert color.changed == ColorField.SATURATION | ColorField.BRIGHTNESS
+
+    await _color_event(fake, controller)
+    assert color.changed == 0
+
+
+async def test_unchanged_output_is_not_written(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+    writes: list[tuple[object, ...]] = []
+
+    def write() -> None:
+        writes.append(light._color_output())  # noqa: SLF001
+        light._written_output = writes[-1]  # noqa: SLF001
+
+    light.async_write_ha_state = write
+    controller.register_callback(light)
+    light.on_state_completed()
+    writes.clear()
+    suppressed = controller.stats.suppressed_writes
+
+    await _color_event(fake, controller)  # same color again
+    assert not writes
+    assert controller.stats.suppressed_writes == suppressed + 1
+
+    await _color_event(fake, controller, h=controller.color.hue + 10)
+    assert len(writes) == 1
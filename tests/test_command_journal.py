@@ -0,0 +1,93 @@
+"""Color commands sent while reconnecting are journaled and replayed."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.command_journal import (
+    CommandJournal,
+)
+from custom_components.fhem_rgbwwcontroller.core.command_scheduler import Lane
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+    SendResult,
+)
+
+from .common import async_wait_for
+
+
+def test_merged_set_takes_the_newer_transition() -> None:
+    journal = CommandJournal()
+
+    journal.record([{"hsv": {"h": 120, "s": 100}, "t": 2000}])
+    journal.record([{"hsv": {"v": 50}}])
+
+    assert journal.take() == [{"hsv": {"h": 120, "s": 100, "v": 50}}]
+
+
+@pytest.mark.asyncio
+async def test_replayed_after_reconnect(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    controller._RECONNECT_DELAY = 0.2  # noqa: SLF001
+    await fake.disconnect_clients()
+    await async_wait_for(lambda: not controller.connected)
+
+    results = [
+        await controller.send_encoded_color_commands([cmd], lane=Lane.INTERACTIVE)
+        for cmd in (
+            {"hsv": {"h": 120, "s": 100, "v": 100}, "t": 1000},
+            {"hsv": {"v": 50}, "t": 0},
+        )
+    ]
+
+    assert results == [(SendResult.QUEUED, None)] * 2
+    assert fake.requests["POST /color"] == 0
+    await async_wait_for(lambda: fake.requests["POST /color"] == 1)
+    assert fake.received_commands == [{"hsv": {"h": 120, "s": 100, "v": 50}, "t": 0}]
+    assert controller.connected
+
+
+@pytest.mark.asyncio
+async def test_light_stays_available_while_reconnecting(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+    controller.register_callback(light)
+    light.on_state_completed()
+    controller._RECONNECT_DELAY = 0.2  # noqa: SLF001
+    await fake.disconnect_clients()
+    await async_wait_for(lambda: not controller.connected)
+
+    assert light._attr_available  # noqa: SLF001
+    await light.async_turn_on(hs_color=(120.0, 100.0), brightness=255)
+
+    assert fake.received_commands == []
+    await async_wait_for(lambda: fake.received_commands)
+    (cmd,) = fake.received_commands
+    assert cmd["hsv"]["h"] == 120.0
+    assert light._attr_available  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_journaled_and_replayed(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+    controller.register_callback(light)
+    light.on_state_completed()
+    controller._RECONNECT_DELAY = 0.2  # noqa: SLF001
+    fake.faults.http_drop_rate = 1.0
+    call = SimpleNamespace(data={}, return_response=True)
+
+    response = await light.service_animation(
+        call, [{"hsv": {"h": 240, "s": 100, "v": 100}, "t": 0}]
+    )
+
+    assert response == {"success": True, "steps": 1, "queued": True}
+    fake.faults.http_drop_rate = 0.0
+    await async_wait_for(lambda: fake.received_commands)
+    assert fake.received_commands == [{"hsv": {"h": 240, "s": 100, "v": 100}, "t": 0}]
+    assert controller.connected
@@ -0,0 +1,48 @@
+"""Requests run one at a time by lane; stale animation uploads are dropped."""
+
+import asyncio
+
+import pytest
+
+from custom_components.fhem_rgbwwcontroller.core.command_scheduler import (
+    CommandScheduler,
+    CommandSuperseded,
+    Lane,
+)
+
+pytestmark = pytest.mark.asyncio
+
+_UPLOAD = [{"hsv": {"h": 0, "s": 100, "v": 100}, "t": 1000}]
+_SET = [{"hsv": {"h": 120, "s": 100, "v": 100}}]
+
+
+async def test_superseded_upload_raises() -> None:
+    scheduler = CommandScheduler()
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    async def request(name: str) -> str:
+        await release.wait()
+        sent.append(name)
+        return name
+
+    busy = asyncio.create_task(
+        scheduler.run(Lane.HOUSEKEEPING, lambda: request("info"))
+    )
+    await asyncio.sleep(0)
+    upload = asyncio.create_task(
+        scheduler.run(Lane.ANIMATION, lambda: request("upload"), _UPLOAD)
+    )
+    await asyncio.sleep(0)
+    turn_on = asyncio.create_task(
+        scheduler.run(Lane.INTERACTIVE, lambda: request("turn_on"), _SET)
+    )
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(CommandSuperseded):
+        await upload
+    assert await turn_on == "turn_on"
+    assert await busy == "info"
+    assert sent == ["info", "turn_on"]
+    assert scheduler.superseded == 1
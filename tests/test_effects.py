@@ -0,0 +1,116 @@
+"""Effects play all their steps in order on the firmware emulator."""
+
+import pytest
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.animation_engine import (
+    AnimationEngine,
+)
+from custom_components.fhem_rgbwwcontroller.core.color_commands import (
+    ChannelsType,
+    parse_color_commands,
+)
+from custom_components.fhem_rgbwwcontroller.core.effects import (
+    BUILTIN_EFFECTS,
+    compile_effect,
+    effect_commands,
+    load_effects,
+)
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+    _ColorState,
+)
+
+
+def _play(name: str) -> tuple[AnimationEngine, list[str]]:
+    finished: list[str] = []
+    engine = AnimationEngine(
+        {"h": 300, "s": 0, "v": 0, "ct": 2700},
+        on_transition_finished=lambda t, name, requeued: finished.append(name),
+    )
+    flash, commands = BUILTIN_EFFECTS[name]
+    engine.push(compile_effect(name, commands, flash).encoded)
+    return engine, finished
+
+
+def test_rainbow_cycles_through_all_hues() -> None:
+    engine, finished = _play("rainbow")
+
+    hues = []
+    for _ in range(6):
+        engine.advance(5000)
+        hues.append(round(engine.values()["h"]))
+
+    assert hues == [0, 120, 240, 0, 120, 240]
+    assert finished == ["rainbow", "rainbow"]  # once per loop
+
+
+def test_breathe_alternates() -> None:
+    engine, _ = _play("breathe")
+
+    levels = []
+    for _ in range(4):
+        engine.advance(2000)
+        levels.append(round(engine.values()["v"]))
+
+    assert levels == [100, 10, 100, 10]
+
+
+def test_sunrise_passes_every_stage() -> None:
+    engine, finished = _play("sunrise")
+
+    stages = []
+    for _ in range(3):
+        engine.advance(300_000)
+        values = engine.values()
+        stages.append((round(values["h"]), round(values["s"]), round(values["v"])))
+
+    assert stages == [(15, 100, 30), (30, 70, 70), (40, 20, 100)]
+    assert finished == ["sunrise"]
+
+
+def test_explicit_step_policy_and_name_are_kept() -> None:
+    commands = parse_color_commands(
+        "0,100,100 1; 120,100,100 1 f:mid:", ChannelsType.HSV
+    )
+
+    first, second = compile_effect("user", commands, flash=False).encoded
+
+    assert first["q"] == "single"
+    assert "name" not in first
+    assert second["q"] == "front"
+    assert second["name"] == "mid"
+
+
+def test_flash_effect_interrupts_once_and_restores_last() -> None:
+    effect = load_effects(None)["police"]
+    current = _ColorState(2700, 30, 50, 80, "hsv", 0, 0, 0, 0, 0)
+
+    first, *rest, restore = effect_commands(effect, current)
+
+    assert first["q"] == "front"
+    assert [step["q"] for step in rest] == ["back"] * len(rest)
+    assert restore["q"] == "back"
+    assert restore["hsv"] == {"h": 30, "s": 50, "v": 80, "ct": 2700}
+
+
+def test_builtin_effects_only_name_the_last_step() -> None:
+    for effect in load_effects(None).values():
+        *steps, last = effect.encoded
+        assert last["name"] == effect.name
+        assert all("name" not in step for step in steps)
+
+
+@pytest.mark.asyncio
+async def test_effect_is_one_request(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+    light._effects = load_effects(None)  # noqa: SLF001
+
+    await light.async_turn_on(effect="rainbow")
+    await fake.advance(10_000)
+
+    assert fake.requests["POST /color"] == 1
+    assert round(fake.color_params()["hsv"]["h"]) == 120
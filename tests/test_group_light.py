@@ -0,0 +1,143 @@
+"""A group light fans out to its members and aggregates their state."""
+
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.controller_group import (
+    ControllerGroup,
+)
+from custom_components.fhem_rgbwwcontroller.group_light import RgbwwGroupLight
+from custom_components.fhem_rgbwwcontroller.light import _render_animation_cli
+
+from .common import async_connect, async_wait_for
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def fakes() -> AsyncIterator[list[FakeRgbwwController]]:
+    async with (
+        FakeRgbwwController(autorun=False) as first,
+        FakeRgbwwController(autorun=False) as second,
+    ):
+        yield [first, second]
+
+
+@pytest_asyncio.fixture
+async def group(
+    fakes: list[FakeRgbwwController], session: aiohttp.ClientSession
+) -> AsyncIterator[ControllerGroup]:
+    members = [await async_connect(fake, session) for fake in fakes]
+    yield ControllerGroup(members)
+    for member in members:
+        await member.disconnect()
+
+
+def _group_light(group: ControllerGroup) -> RgbwwGroupLight:
+    entry = SimpleNamespace(entry_id="group", title="Group")
+    light = RgbwwGroupLight(group, entry)
+    light.async_write_ha_state = lambda: None
+    return light
+
+
+async def _set_hsv(
+    fake: FakeRgbwwController, group: ControllerGroup, index: int, **hsv: int
+) -> None:
+    await fake.apply_color_commands([{"hsv": hsv, "t": 0}])
+    member = group.members[index]
+    await async_wait_for(lambda: member.color.hue == hsv["h"])
+
+
+async def test_turn_on_is_one_request_per_member(
+    fakes: list[FakeRgbwwController], group: ControllerGroup
+) -> None:
+    light = _group_light(group)
+
+    await light.async_turn_on(brightness=255, hs_color=(30.0, 80.0), transition=1)
+
+    assert [fake.requests["POST /color"] for fake in fakes] == [1, 1]
+    assert fakes[0].received_commands == fakes[1].received_commands
+
+
+async def test_hue_is_averaged_across_the_wrap(
+    fakes: list[FakeRgbwwController], group: ControllerGroup
+) -> None:
+    await _set_hsv(fakes[0], group, 0, h=350, s=100, v=100)
+    await _set_hsv(fakes[1], group, 1, h=10, s=100, v=50)
+    light = _group_light(group)
+
+    light._aggregate()  # noqa: SLF001
+
+    hue, saturation = light._attr_hs_color  # noqa: SLF001
+    assert min(hue, 360 - hue) == pytest.approx(0, abs=1e-6)
+    assert saturation == 100
+    assert light._attr_is_on  # noqa: SLF001
+
+
+async def test_hue_is_weighted_by_saturation(
+    fakes: list[FakeRgbwwController], group: ControllerGroup
+) -> None:
+    await _set_hsv(fakes[0], group, 0, h=0, s=100, v=100)
+    await _set_hsv(fakes[1], group, 1, h=120, s=0, v=100)
+    light = _group_light(group)
+
+    light._aggregate()  # noqa: SLF001
+
+    hue = light._attr_hs_color[0]  # noqa: SLF001
+    assert hue == pytest.approx(0, abs=1e-6)
+
+
+async def test_channel_command_fans_out(
+    fakes: list[FakeRgbwwController], group: ControllerGroup
+) -> None:
+    light = _group_light(group)
+    call = SimpleNamespace(data={"command": "pause", "channels": ["hue"]})
+
+    await light.service_channel(call)
+
+    assert [fake.requests["POST /pause"] for fake in fakes] == [1, 1]
+
+
+async def test_render_starts_at_the_first_member(
+    fakes: list[FakeRgbwwController], group: ControllerGroup
+) -> None:
+    await _set_hsv(fakes[0], group, 0, h=200, s=100, v=100)
+    light = _group_light(group)
+    call = SimpleNamespace(
+        data={
+            "anim_definition_command": "0,100,100 1",
+            "channels_type": "hsv",
+            "sample_rate": 20,
+            "horizon": 60,
+            "preview_points": 5,
+        }
+    )
+
+    rendered = _render_animation_cli(call, light.render_start_color())
+
+    assert rendered["preview"]["h"][0] == 200
+    assert rendered["end_state"]["h"] == 0
+
+
+async def test_animation_response_matches_the_single_light(
+    fakes: list[FakeRgbwwController], group: ControllerGroup
+) -> None:
+    offline = group.members[1]
+    offline._RECONNECT_DELAY = 60  # noqa: SLF001
+    await fakes[1].disconnect_clients()
+    await async_wait_for(lambda: not offline.connected)
+    call = SimpleNamespace(data={}, return_response=True)
+    encoded = [{"hsv": {"h": 0, "s": 100, "v": 100}, "t": 1000}]
+
+    single = await make_light(offline).service_animation(call, encoded)
+    response = await _group_light(group).service_animation(call, encoded)
+
+    assert single["queued"]
+    assert response["queued"]
+    assert set(single) <= set(response)
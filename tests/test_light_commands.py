@@ -0,0 +1,74 @@
+"""turn_on/turn_off cost exactly one request to the controller."""
+
+import pytest
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_turn_on_with_color_brightness_and_transition(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+
+    await light.async_turn_on(
+        brightness=128, hs_color=(120.0, 50.0), color_temp_kelvin=3000, transition=2
+    )
+
+    assert fake.requests["POST /color"] == 1
+    (cmd,) = fake.received_commands
+    assert cmd["hsv"] == {
+        "h": 120.0,
+        "s": 50.0,
+        "v": pytest.approx(50, abs=0.5),
+        "ct": 3000,
+    }
+    assert cmd["t"] == 2000
+
+    await fake.advance(2000)
+    assert fake.color_params()["hsv"] == {"h": 120, "s": 50, "v": 50, "ct": 3000}
+
+
+async def test_turn_off_with_transition(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+
+    await light.async_turn_off(transition=1.5)
+
+    assert fake.requests["POST /color"] == 1
+    (cmd,) = fake.received_commands
+    assert cmd["hsv"] == {"v": 0}
+    assert cmd["t"] == 1500
+
+
+async def test_flash_is_one_request_with_restore(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = make_light(controller)
+
+    await light.async_turn_on(hs_color=(0.0, 100.0), flash="short")
+
+    assert fake.requests["POST /color"] == 1
+    # in wire order: only the flash interrupts, the restore queues behind it
+    flash, restore = fake.received_commands
+    assert flash["q"] == "front"
+    assert flash["hsv"]["h"] == 0
+    assert flash["stay"] == 500
+    assert restore["q"] == "back"
+    assert restore["hsv"] == controller_hsv(controller)
+
+
+def controller_hsv(controller: RgbwwController) -> dict[str, float]:
+    color = controller.color
+    return {
+        "h": color.hue,
+        "s": color.saturation,
+        "v": color.brightness,
+        "ct": color.color_temp,
+    }
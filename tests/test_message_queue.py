@@ -0,0 +1,64 @@
+"""The stream message queue drops the oldest stale state when it is full."""
+
+import asyncio
+
+import pytest
+
+from custom_components.fhem_rgbwwcontroller.core.message_queue import MessageQueue
+
+
+def _msg(method: str, n: int = 0) -> dict[str, object]:
+    return {"method": method, "params": {"n": n}}
+
+
+def test_full_queue_drops_the_oldest_color_event() -> None:
+    queue = MessageQueue(maxsize=3)
+    queue.put(_msg("transition_finished"))
+    queue.put(_msg("color_event", 1))
+    queue.put(_msg("color_event", 2))
+
+    queue.put(_msg("color_event", 3))
+
+    assert len(queue) == 3
+    assert queue.dropped == {"color_event": 1}
+    assert queue.high_water == 3
+    assert [queue.popleft() for _ in range(3)] == [
+        _msg("transition_finished"),
+        _msg("color_event", 2),
+        _msg("color_event", 3),
+    ]
+    assert queue.popleft() is None
+
+
+def test_other_messages_are_never_dropped() -> None:
+    queue = MessageQueue(maxsize=2)
+    for n in range(4):
+        queue.put(_msg("transition_finished", n))
+
+    assert len(queue) == 4
+    assert not queue.dropped
+    assert queue.high_water == 4
+
+
+def test_clear_keeps_the_counters() -> None:
+    queue = MessageQueue(maxsize=1)
+    queue.put(_msg("color_event", 1))
+    queue.put(_msg("color_event", 2))
+
+    queue.clear()
+
+    assert len(queue) == 0
+    assert queue.dropped == {"color_event": 1}
+    assert queue.high_water == 1
+
+
+@pytest.mark.asyncio
+async def test_put_wakes_the_dispatcher() -> None:
+    queue = MessageQueue()
+    waiter = asyncio.create_task(queue.wait())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    queue.put(_msg("color_event"))
+
+    await asyncio.wait_for(waiter, 1)
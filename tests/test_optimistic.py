@@ -0,0 +1,74 @@
+"""The light shows a command's target until the controller confirms it."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    ControllerUnavailableError,
+    RgbwwController,
+)
+from custom_components.fhem_rgbwwcontroller.light import RgbwwLight
+
+from .common import async_wait_for
+
+pytestmark = pytest.mark.asyncio
+
+
+def _attach(controller: RgbwwController) -> RgbwwLight:
+    light = make_light(controller)
+    controller.register_callback(light)
+    light.on_state_completed()
+    return light
+
+
+async def test_echo_before_the_response_confirms(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = _attach(controller)
+    apply = fake.apply_color_commands
+
+    async def apply_then_delay(cmds: list[dict[str, object]]) -> None:
+        await apply(cmds)
+        await asyncio.sleep(0.1)  # the echo is read before the response
+
+    fake.apply_color_commands = apply_then_delay  # type: ignore[method-assign]
+
+    await light.async_turn_on(hs_color=(120.0, 100.0), brightness=255, transition=0)
+
+    optimistic = light._optimistic  # noqa: SLF001
+    assert optimistic.confirmed == 1
+    assert not optimistic.pending
+    assert light._attr_hs_color == (120.0, 100.0)  # noqa: SLF001
+
+
+async def test_missing_echo_rolls_back(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    light = _attach(controller)
+    before = light._attr_hs_color  # noqa: SLF001
+    optimistic = light._optimistic  # noqa: SLF001
+    optimistic.max_margin = 0.05
+    fake.faults.stream_drop_rate = 1.0
+
+    await light.async_turn_on(hs_color=(120.0, 100.0), brightness=255, transition=0)
+    assert light._attr_hs_color == (120.0, 100.0)  # noqa: SLF001
+
+    await async_wait_for(lambda: optimistic.rolled_back == 1)
+    assert light._attr_hs_color == before  # noqa: SLF001
+    assert optimistic.confirmed == 0
+
+
+async def test_failed_send_is_not_tracked(controller: RgbwwController) -> None:
+    light = _attach(controller)
+
+    async def fail(*_args: object) -> None:
+        raise ControllerUnavailableError("send failed")
+
+    controller.send_color_command = fail  # type: ignore[method-assign]
+
+    await light.async_turn_on(hs_color=(120.0, 100.0), brightness=255)
+
+    assert not light._optimistic.pending  # noqa: SLF001
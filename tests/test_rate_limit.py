@@ -0,0 +1,57 @@
+"""The token bucket paces requests; its limit follows the firmware info."""
+
+import asyncio
+
+import pytest
+
+from custom_components.fhem_rgbwwcontroller.core.rate_limit import (
+    DEFAULT_RATE_LIMIT,
+    RateLimit,
+    TokenBucket,
+    rate_limit_for_info,
+)
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+
+
+@pytest.mark.parametrize(
+    ("info", "limit"),
+    [
+        ({"heap_free": 21123}, DEFAULT_RATE_LIMIT),
+        ({"heap_free": 150_000}, RateLimit(16.0, 8)),
+        ({"soc": "ESP32-C3", "heap_free": 60_000}, RateLimit(16.0, 8)),
+        ({"platform": "esp8266", "heap_free": 150_000}, DEFAULT_RATE_LIMIT),
+        ({"soc": "esp32", "heap_free": 8_000}, RateLimit(2.0, 2)),
+        ({}, DEFAULT_RATE_LIMIT),
+    ],
+)
+def test_limit_for_info(info: dict, limit: RateLimit) -> None:
+    assert rate_limit_for_info(info) == limit
+
+
+def test_every_controller_owns_its_bucket() -> None:
+    first = RgbwwController(None, "192.0.2.1", session=object())
+    second = RgbwwController(
+        None, "192.0.2.1", session=object(), rate_limit=RateLimit.from_rate(1)
+    )
+
+    assert first.rate_limit is not second.rate_limit
+    assert first.rate_limit.limit == DEFAULT_RATE_LIMIT
+    assert second.rate_limit.configured
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_refunds_the_token() -> None:
+    bucket = TokenBucket(RateLimit(4.0, 1))
+    await bucket.acquire()
+    waiting = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    # without the refund this would wait 0.5 s
+    async with asyncio.timeout(0.4):
+        await bucket.acquire()
@@ -0,0 +1,56 @@
+"""Animation service calls are parsed once per call, not per context."""
+
+from types import SimpleNamespace
+
+from custom_components.fhem_rgbwwcontroller.core.color_commands import (
+    ChannelsType,
+    parse_color_commands,
+)
+from custom_components.fhem_rgbwwcontroller.light import _encode_once, _wait_target
+
+
+def _call(command: str, context_id: str = "script-run") -> SimpleNamespace:
+    return SimpleNamespace(
+        context=SimpleNamespace(id=context_id),
+        service="animation_cli_hsv",
+        data={"anim_definition_command": command, "wait": True},
+    )
+
+
+def _encode(call: SimpleNamespace) -> tuple:
+    return _encode_once(
+        call,
+        "cli",
+        lambda: parse_color_commands(
+            call.data["anim_definition_command"], ChannelsType.HSV
+        ),
+    )
+
+
+def test_one_parse_per_call() -> None:
+    call = _call("0,100,100 1")
+    parses = []
+
+    def parse() -> list:
+        parses.append(call)
+        return parse_color_commands("0,100,100 1", ChannelsType.HSV)
+
+    assert _encode_once(call, "cli", parse) is _encode_once(call, "cli", parse)
+    assert len(parses) == 1
+
+
+def test_calls_sharing_a_context_are_parsed_separately() -> None:
+    first = _encode(_call("0,100,100 1"))
+    second = _encode(_call("120,100,100 1"))
+
+    assert first[0]["hsv"]["h"] == "0"
+    assert second[0]["hsv"]["h"] == "120"
+
+
+def test_default_wait_names_are_unique_per_call() -> None:
+    first_call, second_call = _call("0,100,100 1"), _call("0,100,100 1")
+
+    _, (first, _) = _wait_target(first_call, _encode(first_call))
+    _, (second, _) = _wait_target(second_call, _encode(second_call))
+
+    assert first != second
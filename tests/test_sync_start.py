@@ -0,0 +1,104 @@
+"""A synchronized start stages the animation and continues every target."""
+
+from collections.abc import AsyncIterator
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    ControllerUnavailableError,
+    RgbwwController,
+)
+from custom_components.fhem_rgbwwcontroller.core.sync_start import (
+    synchronized_start,
+)
+
+from .common import async_connect, async_wait_for
+
+pytestmark = pytest.mark.asyncio
+
+_ENCODED = [{"hsv": {"h": 0, "s": 100, "v": 100}, "t": 1000}]
+
+
+@pytest_asyncio.fixture
+async def fakes() -> AsyncIterator[list[FakeRgbwwController]]:
+    async with (
+        FakeRgbwwController(autorun=False) as first,
+        # results are keyed by host
+        FakeRgbwwController("127.0.0.2", autorun=False) as second,
+    ):
+        yield [first, second]
+
+
+@pytest_asyncio.fixture
+async def controllers(
+    fakes: list[FakeRgbwwController], session: aiohttp.ClientSession
+) -> AsyncIterator[list[RgbwwController]]:
+    controllers = [await async_connect(fake, session) for fake in fakes]
+    yield controllers
+    for controller in controllers:
+        await controller.disconnect()
+
+
+async def test_all_targets_started(
+    fakes: list[FakeRgbwwController], controllers: list[RgbwwController]
+) -> None:
+    results = await synchronized_start(controllers, _ENCODED, "hsv")
+
+    assert [r.started for r in results] == [True, True]
+    assert all(r.latency_ms is not None for r in results)
+    for fake in fakes:
+        assert fake.requests["POST /pause"] == 1
+        assert fake.requests["POST /color"] == 1
+        assert fake.requests["POST /continue"] == 1
+
+
+async def test_queued_upload_is_not_started(
+    fakes: list[FakeRgbwwController], controllers: list[RgbwwController]
+) -> None:
+    offline = controllers[1]
+    offline._RECONNECT_DELAY = 60  # noqa: SLF001
+    await fakes[1].disconnect_clients()
+    await async_wait_for(lambda: not offline.connected)
+
+    results = await synchronized_start(controllers, _ENCODED, "hsv")
+
+    assert results[0].started
+    assert not results[1].started
+    assert "queued" in results[1].error
+    # resumed right away instead of staying paused
+    assert fakes[1].requests["POST /continue"] == 1
+
+
+async def test_failed_upload_is_resumed(
+    fakes: list[FakeRgbwwController], controllers: list[RgbwwController]
+) -> None:
+    async def fail(*_args: object) -> None:
+        raise ControllerUnavailableError("upload failed")
+
+    controllers[1].send_encoded_color_commands = fail  # type: ignore[method-assign]
+
+    results = await synchronized_start(controllers, _ENCODED, "hsv")
+
+    assert results[0].started
+    assert not results[1].started
+    assert results[1].error == "upload failed"
+    assert fakes[1].requests["POST /pause"] == 1
+    assert fakes[1].requests["POST /color"] == 0
+    assert fakes[1].requests["POST /continue"] == 1
+
+
+async def test_unexpected_failure_resumes_staged_targets(
+    fakes: list[FakeRgbwwController], controllers: list[RgbwwController]
+) -> None:
+    async def fail(*_args: object) -> None:
+        raise RuntimeError("boom")
+
+    controllers[1].send_encoded_color_commands = fail  # type: ignore[method-assign]
+
+    with pytest.raises(RuntimeError):
+        await synchronized_start(controllers, _ENCODED, "hsv")
+
+    assert [fake.requests["POST /continue"] for fake in fakes] == [1, 1]
@@ -0,0 +1,59 @@
+"""A finished step fires the bus event and the device triggers."""
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from benchmarks.common import make_light
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.const import (
+    DOMAIN,
+    LEGACY_EVENT_TRANSITION_FINISHED,
+    TRANSITION_TRIGGERS,
+)
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+from custom_components.fhem_rgbwwcontroller.core.transition_triggers import (
+    TransitionTriggers,
+)
+
+from .common import async_wait_for
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_finished_step_reaches_bus_and_triggers(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    fired: list[tuple[str, dict[str, Any]]] = []
+    triggered: list[tuple[str, bool]] = []
+    triggers = TransitionTriggers()
+    triggers.attach("device", lambda *args: triggered.append(args))
+    light = make_light(controller)
+    light.hass = SimpleNamespace(
+        bus=SimpleNamespace(async_fire=lambda *args: fired.append(args)),
+        data={DOMAIN: {TRANSITION_TRIGGERS: triggers}},
+    )
+    light.registry_entry = SimpleNamespace(device_id="device")
+    controller.register_callback(light)
+
+    await controller.send_encoded_color_commands(
+        [{"hsv": {"h": 120, "s": 100, "v": 100}, "t": 1000, "name": "a"}]
+    )
+    await fake.advance(1000)
+    await async_wait_for(lambda: triggered)
+
+    assert triggered == [("a", False)]
+    assert fired == [
+        (
+            LEGACY_EVENT_TRANSITION_FINISHED,
+            {
+                "device_id": "rgbwwid",
+                "type": "transition_finished",
+                "name": "a",
+                "requeued": False,
+            },
+        )
+    ]
@@ -0,0 +1,49 @@
+"""Waiting for a named step counts only the steps that will run."""
+
+import pytest
+
+from benchmarks.fake_controller import FakeRgbwwController
+from custom_components.fhem_rgbwwcontroller.core.rgbww_controller import (
+    RgbwwController,
+)
+from custom_components.fhem_rgbwwcontroller.core.transition_waiters import (
+    expected_finishes,
+)
+
+from .common import async_wait_for
+
+
+def _step(h: int, **extra: object) -> dict[str, object]:
+    return {"hsv": {"h": h, "s": 100, "v": 100}, "t": 1000, **extra}
+
+
+def test_single_step_drops_earlier_steps_of_the_request() -> None:
+    encoded = [_step(0, name="a"), _step(120, name="a"), _step(240, name="a")]
+
+    assert expected_finishes(encoded, "a", False) == 1
+
+
+def test_queued_steps_all_finish() -> None:
+    encoded = [_step(0, name="a"), _step(120, name="a", q="back")]
+
+    assert expected_finishes(encoded, "a", False) == 2
+
+
+def test_other_channels_are_kept() -> None:
+    encoded = [_step(0, name="a"), {"hsv": {"ct": 3000}, "t": 1000, "name": "a"}]
+
+    assert expected_finishes(encoded, "a", False) == 2
+
+
+@pytest.mark.asyncio
+async def test_waiter_resolves_on_the_step_that_runs(
+    fake: FakeRgbwwController, controller: RgbwwController
+) -> None:
+    encoded = [_step(0, name="a"), _step(120, name="a")]
+
+    _, waiter = await controller.send_encoded_color_commands(encoded, ("a", False))
+    await fake.advance(1000)
+
+    assert waiter is not None
+    await async_wait_for(waiter.done)
+    assert waiter.result() is True